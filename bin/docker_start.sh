@@ -37,6 +37,9 @@ if [ -d $fixtures_dir ]; then
     done
 fi
 
+# Create and seed the sequences of the generated identificaties
+python src/manage.py sync_identificatie_sequences
+
 # Create superuser
 # specify password by setting DJANGO_SUPERUSER_PASSWORD in the env
 # specify username by setting OPENZAAK_SUPERUSER_USERNAME in the env
@@ -0,0 +1,98 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+import time
+from typing import List
+
+from django.core.management import BaseCommand
+from django.test import override_settings
+
+from vng_api_common.authorizations.models import Autorisatie
+from vng_api_common.constants import ComponentTypes, VertrouwelijkheidsAanduiding
+
+from openzaak.components.catalogi.models import ZaakType
+from openzaak.components.zaken.api.scopes import SCOPE_ZAKEN_ALLES_LEZEN
+from openzaak.components.zaken.models import Zaak
+from openzaak.utils import build_absolute_url
+from openzaak.utils.query import AuthorizationsFilterEngines
+
+ENGINES = (AuthorizationsFilterEngines.case, AuthorizationsFilterEngines.compiled)
+
+
+def build_autorisaties(num: int) -> List[Autorisatie]:
+    """
+    Build (unsaved) authorizations for the existing zaaktypen.
+
+    If there are fewer zaaktypen than requested, the remainder refers to external
+    zaaktypen. The confidentiality levels are spread over the authorizations.
+    """
+    zaaktypen = ZaakType.objects.order_by("pk")[:num]
+    urls = [
+        build_absolute_url(zaaktype.get_absolute_api_url()) for zaaktype in zaaktypen
+    ]
+    urls += [
+        f"https://catalogi.example.com/api/v1/zaaktypen/{index}"
+        for index in range(num - len(urls))
+    ]
+    va_values = list(VertrouwelijkheidsAanduiding.values)
+    return [
+        Autorisatie(
+            component=ComponentTypes.zrc,
+            scopes=[SCOPE_ZAKEN_ALLES_LEZEN.label],
+            zaaktype=url,
+            max_vertrouwelijkheidaanduiding=va_values[index % len(va_values)],
+        )
+        for index, url in enumerate(urls)
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the query plans and timings of the authorization filter engines "
+        "for the zaken list endpoint. No data is modified."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=[10, 100, 1000],
+            help="Numbers of authorizations to benchmark.",
+        )
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Execute the queries to report actual timings in the plans.",
+        )
+
+    def handle(self, *args, **options):
+        for size in options["sizes"]:
+            autorisaties = build_autorisaties(size)
+
+            for engine in ENGINES:
+                with override_settings(AUTORISATIES_FILTER_ENGINE=engine):
+                    start = time.perf_counter()
+                    queryset = Zaak.objects.filter_for_authorizations(
+                        SCOPE_ZAKEN_ALLES_LEZEN, autorisaties
+                    ).order_by("-pk")[:100]
+                    # force the SQL compilation
+                    sql = str(queryset.query)
+                    build_duration = time.perf_counter() - start
+
+                    start = time.perf_counter()
+                    count = len(queryset)
+                    query_duration = time.perf_counter() - start
+
+                    plan = queryset.explain(analyze=options["analyze"])
+
+                self.stdout.write(
+                    self.style.MIGRATE_HEADING(
+                        f"{size} authorizations - engine '{engine}'"
+                    )
+                )
+                self.stdout.write(
+                    f"SQL length: {len(sql)}, build: {build_duration * 1000:.1f}ms, "
+                    f"query: {query_duration * 1000:.1f}ms, results: {count}"
+                )
+                self.stdout.write(plan)
+                self.stdout.write("")
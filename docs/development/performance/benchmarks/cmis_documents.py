@@ -0,0 +1,139 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+import time
+import uuid
+from contextlib import nullcontext
+from io import BytesIO
+from typing import List, Tuple
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.test import override_settings
+
+from drc_cmis.client_builder import get_cmis_client
+from drc_cmis.connections import use_cmis_connection_pool
+
+from openzaak.components.documenten.models import EnkelvoudigInformatieObject
+from openzaak.components.documenten.query.cache import document_cache_scope
+
+# strategy -> (use a request scope, timeout of the shared cache)
+STRATEGIES = {
+    "none": (False, 0),
+    "request": (True, 0),
+    "shared": (True, 300),
+}
+
+
+def create_documents(client, num: int, versions: int) -> List[str]:
+    uuids = []
+    for index in range(num):
+        document = client.create_document(
+            identification=f"BENCHMARK-{uuid.uuid4().hex}",
+            bronorganisatie="000000000",
+            data={"titel": f"benchmark {index}", "bestandsnaam": "benchmark.txt"},
+            content=BytesIO(b"versie 1"),
+            check_if_already_exists=False,
+        )
+        uuids.append(document.uuid)
+
+        for versie in range(2, versions + 1):
+            lock = uuid.uuid4().hex
+            client.lock_document(document.uuid, lock)
+            client.update_document(
+                drc_uuid=document.uuid,
+                lock=lock,
+                data={"versie": versie},
+                content=BytesIO(f"versie {versie}".encode()),
+            )
+            client.unlock_document(drc_uuid=document.uuid, lock=lock)
+    return uuids
+
+
+def retrieve_documents(uuids: List[str], use_scope: bool) -> Tuple[float, int]:
+    """
+    Retrieve all versions of the documents with their size and content, like a
+    request listing and downloading them.
+
+    :return: the duration and the number of requests to the DMS.
+    """
+    responses = []
+
+    def count_response(response, *args, **kwargs):
+        responses.append(response)
+
+    start = time.perf_counter()
+    with use_cmis_connection_pool() as session:
+        session.hooks["response"].append(count_response)
+        with document_cache_scope() if use_scope else nullcontext():
+            for document_uuid in uuids:
+                for eio in EnkelvoudigInformatieObject.objects.filter(
+                    uuid=document_uuid
+                ):
+                    eio.inhoud.size
+                    eio.inhoud.read()
+        session.hooks["response"].remove(count_response)
+    return time.perf_counter() - start, len(responses)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the number of requests to the DMS and the duration to retrieve "
+        "documents with and without the CMIS document cache. Documents are created in "
+        "the configured DMS, for example a local Alfresco or CMIS stub server, and "
+        "deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--documents", type=int, default=10, help="Number of documents to create.",
+        )
+        parser.add_argument(
+            "--versions",
+            type=int,
+            default=3,
+            help="Number of versions of every document.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=3,
+            help="Number of times the documents are retrieved per strategy.",
+        )
+        parser.add_argument(
+            "--strategies",
+            nargs="+",
+            choices=list(STRATEGIES),
+            default=list(STRATEGIES),
+            help=(
+                "Cache strategies to measure. The shared strategy uses the "
+                "CMIS_DOCUMENTS_CACHE."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if not settings.CMIS_ENABLED:
+            raise CommandError("The CMIS adapter is not enabled.")
+
+        client = get_cmis_client()
+        with use_cmis_connection_pool():
+            uuids = create_documents(client, options["documents"], options["versions"])
+
+        try:
+            for name in options["strategies"]:
+                use_scope, timeout = STRATEGIES[name]
+                with override_settings(CMIS_DOCUMENTS_CACHE_TIMEOUT=timeout):
+                    results = [
+                        retrieve_documents(uuids, use_scope)
+                        for _request in range(options["requests"])
+                    ]
+
+                self.stdout.write(self.style.MIGRATE_HEADING(f"Strategy '{name}'"))
+                for index, (duration, num_requests) in enumerate(results, start=1):
+                    self.stdout.write(
+                        f"request {index}: {num_requests} DMS requests, "
+                        f"duration: {duration * 1000:.1f}ms"
+                    )
+        finally:
+            with use_cmis_connection_pool():
+                for document_uuid in uuids:
+                    client.delete_document(document_uuid)
@@ -0,0 +1,140 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+import base64
+import os
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import BinaryIO, Callable, Tuple
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.core.management import BaseCommand
+
+from djangorestframework_camel_case.parser import CamelCaseJSONParser
+
+from openzaak.components.documenten.api.parsers import DocumentMultiPartParser
+from openzaak.components.documenten.api.serializers import AnyBase64File
+
+MIB = 2 ** 20
+# a multiple of 3, so the encoded blocks can be concatenated into valid base64
+BLOCK_SIZE = 3 * 2 ** 18
+BOUNDARY = "benchmark-document-upload"
+
+
+def write_content(body: BinaryIO, size: int, encode: Callable = bytes) -> None:
+    block = os.urandom(BLOCK_SIZE)
+    written = 0
+    while written < size:
+        chunk = block[: size - written]
+        body.write(encode(chunk))
+        written += len(chunk)
+
+
+def write_base64_body(body: BinaryIO, size: int) -> str:
+    body.write(b'{"inhoud": "')
+    write_content(body, size, encode=base64.b64encode)
+    body.write(b'"}')
+    return "application/json"
+
+
+def write_multipart_body(body: BinaryIO, size: int) -> str:
+    body.write(
+        f"--{BOUNDARY}\r\n"
+        'Content-Disposition: form-data; name="inhoud"; filename="document.bin"\r\n'
+        "Content-Type: application/octet-stream\r\n\r\n".encode()
+    )
+    write_content(body, size)
+    body.write(f"\r\n--{BOUNDARY}--\r\n".encode())
+    return f"multipart/form-data; boundary={BOUNDARY}"
+
+
+def parse_base64_body(body: BinaryIO, media_type: str, length: int) -> File:
+    data = CamelCaseJSONParser().parse(body, media_type)
+    return AnyBase64File().to_internal_value(data["inhoud"])
+
+
+def parse_multipart_body(body: BinaryIO, media_type: str, length: int) -> File:
+    request = SimpleNamespace(META={"CONTENT_LENGTH": str(length)})
+    data = DocumentMultiPartParser().parse(
+        body, media_type, parser_context={"request": request}
+    )
+    return AnyBase64File().to_internal_value(data.files["inhoud"])
+
+
+STRATEGIES = {
+    "base64": (write_base64_body, parse_base64_body),
+    "multipart": (write_multipart_body, parse_multipart_body),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the peak of the Python memory allocations to upload documents as a "
+        "base64 string in a JSON body and as a file in a multipart body. The request "
+        "bodies and the uploaded documents are written to a temporary directory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[10, 100, 1024],
+            help="Sizes of the documents, in MiB.",
+        )
+        parser.add_argument(
+            "--strategies",
+            nargs="+",
+            choices=list(STRATEGIES),
+            default=list(STRATEGIES),
+            help=(
+                "Upload strategies to measure. The base64 strategy needs several times "
+                "the size of the largest document in memory."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            storage = FileSystemStorage(location=directory)
+
+            for size in options["sizes"]:
+                for name in options["strategies"]:
+                    write_body, parse_body = STRATEGIES[name]
+                    duration, peak = self.measure(
+                        storage, size * MIB, write_body, parse_body
+                    )
+
+                    self.stdout.write(
+                        self.style.MIGRATE_HEADING(f"Strategy '{name}', {size} MiB")
+                    )
+                    self.stdout.write(
+                        f"duration: {duration * 1000:.1f}ms, "
+                        f"peak memory: {peak / MIB:.1f}MiB"
+                    )
+
+    def measure(
+        self,
+        storage: FileSystemStorage,
+        size: int,
+        write_body: Callable,
+        parse_body: Callable,
+    ) -> Tuple[float, int]:
+        with tempfile.TemporaryFile() as body:
+            media_type = write_body(body, size)
+            length = body.tell()
+            body.seek(0)
+
+            tracemalloc.start()
+            start = time.perf_counter()
+            try:
+                document = parse_body(body, media_type, length)
+                name = storage.save("document.bin", document)
+                duration = time.perf_counter() - start
+                _current, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        storage.delete(name)
+        return duration, peak
@@ -0,0 +1,157 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+"""
+Compare the identificatie generators by creating zaken from concurrent threads.
+"""
+import threading
+import time
+from datetime import date
+from typing import List
+
+from django.apps import apps
+from django.core.management import BaseCommand, CommandError
+from django.db import IntegrityError, connection, transaction
+
+from vng_api_common.constants import VertrouwelijkheidsAanduiding
+from vng_api_common.utils import (
+    generate_unique_identification as scan_unique_identification,
+)
+
+from openzaak.components.catalogi.models import ZaakType
+from openzaak.components.zaken.models import Zaak
+from openzaak.utils.identificatie import (
+    IDENTIFICATIE_MODELS,
+    generate_unique_identification,
+    get_sequence_name,
+    sync_sequences,
+)
+
+GENERATORS = {
+    "scan": scan_unique_identification,
+    "sequence": generate_unique_identification,
+}
+
+BRONORGANISATIE = "517439943"
+
+
+def create_zaken(
+    zaaktype: ZaakType, year: int, count: int, generator, created: List[int]
+) -> int:
+    """
+    Create ``count`` zaken in separate transactions and return the number of failures.
+
+    The primary keys of the created zaken are added to ``created``.
+    """
+    failures = 0
+    try:
+        for _i in range(count):
+            zaak = Zaak(
+                zaaktype=zaaktype,
+                bronorganisatie=BRONORGANISATIE,
+                verantwoordelijke_organisatie=BRONORGANISATIE,
+                vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.openbaar,
+                registratiedatum=date(year, 1, 1),
+                startdatum=date(year, 1, 1),
+            )
+            try:
+                with transaction.atomic():
+                    zaak.identificatie = generator(zaak, "registratiedatum")
+                    zaak.save()
+            except IntegrityError:
+                failures += 1
+            else:
+                created.append(zaak.pk)
+    finally:
+        connection.close()
+    return failures
+
+
+def get_existing_sequences(names: List[str]) -> List[str]:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT sequence_name FROM information_schema.sequences "
+            "WHERE sequence_schema = current_schema() AND sequence_name = ANY(%s)",
+            [names],
+        )
+        return [name for (name,) in cursor.fetchall()]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the identificatie generators by creating zaken from concurrent "
+        "threads. The zaken are created in a year without zaken. The created zaken "
+        "and sequences are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--threads", type=int, default=8, help="Number of concurrent threads."
+        )
+        parser.add_argument(
+            "--count", type=int, default=100, help="Number of zaken per thread."
+        )
+        parser.add_argument(
+            "--year",
+            type=int,
+            required=True,
+            help="Registration year of the created zaken, must not have zaken.",
+        )
+
+    def handle(self, *args, **options):
+        year = options["year"]
+        if Zaak.objects.filter(registratiedatum__year=year).exists():
+            raise CommandError(f"There are existing zaken in {year}.")
+
+        zaaktype = ZaakType.objects.filter(concept=False).first()
+        if zaaktype is None:
+            raise CommandError("A published zaaktype is required.")
+
+        sequence_name = get_sequence_name(Zaak, year)
+        if get_existing_sequences([sequence_name]):
+            raise CommandError(f"The sequence {sequence_name} exists already.")
+        # the sequences of the other models in the year are kept
+        existing_sequences = get_existing_sequences(
+            [
+                get_sequence_name(apps.get_model(label), year)
+                for label in IDENTIFICATIE_MODELS
+            ]
+        )
+
+        for name, generator in GENERATORS.items():
+            created_sequences = []
+            if name == "sequence":
+                created_sequences = [
+                    sequence
+                    for sequence in sync_sequences(years=[year])
+                    if sequence not in existing_sequences
+                ]
+
+            created, failures = [], []
+
+            def run():
+                failures.append(
+                    create_zaken(zaaktype, year, options["count"], generator, created)
+                )
+
+            threads = [threading.Thread(target=run) for _i in range(options["threads"])]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            duration = time.perf_counter() - start
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f"Generator '{name}'"))
+            self.stdout.write(
+                f"created: {len(created)}, conflicts: {sum(failures)}, "
+                f"duration: {duration * 1000:.1f}ms, "
+                f"per zaak: {duration * 1000 / max(len(created), 1):.2f}ms"
+            )
+
+            self.cleanup(created, created_sequences)
+
+    def cleanup(self, created: List[int], sequences: List[str]) -> None:
+        Zaak.objects.filter(pk__in=created).delete()
+        with connection.cursor() as cursor:
+            for name in sequences:
+                cursor.execute(f"DROP SEQUENCE {connection.ops.quote_name(name)}")
@@ -0,0 +1,111 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+import time
+import tracemalloc
+from collections import OrderedDict
+from functools import partial
+from typing import Iterator, Tuple
+
+from django.core.management import BaseCommand
+
+from djangorestframework_camel_case.render import CamelCaseJSONRenderer
+from rest_framework.test import APIRequestFactory
+from rest_framework.versioning import URLPathVersioning
+
+from openzaak.components.zaken.api.serializers import ZaakSerializer
+from openzaak.components.zaken.api.viewsets import ZaakViewSet
+from openzaak.utils.streaming import StreamingJSONResponse
+
+MEDIA_TYPE = "application/json"
+
+
+def get_serializer_context() -> dict:
+    request = APIRequestFactory().get("/")
+    request.versioning_scheme = URLPathVersioning()
+    request.version = "1"
+    return {"request": request}
+
+
+def get_envelope(count: int) -> OrderedDict:
+    return OrderedDict(
+        [("count", count), ("next", None), ("previous", None), ("results", [])]
+    )
+
+
+def render_regular(page_size: int, context: dict) -> Iterator[bytes]:
+    page = list(ZaakViewSet.queryset[:page_size])
+    data = get_envelope(len(page))
+    data["results"] = ZaakSerializer(page, many=True, context=context).data
+    yield CamelCaseJSONRenderer().render(data, MEDIA_TYPE)
+
+
+def render_streaming(page_size: int, context: dict) -> Iterator[bytes]:
+    page = list(ZaakViewSet.queryset[:page_size])
+    response = StreamingJSONResponse(
+        page,
+        partial(ZaakSerializer, context=context),
+        CamelCaseJSONRenderer(),
+        MEDIA_TYPE,
+        envelope=get_envelope(len(page)),
+    )
+    # skip the envelope, the first bytes of the records are measured
+    chunks = iter(response.streaming_content)
+    envelope = next(chunks)
+    for chunk in chunks:
+        yield envelope + chunk
+        envelope = b""
+
+
+RENDERERS = {
+    "regular": render_regular,
+    "streaming": render_streaming,
+}
+
+
+def measure(chunks: Iterator[bytes]) -> Tuple[float, float, int, int]:
+    """
+    Consume the chunks and return the time to the first chunk, the total time, the
+    number of bytes and the peak of the memory allocations.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    first_chunk = None
+    size = 0
+    try:
+        for chunk in chunks:
+            if first_chunk is None:
+                first_chunk = time.perf_counter() - start
+            size += len(chunk)
+        duration = time.perf_counter() - start
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return first_chunk or duration, duration, size, peak
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the regular renderer with the streaming response for a page of the "
+        "existing zaken. Reports the time to the first byte of the results, the total "
+        "time and the peak of the Python memory allocations. No data is modified."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--page-size", type=int, default=500, help="Number of zaken on the page.",
+        )
+
+    def handle(self, *args, **options):
+        context = get_serializer_context()
+
+        for name, render in RENDERERS.items():
+            first_byte, duration, size, peak = measure(
+                render(options["page_size"], context)
+            )
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f"Renderer '{name}'"))
+            self.stdout.write(
+                f"bytes: {size}, first byte: {first_byte * 1000:.1f}ms, "
+                f"duration: {duration * 1000:.1f}ms, "
+                f"peak memory: {peak / 1024 / 1024:.1f}MiB"
+            )
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+"""
+Run a benchmark of this directory against the configured database.
+
+The benchmarks create and delete data, run them against a throwaway development
+database only. Usage, from the root of the repository::
+
+    $ PYTHONPATH=src python docs/development/performance/benchmarks/run.py <benchmark> --help
+
+The benchmarks are modules of this directory defining a management command.
+"""
+import importlib
+import sys
+from pathlib import Path
+
+import django
+
+from openzaak.setup import setup_env
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+
+
+def get_benchmarks() -> list:
+    return sorted(
+        path.stem for path in BENCHMARKS_DIR.glob("*.py") if path.stem != "run"
+    )
+
+
+def main(argv: list) -> None:
+    benchmarks = get_benchmarks()
+    if len(argv) < 2 or argv[1] not in benchmarks:
+        sys.exit(f"Usage: {argv[0]} {{{','.join(benchmarks)}}} [options]")
+
+    setup_env()
+    django.setup()
+
+    module = importlib.import_module(argv[1])
+    module.Command().run_from_argv(argv)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,119 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+import time
+from inspect import getmembers
+from typing import Any, Dict
+
+from django.core.management import BaseCommand
+from django.db import models
+from django.db.models.base import ModelBase
+
+from django_loose_fk.virtual_models import virtual_model_factory
+from djangorestframework_camel_case.util import underscoreize
+from vng_api_common.descriptors import GegevensGroepType
+
+from openzaak.components.catalogi.models import ZaakType
+from openzaak.loaders import (
+    AuthorizedRequestsLoader,
+    get_model_instance_with_gegevensgroeps,
+)
+
+ZAAKTYPE = "https://catalogi.example.com/api/v1/zaaktypen/{index}"
+
+
+def get_model_instance_uncached(
+    model: ModelBase, data: Dict[str, Any], loader
+) -> models.Model:
+    """
+    Build the virtual model without the cached field names and gegevensgroepen.
+    """
+    field_names = [
+        field.name for field in model._meta.get_fields() if not field.auto_created
+    ] + ["url"]
+    initial_data = data.copy()
+
+    gegevensgroeps = [
+        (a, b) for a, b in getmembers(model) if isinstance(b, GegevensGroepType)
+    ]
+    for gegevensgroep__name, gegevensgroep in gegevensgroeps:
+        if gegevensgroep__name in data:
+            group_data = data.pop(gegevensgroep__name)
+
+            for field, field_value in group_data.items():
+                field_name = gegevensgroep.mapping[field].name
+                data[field_name] = field_value
+
+    data = {key: value for key, value in data.items() if key in field_names}
+
+    virtual_model = virtual_model_factory(model, loader=loader)
+    return virtual_model(initial_data=initial_data, **data)
+
+
+BUILDERS = {
+    "uncached": get_model_instance_uncached,
+    "cached": get_model_instance_with_gegevensgroeps,
+}
+
+
+def get_zaaktype_data(index: int) -> dict:
+    return underscoreize(
+        {
+            "url": ZAAKTYPE.format(index=index),
+            "catalogus": "https://catalogi.example.com/api/v1/catalogussen/1",
+            "identificatie": f"ZAAKTYPE-{index}",
+            "omschrijving": "Zaaktype",
+            "vertrouwelijkheidaanduiding": "openbaar",
+            "doel": "doel",
+            "aanleiding": "aanleiding",
+            "indicatieInternOfExtern": "intern",
+            "handelingInitiator": "indienen",
+            "onderwerp": "onderwerp",
+            "handelingBehandelaar": "uitvoeren",
+            "doorlooptijd": "P30D",
+            "opschortingEnAanhoudingMogelijk": False,
+            "verlengingMogelijk": False,
+            "publicatieIndicatie": False,
+            "productenOfDiensten": [],
+            "referentieproces": {"naam": "proces", "link": ""},
+            "statustypen": [],
+            "beginGeldigheid": "2019-11-20",
+            "versiedatum": "2019-11-20",
+            "concept": False,
+        }
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the time to build the virtual models of remote zaaktypen, with and "
+        "without the cached model metadata. No requests are made and no data is "
+        "modified."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--count",
+            type=int,
+            default=10000,
+            help="Number of remote objects to load.",
+        )
+
+    def handle(self, *args, **options):
+        count = options["count"]
+        loader = AuthorizedRequestsLoader()
+        objects = [get_zaaktype_data(index) for index in range(count)]
+
+        for name, builder in BUILDERS.items():
+            # the builders modify the data
+            batch = [data.copy() for data in objects]
+
+            start = time.perf_counter()
+            for data in batch:
+                builder(ZaakType, data, loader=loader)
+            duration = time.perf_counter() - start
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f"Builder '{name}'"))
+            self.stdout.write(
+                f"objects: {count}, duration: {duration * 1000:.1f}ms, "
+                f"per object: {duration * 1_000_000 / max(count, 1):.1f}µs"
+            )
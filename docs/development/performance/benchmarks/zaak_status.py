@@ -0,0 +1,135 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+import time
+from datetime import date, datetime, timedelta
+from typing import List
+
+from django.core.management import BaseCommand
+from django.db import connection, models, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from vng_api_common.constants import VertrouwelijkheidsAanduiding
+
+from openzaak.components.zaken.models import Resultaat, Status, Zaak
+
+ZAAKTYPE = "https://catalogi.example.com/api/v1/zaaktypen/1"
+STATUSTYPE = "https://catalogi.example.com/api/v1/statustypen/1"
+RESULTAATTYPE = "https://catalogi.example.com/api/v1/resultaattypen/1"
+
+BRONORGANISATIE = "517439943"
+
+
+def get_prefetched_values(queryset: models.QuerySet) -> List[tuple]:
+    queryset = queryset.prefetch_related(
+        "resultaat",
+        models.Prefetch(
+            "status_set", queryset=Status.objects.order_by("-datum_status_gezet")
+        ),
+    )
+    values = []
+    for zaak in queryset:
+        status = zaak.status_set.first()
+        resultaat = getattr(zaak, "resultaat", None)
+        values.append(
+            (status.uuid if status else None, resultaat.uuid if resultaat else None)
+        )
+    return values
+
+
+def get_annotated_values(queryset: models.QuerySet) -> List[tuple]:
+    return [
+        (zaak.current_status_uuid, zaak.resultaat_uuid)
+        for zaak in queryset.annotate_current_status_and_resultaat()
+    ]
+
+
+STRATEGIES = {
+    "prefetch": get_prefetched_values,
+    "annotate": get_annotated_values,
+}
+
+
+def create_zaken(count: int, statuses: int, year: int) -> List[Zaak]:
+    zaken = Zaak.objects.bulk_create(
+        [
+            Zaak(
+                identificatie=f"BENCHMARK-{index}",
+                zaaktype=ZAAKTYPE,
+                bronorganisatie=BRONORGANISATIE,
+                verantwoordelijke_organisatie=BRONORGANISATIE,
+                vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.openbaar,
+                registratiedatum=date(year, 1, 1),
+                startdatum=date(year, 1, 1),
+            )
+            for index in range(count)
+        ]
+    )
+    start = timezone.make_aware(datetime(year, 1, 1))
+    Status.objects.bulk_create(
+        [
+            Status(
+                zaak=zaak,
+                statustype=STATUSTYPE,
+                datum_status_gezet=start + timedelta(hours=index),
+            )
+            for zaak in zaken
+            for index in range(statuses)
+        ],
+        batch_size=1000,
+    )
+    Resultaat.objects.bulk_create(
+        [Resultaat(zaak=zaak, resultaattype=RESULTAATTYPE) for zaak in zaken[::2]]
+    )
+    return zaken
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare prefetching the statuses with annotating the current status and "
+        "resultaat for a page of zaken with long status histories. The zaken are "
+        "created in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--zaken", type=int, default=100, help="Number of zaken on the page."
+        )
+        parser.add_argument(
+            "--statuses", type=int, default=200, help="Number of statuses per zaak.",
+        )
+        parser.add_argument(
+            "--year",
+            type=int,
+            default=1970,
+            help="Registration year of the created zaken.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of times each page is retrieved.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            zaken = create_zaken(options["zaken"], options["statuses"], options["year"])
+
+            queryset = Zaak.objects.filter(pk__in=[zaak.pk for zaak in zaken]).order_by(
+                "-pk"
+            )
+            for name, get_values in STRATEGIES.items():
+                with CaptureQueriesContext(connection) as context:
+                    start = time.perf_counter()
+                    for _i in range(options["repeat"]):
+                        values = get_values(queryset)
+                    duration = (time.perf_counter() - start) / options["repeat"]
+
+                self.stdout.write(self.style.MIGRATE_HEADING(f"Strategy '{name}'"))
+                self.stdout.write(
+                    f"zaken: {len(values)}, "
+                    f"queries: {len(context) // options['repeat']}, "
+                    f"duration: {duration * 1000:.1f}ms"
+                )
+
+            transaction.set_rollback(True)
@@ -6,10 +6,11 @@ from drf_yasg.utils import swagger_auto_schema
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.generics import get_object_or_404
-from rest_framework.pagination import PageNumberPagination
 from vng_api_common.authorizations.models import Applicatie
-from vng_api_common.notifications.viewsets import NotificationViewSetMixin
-from vng_api_common.viewsets import CheckQueryParamsMixin
+
+from openzaak.notifications.viewsets import NotificationViewSetMixin
+from openzaak.utils.mixins import CheckQueryParamsMixin
+from openzaak.utils.pagination import OptimizedPagination
 
 from ._schema_overrides import ApplicatieConsumerAutoSchema
 from .filters import ApplicatieFilter, ApplicatieRetrieveFilter
@@ -105,7 +106,7 @@ class ApplicatieViewSet(
     )
     serializer_class = ApplicatieSerializer
     _filterset_class = ApplicatieFilter
-    pagination_class = PageNumberPagination
+    pagination_class = OptimizedPagination
     lookup_field = "uuid"
     permission_classes = (AutorisatiesAuthRequired,)
     required_scopes = {
@@ -7,3 +7,7 @@ from django.utils.translation import ugettext_lazy as _
 class AuthConfig(AppConfig):
     name = "openzaak.components.autorisaties"
     verbose_name = _("Autorisaties")
+
+    def ready(self):
+        # load the signal receivers
+        from . import signals  # noqa
@@ -0,0 +1,154 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+"""
+Cross-request cache of the authorizations of API clients.
+
+Every API call checks the scopes, zaaktypen/informatieobjecttypen/besluittypen and
+vertrouwelijkheidaanduiding a client is authorized for. Rather than querying the
+``Applicatie`` and ``Autorisatie`` tables on every request, the authorizations of a
+client ID are compiled once into a :class:`ClientAutorisaties` matrix and stored in
+the ``settings.AUTORISATIES_CACHE`` cache.
+
+Cache keys include a version token that is replaced whenever an ``Applicatie``,
+``Autorisatie`` or ``AutorisatieSpec`` changes, see
+:mod:`openzaak.components.autorisaties.signals`.
+"""
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from vng_api_common.authorizations.models import Applicatie, Autorisatie
+from vng_api_common.constants import VertrouwelijkheidsAanduiding
+
+VERSION_KEY = "autorisaties:version"
+
+# (scopes, autorisatie field values, order of the max_vertrouwelijkheidaanduiding)
+MatrixEntry = Tuple[frozenset, Dict[str, str], Optional[int]]
+
+
+def get_va_order(value: str) -> Optional[int]:
+    try:
+        return VertrouwelijkheidsAanduiding.get_choice(value).order
+    except KeyError:
+        return None
+
+
+class ClientAutorisaties:
+    """
+    Precompiled authorizations of a single client ID.
+
+    Holds the applicaties of the client and, per component, the scopes granted for
+    each zaaktype/informatieobjecttype/besluittype together with the maximum
+    vertrouwelijkheidaanduiding. Checking authorizations against this matrix
+    does not require any database queries.
+    """
+
+    type_fields = ("zaaktype", "informatieobjecttype", "besluittype")
+
+    def __init__(self, applicaties: List[Applicatie], autorisaties: List[Autorisatie]):
+        self.applicaties = applicaties
+        self.heeft_alle_autorisaties = any(
+            app.heeft_alle_autorisaties for app in applicaties
+        )
+
+        self.autorisaties = defaultdict(list)
+        self.matrix = defaultdict(list)
+        for autorisatie in autorisaties:
+            self.autorisaties[autorisatie.component].append(autorisatie)
+            self.matrix[autorisatie.component].append(
+                (
+                    frozenset(autorisatie.scopes),
+                    {field: getattr(autorisatie, field) for field in self.type_fields},
+                    get_va_order(autorisatie.max_vertrouwelijkheidaanduiding),
+                )
+            )
+
+    @classmethod
+    def from_db(cls, client_id: str) -> "ClientAutorisaties":
+        applicaties = list(Applicatie.objects.filter(client_ids__contains=[client_id]))
+        autorisaties = list(
+            Autorisatie.objects.filter(applicatie__in=applicaties).order_by("pk")
+        )
+        return cls(applicaties, autorisaties)
+
+    def get_autorisaties(self, component: str) -> List[Autorisatie]:
+        return self.autorisaties.get(component, [])
+
+    @staticmethod
+    def _matches(entry: MatrixEntry, **fields) -> bool:
+        _, values, max_va_order = entry
+        for field_name, field_value in fields.items():
+            if field_value is None:
+                continue
+
+            # mirrors JWTAuth.filter_vertrouwelijkheidaanduiding - the object
+            # may not be more confidential than the authorization allows
+            if field_name == "vertrouwelijkheidaanduiding":
+                order_provided = VertrouwelijkheidsAanduiding.get_choice(
+                    field_value
+                ).order
+                if max_va_order is None or max_va_order < order_provided:
+                    return False
+                continue
+
+            if values.get(field_name) != field_value:
+                return False
+        return True
+
+    def get_scopes(self, component: str, **fields) -> Set[str]:
+        """
+        Collect the scopes provided for the component and permission fields.
+        """
+        scopes_provided = set()
+        for entry in self.matrix.get(component, []):
+            if self._matches(entry, **fields):
+                scopes_provided.update(entry[0])
+        return scopes_provided
+
+
+def _get_cache():
+    return caches[settings.AUTORISATIES_CACHE]
+
+
+def get_cache_version() -> str:
+    cache = _get_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        # another process may have won the race
+        version = cache.get(VERSION_KEY) or ""
+    return version
+
+
+def get_client_autorisaties(client_id: str) -> ClientAutorisaties:
+    """
+    Retrieve the compiled authorizations for the client ID, from cache if possible.
+    """
+    cache = _get_cache()
+    key = f"autorisaties:{get_cache_version()}:{client_id}"
+
+    client_autorisaties = cache.get(key)
+    if client_autorisaties is None:
+        client_autorisaties = ClientAutorisaties.from_db(client_id)
+        cache.set(key, client_autorisaties, timeout=settings.AUTORISATIES_CACHE_TIMEOUT)
+    return client_autorisaties
+
+
+def _bump_version() -> None:
+    _get_cache().set(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def invalidate_autorisaties_cache() -> None:
+    """
+    Invalidate all cached authorizations.
+
+    The version is replaced immediately and once more when the transaction commits,
+    so that other processes can't re-populate the cache with the not-yet-committed
+    state.
+    """
+    _bump_version()
+    transaction.on_commit(_bump_version)
@@ -1,13 +1,12 @@
 # SPDX-License-Identifier: EUPL-1.2
 # Copyright (C) 2019 - 2020 Dimpact
-from typing import List, Union
+from typing import List
 
-from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 import jwt
 from rest_framework.exceptions import PermissionDenied
-from vng_api_common.authorizations.models import Autorisatie
+from vng_api_common.authorizations.models import Applicatie, Autorisatie
 from vng_api_common.middleware import (
     AuthMiddleware as _AuthMiddleware,
     JWTAuth as _JWTAuth,
@@ -15,6 +14,8 @@ from vng_api_common.middleware import (
 
 from openzaak.utils.constants import COMPONENT_MAPPING
 
+from .cache import ClientAutorisaties, get_client_autorisaties
+
 
 class JWTAuth(_JWTAuth):
     component = None
@@ -30,27 +31,29 @@ class JWTAuth(_JWTAuth):
             )
 
     @property
-    def applicaties(self) -> Union[models.QuerySet, List, None]:
-        # Add caching, compared to base class since we do a lot of self.applicaties calls
-        if not hasattr(self, "_applicaties_qs"):
-            self._applicaties_qs = super().applicaties
-        return self._applicaties_qs
+    def client_autorisaties(self) -> ClientAutorisaties:
+        # cached across requests, and on the instance since we do a lot of
+        # self.applicaties calls
+        if not hasattr(self, "_client_autorisaties"):
+            if self.client_id is None:
+                self._client_autorisaties = ClientAutorisaties([], [])
+            else:
+                self._client_autorisaties = get_client_autorisaties(self.client_id)
+        return self._client_autorisaties
+
+    @property
+    def applicaties(self) -> List[Applicatie]:
+        return self.client_autorisaties.applicaties
 
     def _request_auth(self) -> list:
         return []
 
-    def get_autorisaties(self, init_component: str) -> models.QuerySet:
+    def get_autorisaties(self, init_component: str) -> List[Autorisatie]:
         """
         Retrieve all authorizations relevant to this component.
         """
-        if not self.applicaties:
-            return Autorisatie.objects.none()
-
         component = COMPONENT_MAPPING.get(init_component, init_component)
-        app_ids = [app.id for app in self.applicaties]
-        return Autorisatie.objects.filter(
-            applicatie_id__in=app_ids, component=component
-        )
+        return self.client_autorisaties.get_autorisaties(component)
 
     def has_auth(self, scopes: List[str], init_component: str = None, **fields) -> bool:
         if scopes is None:
@@ -60,32 +63,14 @@ class JWTAuth(_JWTAuth):
             return False
 
         # allow everything
-        superuser_applications = [
-            app for app in self.applicaties if app.heeft_alle_autorisaties
-        ]
-        if any(superuser_applications):
+        if self.client_autorisaties.heeft_alle_autorisaties:
             return True
 
         if not init_component:
             return False
 
-        autorisaties = self.get_autorisaties(init_component)
-        scopes_provided = set()
-
-        # filter on all additional components
-        for field_name, field_value in fields.items():
-            if hasattr(self, f"filter_{field_name}"):
-                autorisaties = getattr(self, f"filter_{field_name}")(
-                    autorisaties, field_value
-                )
-            else:
-                autorisaties = self.filter_default(
-                    autorisaties, field_name, field_value
-                )
-
-        for autorisatie in autorisaties:
-            scopes_provided.update(autorisatie.scopes)
-
+        component = COMPONENT_MAPPING.get(init_component, init_component)
+        scopes_provided = self.client_autorisaties.get_scopes(component, **fields)
         return scopes.is_contained_in(list(scopes_provided))
 
 
@@ -79,6 +79,7 @@ class AutorisatieSpec(models.Model):
         is created to set up the appropriate Autorisatie objects. This is best
         called as part of `transaction.on_commit`.
         """
+        from .cache import invalidate_autorisaties_cache
         from .utils import send_applicatie_changed_notification
 
         qs = cls.objects.select_related("applicatie").prefetch_related(
@@ -149,6 +150,8 @@ class AutorisatieSpec(models.Model):
 
         # created the de-duplicated, missing autorisaties
         Autorisatie.objects.bulk_create(_to_add)
+        # bulk_create does not send the post_save signals
+        invalidate_autorisaties_cache()
 
         # determine which notifications to send
         changed = {autorisatie.applicatie for autorisatie in (to_delete + _to_add)}
@@ -0,0 +1,33 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+import logging
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from vng_api_common.authorizations.models import Applicatie, Autorisatie
+
+from .cache import invalidate_autorisaties_cache
+from .models import AutorisatieSpec
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(
+    [post_save, post_delete],
+    sender=Applicatie,
+    dispatch_uid="autorisaties.invalidate_cache_applicatie",
+)
+@receiver(
+    [post_save, post_delete],
+    sender=Autorisatie,
+    dispatch_uid="autorisaties.invalidate_cache_autorisatie",
+)
+@receiver(
+    [post_save, post_delete],
+    sender=AutorisatieSpec,
+    dispatch_uid="autorisaties.invalidate_cache_autorisatiespec",
+)
+def invalidate_cache(sender, **kwargs) -> None:
+    logger.debug("Invalidating the autorisaties cache after change of %r", sender)
+    invalidate_autorisaties_cache()
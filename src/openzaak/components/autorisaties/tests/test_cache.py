@@ -0,0 +1,143 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+from django.test import TestCase, override_settings
+
+from vng_api_common.constants import ComponentTypes, VertrouwelijkheidsAanduiding
+
+from openzaak.components.catalogi.tests.factories import ZaakTypeFactory
+from openzaak.components.zaken.api.scopes import (
+    SCOPE_ZAKEN_ALLES_LEZEN,
+    SCOPE_ZAKEN_BIJWERKEN,
+)
+from openzaak.utils import build_absolute_url
+from openzaak.utils.tests import ClearCachesMixin
+
+from ..cache import get_client_autorisaties
+from ..middleware import JWTAuth
+from ..models import AutorisatieSpec
+from .factories import ApplicatieFactory, AutorisatieFactory
+
+ZAAKTYPE = "https://example.com/zaaktypen/1"
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "axes": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        "oidc": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "autorisaties": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "remote_objects": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    },
+)
+class ClientAutorisatiesCacheTests(ClearCachesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.applicatie = ApplicatieFactory.create(client_ids=["client"])
+        self.autorisatie = AutorisatieFactory.create(
+            applicatie=self.applicatie,
+            component=ComponentTypes.zrc,
+            zaaktype=ZAAKTYPE,
+            scopes=[SCOPE_ZAKEN_ALLES_LEZEN.label],
+            max_vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.intern,
+        )
+
+    def _get_jwt_auth(self) -> JWTAuth:
+        jwt_auth = JWTAuth(encoded=None)
+        jwt_auth._payload = {"client_id": "client"}
+        return jwt_auth
+
+    def test_steady_state_without_queries(self):
+        get_client_autorisaties("client")
+
+        with self.assertNumQueries(0):
+            jwt_auth = self._get_jwt_auth()
+            has_auth = jwt_auth.has_auth(
+                SCOPE_ZAKEN_ALLES_LEZEN,
+                "zaken",
+                zaaktype=ZAAKTYPE,
+                vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.openbaar,
+            )
+            autorisaties = jwt_auth.get_autorisaties("zaken")
+
+        self.assertTrue(has_auth)
+        self.assertEqual(autorisaties, [self.autorisatie])
+
+    def test_has_auth_matrix(self):
+        jwt_auth = self._get_jwt_auth()
+
+        with self.subTest("other zaaktype"):
+            self.assertFalse(
+                jwt_auth.has_auth(
+                    SCOPE_ZAKEN_ALLES_LEZEN,
+                    "zaken",
+                    zaaktype="https://example.com/zaaktypen/2",
+                )
+            )
+
+        with self.subTest("too confidential"):
+            self.assertFalse(
+                jwt_auth.has_auth(
+                    SCOPE_ZAKEN_ALLES_LEZEN,
+                    "zaken",
+                    zaaktype=ZAAKTYPE,
+                    vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.geheim,
+                )
+            )
+
+        with self.subTest("missing scope"):
+            self.assertFalse(
+                jwt_auth.has_auth(SCOPE_ZAKEN_BIJWERKEN, "zaken", zaaktype=ZAAKTYPE)
+            )
+
+        with self.subTest("other component"):
+            self.assertFalse(jwt_auth.has_auth(SCOPE_ZAKEN_ALLES_LEZEN, "besluiten"))
+
+    def test_invalidated_on_autorisatie_change(self):
+        get_client_autorisaties("client")
+
+        self.autorisatie.scopes = [
+            SCOPE_ZAKEN_ALLES_LEZEN.label,
+            SCOPE_ZAKEN_BIJWERKEN.label,
+        ]
+        self.autorisatie.save()
+
+        self.assertTrue(
+            self._get_jwt_auth().has_auth(
+                SCOPE_ZAKEN_BIJWERKEN, "zaken", zaaktype=ZAAKTYPE
+            )
+        )
+
+    def test_invalidated_on_applicatie_change(self):
+        get_client_autorisaties("client")
+
+        self.applicatie.client_ids = ["other-client"]
+        self.applicatie.save()
+
+        self.assertEqual(self._get_jwt_auth().applicaties, [])
+
+    def test_invalidated_on_autorisatie_delete(self):
+        get_client_autorisaties("client")
+
+        self.autorisatie.delete()
+
+        self.assertEqual(self._get_jwt_auth().get_autorisaties("zaken"), [])
+
+    def test_invalidated_on_autorisatiespec_sync(self):
+        zaaktype = ZaakTypeFactory.create()
+        AutorisatieSpec.objects.create(
+            applicatie=self.applicatie,
+            component=ComponentTypes.zrc,
+            scopes=[SCOPE_ZAKEN_BIJWERKEN.label],
+            max_vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.geheim,
+        )
+        get_client_autorisaties("client")
+
+        AutorisatieSpec.sync()
+
+        autorisaties = self._get_jwt_auth().get_autorisaties("zaken")
+        self.assertEqual(len(autorisaties), 1)
+        self.assertEqual(
+            autorisaties[0].zaaktype,
+            build_absolute_url(zaaktype.get_absolute_api_url()),
+        )
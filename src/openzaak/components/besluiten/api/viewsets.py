@@ -6,24 +6,28 @@ from django.utils.translation import ugettext_lazy as _
 from django_loose_fk.virtual_models import ProxyMixin
 from rest_framework import mixins, viewsets
 from rest_framework.exceptions import ValidationError
-from rest_framework.pagination import PageNumberPagination
 from vng_api_common.audittrails.viewsets import (
     AuditTrailCreateMixin,
     AuditTrailDestroyMixin,
     AuditTrailViewSet,
     AuditTrailViewsetMixin,
 )
-from vng_api_common.notifications.viewsets import (
+
+from openzaak.components.zaken.api.mixins import ClosedZaakMixin
+from openzaak.components.zaken.api.utils import delete_remote_zaakbesluit
+from openzaak.notifications.viewsets import (
     NotificationCreateMixin,
     NotificationDestroyMixin,
     NotificationViewSetMixin,
 )
-from vng_api_common.viewsets import CheckQueryParamsMixin
-
-from openzaak.components.zaken.api.mixins import ClosedZaakMixin
-from openzaak.components.zaken.api.utils import delete_remote_zaakbesluit
 from openzaak.utils.api import delete_remote_oio
 from openzaak.utils.data_filtering import ListFilterByAuthorizationsMixin
+from openzaak.utils.mixins import CheckQueryParamsMixin, PrefetchRemoteObjectsMixin
+from openzaak.utils.pagination import (
+    LargeCollectionMixin,
+    OptimizedPagination,
+    StreamingListMixin,
+)
 from openzaak.utils.permissions import AuthRequired
 
 from ..models import Besluit, BesluitInformatieObject
@@ -46,6 +50,8 @@ class BesluitViewSet(
     AuditTrailViewsetMixin,
     ListFilterByAuthorizationsMixin,
     ClosedZaakMixin,
+    PrefetchRemoteObjectsMixin,
+    StreamingListMixin,
     viewsets.ModelViewSet,
 ):
     """
@@ -115,7 +121,7 @@ class BesluitViewSet(
     serializer_class = BesluitSerializer
     filter_class = BesluitFilter
     lookup_field = "uuid"
-    pagination_class = PageNumberPagination
+    pagination_class = OptimizedPagination
     permission_classes = (BesluitAuthRequired,)
     required_scopes = {
         "list": SCOPE_BESLUITEN_ALLES_LEZEN,
@@ -153,6 +159,8 @@ class BesluitInformatieObjectViewSet(
     AuditTrailDestroyMixin,
     CheckQueryParamsMixin,
     ListFilterByAuthorizationsMixin,
+    PrefetchRemoteObjectsMixin,
+    LargeCollectionMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
     viewsets.ReadOnlyModelViewSet,
@@ -10,11 +10,14 @@ from django.utils.translation import ugettext_lazy as _
 from django_loose_fk.fields import FkOrURLField
 from vng_api_common.fields import RSINField
 from vng_api_common.models import APIMixin
-from vng_api_common.utils import generate_unique_identification
 from vng_api_common.validators import UntilTodayValidator
 
 from openzaak.components.documenten.loaders import EIOLoader
 from openzaak.loaders import AuthorizedRequestsLoader
+from openzaak.utils.identificatie import (
+    generate_unique_identification,
+    register_identificatie,
+)
 from openzaak.utils.mixins import AuditTrailMixin
 
 from .constants import VervalRedenen
@@ -185,6 +188,8 @@ class Besluit(AuditTrailMixin, APIMixin, models.Model):
     def save(self, *args, **kwargs):
         if not self.identificatie:
             self.identificatie = generate_unique_identification(self, "datum")
+        elif self._state.adding:
+            register_identificatie(self)
 
         super().save(*args, **kwargs)
 
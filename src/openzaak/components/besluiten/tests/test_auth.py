@@ -14,6 +14,7 @@ from openzaak.components.catalogi.tests.factories import BesluitTypeFactory
 from openzaak.components.documenten.tests.factories import (
     EnkelvoudigInformatieObjectFactory,
 )
+from openzaak.utils.query import AuthorizationsFilterEngines
 from openzaak.utils.tests import JWTAuthMixin
 
 from ..api.scopes import SCOPE_BESLUITEN_AANMAKEN, SCOPE_BESLUITEN_ALLES_LEZEN
@@ -332,3 +333,18 @@ class ExternalBesluittypeScopeTests(JWTAuthMixin, APITestCase):
         self.assertEqual(
             response2.status_code, status.HTTP_403_FORBIDDEN, response2.data
         )
+
+
+@override_settings(AUTORISATIES_FILTER_ENGINE=AuthorizationsFilterEngines.compiled)
+class BesluitReadCorrectScopeCompiledFilterTests(BesluitReadCorrectScopeTests):
+    pass
+
+
+@override_settings(AUTORISATIES_FILTER_ENGINE=AuthorizationsFilterEngines.compiled)
+class BioReadCompiledFilterTests(BioReadTests):
+    pass
+
+
+@override_settings(AUTORISATIES_FILTER_ENGINE=AuthorizationsFilterEngines.compiled)
+class ExternalBesluittypeScopeCompiledFilterTests(ExternalBesluittypeScopeTests):
+    pass
@@ -10,11 +10,14 @@ from django_better_admin_arrayfield.models.fields import ArrayField
 from vng_api_common.descriptors import GegevensGroepType
 from vng_api_common.fields import VertrouwelijkheidsAanduidingField
 from vng_api_common.models import APIMixin
-from vng_api_common.utils import generate_unique_identification
 from vng_api_common.validators import alphanumeric_excluding_diacritic
 
 from openzaak.components.autorisaties.models import AutorisatieSpec
 from openzaak.utils.fields import DurationField
+from openzaak.utils.identificatie import (
+    generate_unique_identification,
+    register_identificatie,
+)
 
 from ..constants import InternExtern
 from ..managers import SyncAutorisatieManager
@@ -299,6 +302,8 @@ class ZaakType(APIMixin, ConceptMixin, GeldigheidMixin, models.Model):
 
         if not self.identificatie:
             self.identificatie = generate_unique_identification(self, "versiedatum")
+        elif self._state.adding:
+            register_identificatie(self)
 
         if not self.verlenging_mogelijk:
             self.verlengingstermijn = None
@@ -0,0 +1,119 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+"""
+Decode base64 encoded documents without holding the decoded content in memory.
+
+The base64 string is validated and decoded one window at a time, directly into the
+file that is passed to the storage.
+"""
+import binascii
+import re
+from base64 import b64decode
+from io import BytesIO
+from typing import BinaryIO
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import (
+    InMemoryUploadedFile,
+    TemporaryUploadedFile,
+    UploadedFile,
+)
+from django.utils.translation import ugettext_lazy as _
+
+# number of characters that are decoded at once, a multiple of 4
+WINDOW_SIZE = 2 ** 20
+
+DATA_URI_SEPARATOR = ";base64,"
+CONTENT_TYPE = "application/octet-stream"
+
+INVALID_CHARACTER = re.compile(r"[^A-Za-z0-9+/=\t\n\r ]")
+INVALID_AFTER_PADDING = re.compile(r"[^=\t\n\r ]")
+WHITESPACE = re.compile(r"[\t\n\r ]+")
+
+
+def _invalid_character(data: str, position: int) -> ValidationError:
+    return ValidationError(
+        _("Invalid base64 character '{character}' at position {position}").format(
+            character=data[position], position=position
+        ),
+        code="invalid-base64",
+    )
+
+
+def decode_base64(
+    data: str, destination: BinaryIO, start: int = 0, window_size: int = WINDOW_SIZE
+) -> int:
+    """
+    Decode the base64 ``data`` into the ``destination`` file, one window at a time.
+
+    Whitespace, like the line breaks of MIME encoded content, is ignored. Characters
+    outside of the base64 alphabet and characters after the padding are reported with
+    their position in ``data``.
+
+    :return: the number of decoded bytes.
+    """
+    assert window_size % 4 == 0, "The window size must be a multiple of 4"
+
+    size = 0
+    pending = ""
+    padded = False
+    for offset in range(start, len(data), window_size):
+        window = data[offset : offset + window_size]
+
+        padding = 0
+        if not padded:
+            invalid = INVALID_CHARACTER.search(window)
+            if invalid:
+                raise _invalid_character(data, offset + invalid.start())
+            padding = window.find("=")
+            padded = padding != -1
+        if padded:
+            invalid = INVALID_AFTER_PADDING.search(window, padding)
+            if invalid:
+                raise _invalid_character(data, offset + invalid.start())
+
+        # only decode complete quanta of 4 characters
+        pending += WHITESPACE.sub("", window)
+        end = len(pending) - len(pending) % 4
+        try:
+            decoded = b64decode(pending[:end], validate=True)
+        except binascii.Error as exc:
+            raise ValidationError(str(exc), code="invalid-base64")
+        destination.write(decoded)
+        size += len(decoded)
+        pending = pending[end:]
+
+    if pending:
+        raise ValidationError(
+            _("The provided base64 data has incorrect padding"),
+            code="incorrect-base64-padding",
+        )
+    return size
+
+
+def decode_base64_file(data: str, name: str) -> UploadedFile:
+    """
+    Decode the base64 ``data``, optionally a data URI, into an uploaded file.
+
+    As for multipart uploads, the file is kept in memory up to
+    ``FILE_UPLOAD_MAX_MEMORY_SIZE`` bytes and written to a temporary file otherwise.
+    """
+    separator = data.find(DATA_URI_SEPARATOR)
+    start = separator + len(DATA_URI_SEPARATOR) if separator != -1 else 0
+
+    if (len(data) - start) // 4 * 3 > settings.FILE_UPLOAD_MAX_MEMORY_SIZE:
+        uploaded_file = TemporaryUploadedFile(name, CONTENT_TYPE, 0, None)
+    else:
+        uploaded_file = InMemoryUploadedFile(
+            BytesIO(), None, name, CONTENT_TYPE, 0, None
+        )
+
+    try:
+        uploaded_file.size = decode_base64(data, uploaded_file.file, start=start)
+    except ValidationError:
+        uploaded_file.close()
+        raise
+
+    uploaded_file.seek(0)
+    return uploaded_file
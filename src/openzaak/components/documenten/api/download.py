@@ -0,0 +1,184 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+"""
+Download the content of documents, supporting conditional and range requests.
+
+Every version of a document has an ETag, which is used for ``If-None-Match``,
+``If-Match`` and ``If-Range`` requests. With the CMIS adapter, the requested range of
+the content is streamed from the DMS in chunks. Otherwise, the file is served through
+django-sendfile, and the web server handles the range requests.
+
+When ``DOWNLOAD_REDIRECT_EXPIRY`` is set, the download redirects to a short-lived
+signed URL instead, after the permissions are checked. The signed URL is answered with
+an ``X-Accel-Redirect``, so the reverse proxy serves the content - for the CMIS adapter
+through an internal location which forwards to the DMS.
+"""
+import hashlib
+import os
+import re
+from typing import Optional, Tuple
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.core import signing
+from django.http import FileResponse, HttpResponse, HttpResponseRedirect
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, quote_etag
+
+from django_sendfile import sendfile
+
+from ..models import EnkelvoudigInformatieObject
+from ..utils import private_media_storage_cmis
+
+CONTENT_TYPE = "application/octet-stream"
+
+SIGNING_SALT = "openzaak.components.documenten.download"
+
+# a single range, multiple ranges are answered with the complete content
+BYTE_RANGE = re.compile(r"^\s*bytes=(\d*)-(\d*)\s*$")
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def get_etag(eio: EnkelvoudigInformatieObject) -> str:
+    """
+    Identify the content of the version of the document.
+
+    The content of a version doesn't change, every update creates a new versie. The
+    integriteit is included, so a document recreated with the same uuid and versie but
+    different content doesn't get the same ETag.
+    """
+    value = ":".join(
+        [
+            str(eio.uuid),
+            str(eio.versie),
+            eio.integriteit_algoritme or "",
+            eio.integriteit_waarde or "",
+        ]
+    )
+    return quote_etag(hashlib.md5(value.encode("utf-8")).hexdigest())
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse the ``Range`` header into the first and last byte, inclusive.
+
+    Returns ``None`` if the complete content should be returned.
+
+    :raises RangeNotSatisfiable: if the range doesn't overlap with the content.
+    """
+    match = BYTE_RANGE.match(header)
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    # suffix range, the last bytes of the content
+    if not first:
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+
+def _get_cmis_response(request, eio: EnkelvoudigInformatieObject, etag: str):
+    size = eio.inhoud.size
+    byte_range = None
+    # a range of another version of the content is ignored
+    if "HTTP_RANGE" in request.META and request.META.get("HTTP_IF_RANGE", etag) == etag:
+        try:
+            byte_range = parse_range(request.META["HTTP_RANGE"], size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    start, end = byte_range or (0, size - 1)
+    content = eio.inhoud.storage.open_content(eio.inhoud.name, start, end)
+    response = FileResponse(
+        content,
+        as_attachment=True,
+        filename=os.path.basename(eio.inhoud.name),
+        content_type=CONTENT_TYPE,
+        status=206 if byte_range else 200,
+    )
+    response["Content-Length"] = end - start + 1
+    response["Accept-Ranges"] = "bytes"
+    if byte_range:
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return response
+
+
+def _get_redirect_response(request, eio: EnkelvoudigInformatieObject):
+    data = {"name": eio.inhoud.name}
+    if settings.CMIS_ENABLED:
+        try:
+            content_url = urlparse(eio.inhoud.storage.url(eio.inhoud.name))
+        except (RuntimeError, NotImplementedError):
+            # the DMS has no content URLs, the content is streamed instead
+            return None
+        data["path"] = content_url._replace(scheme="", netloc="").geturl()
+
+    token = signing.dumps(data, salt=SIGNING_SALT)
+    url = reverse(
+        "enkelvoudiginformatieobject-signed-download",
+        kwargs={"version": request.version, "token": token},
+    )
+    return HttpResponseRedirect(request.build_absolute_uri(url))
+
+
+def get_signed_download_response(request, token: str) -> HttpResponse:
+    """
+    Serve the content of a signed download URL through the reverse proxy.
+
+    :raises django.core.signing.BadSignature: if the token is invalid or expired.
+    """
+    data = signing.loads(
+        token, salt=SIGNING_SALT, max_age=settings.DOWNLOAD_REDIRECT_EXPIRY
+    )
+    if "path" not in data:
+        return sendfile(
+            request,
+            private_media_storage_cmis.path(data["name"]),
+            attachment=True,
+            mimetype=CONTENT_TYPE,
+        )
+
+    response = HttpResponse(content_type=CONTENT_TYPE)
+    response["Content-Disposition"] = 'attachment; filename="{}"'.format(
+        os.path.basename(data["name"])
+    )
+    # the credentials for the DMS are added by the reverse proxy
+    response["X-Accel-Redirect"] = (
+        settings.CMIS_CONTENT_REDIRECT_URL.rstrip("/") + data["path"]
+    )
+    return response
+
+
+def get_download_response(request, eio: EnkelvoudigInformatieObject) -> HttpResponse:
+    etag = get_etag(eio)
+    response = get_conditional_response(request, etag=etag)
+    if response is None and settings.DOWNLOAD_REDIRECT_EXPIRY:
+        response = _get_redirect_response(request, eio)
+    if response is None:
+        if settings.CMIS_ENABLED:
+            response = _get_cmis_response(request, eio, etag)
+        else:
+            response = sendfile(
+                request, eio.inhoud.path, attachment=True, mimetype=CONTENT_TYPE,
+            )
+
+    response["ETag"] = etag
+    return response
@@ -0,0 +1,77 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+"""
+Parse multipart uploads of documents without holding the content in memory.
+
+The ``inhoud`` of a document can be sent as a file part of a ``multipart/form-data``
+request instead of a base64 string in a JSON body. The part is written to a
+temporary file chunk by chunk, while its size and checksum are computed, and the
+storage moves or streams the temporary file to its final location.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.http.multipartparser import (
+    MultiPartParser as DjangoMultiPartParser,
+    MultiPartParserError,
+)
+
+from djangorestframework_camel_case.parser import CamelCaseMultiPartParser
+from djangorestframework_camel_case.settings import api_settings
+from djangorestframework_camel_case.util import underscoreize
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import DataAndFiles
+
+from ..constants import ChecksumAlgoritmes
+
+CHECKSUM_ALGORITME = ChecksumAlgoritmes.sha_256
+
+
+class ChecksumUploadHandler(TemporaryFileUploadHandler):
+    """
+    Stream the uploaded files to temporary files and compute their checksum.
+
+    The hexadecimal SHA-256 digest is set as the ``checksum`` of the uploaded file.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.hash = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.hash.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded_file = super().file_complete(file_size)
+        uploaded_file.checksum = self.hash.hexdigest()
+        return uploaded_file
+
+
+class DocumentMultiPartParser(CamelCaseMultiPartParser):
+    """
+    Parse multipart uploads, with the files streamed to temporary files.
+
+    The files are never kept in memory, regardless of the ``FILE_UPLOAD_*``
+    settings.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        request = parser_context["request"]
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        meta = request.META.copy()
+        meta["CONTENT_TYPE"] = media_type
+        upload_handlers = [ChecksumUploadHandler(request)]
+
+        try:
+            parser = DjangoMultiPartParser(meta, stream, upload_handlers, encoding)
+            data, files = parser.parse()
+        except MultiPartParserError as exc:
+            raise ParseError("Multipart form parse error - %s" % str(exc))
+
+        return DataAndFiles(
+            underscoreize(data, **api_settings.JSON_UNDERSCOREIZE),
+            underscoreize(files, **api_settings.JSON_UNDERSCOREIZE),
+        )
@@ -3,12 +3,13 @@
 """
 Serializers of the Document Registratie Component REST API
 """
-import binascii
-from base64 import b64decode
+import uuid
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import UploadedFile
 from django.db import transaction
+from django.utils import timezone
 from django.utils.http import urlencode
 from django.utils.translation import ugettext_lazy as _
 
@@ -44,6 +45,8 @@ from ..models import (
 from ..query.cmis import flatten_gegevens_groep
 from ..query.django import InformatieobjectRelatedQuerySet
 from ..utils import PrivateMediaStorageWithCMIS
+from .decoders import decode_base64_file
+from .parsers import CHECKSUM_ALGORITME
 from .validators import (
     InformatieObjectUniqueValidator,
     StatusValidator,
@@ -67,21 +70,19 @@ class AnyBase64File(Base64FileField):
         return "bin"
 
     def to_internal_value(self, base64_data):
-        try:
-            return super().to_internal_value(base64_data)
-        except Exception:
-            try:
-                # If validate is False, no check is done to see if the data contains non base-64 alphabet characters
-                b64decode(base64_data, validate=True)
-            except binascii.Error as e:
-                if str(e) == "Incorrect padding":
-                    raise ValidationError(
-                        _("The provided base64 data has incorrect padding"),
-                        code="incorrect-base64-padding",
-                    )
-                raise ValidationError(str(e), code="invalid-base64")
-            except TypeError as exc:
-                raise ValidationError(str(exc))
+        # multipart uploads are streamed to a temporary file by the parser
+        if not isinstance(base64_data, UploadedFile):
+            if base64_data in self.EMPTY_VALUES:
+                return None
+            if not isinstance(base64_data, str):
+                raise ValidationError(
+                    _("The provided data is not a base64 encoded string"),
+                    code="invalid-base64",
+                )
+            base64_data = decode_base64_file(base64_data, f"{uuid.uuid4()}.bin")
+
+        # validate the name and the size of the file
+        return serializers.FileField.to_internal_value(self, base64_data)
 
     def to_representation(self, file):
         is_private_storage = isinstance(file.storage, PrivateMediaFileSystemStorage)
@@ -316,6 +317,19 @@ class EnkelvoudigInformatieObjectSerializer(serializers.HyperlinkedModelSerializ
             )
         return indicatie
 
+    def validate(self, attrs):
+        valid_attrs = super().validate(attrs)
+
+        # the checksum of multipart uploads is computed while the file is received
+        checksum = getattr(valid_attrs.get("inhoud"), "checksum", None)
+        if checksum and not valid_attrs.get("integriteit"):
+            valid_attrs["integriteit"] = {
+                "algoritme": CHECKSUM_ALGORITME,
+                "waarde": checksum,
+                "datum": timezone.localdate(),
+            }
+        return valid_attrs
+
     @transaction.atomic
     def create(self, validated_data):
         """
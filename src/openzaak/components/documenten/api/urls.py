@@ -8,6 +8,7 @@ from vng_api_common import routers
 from vng_api_common.schema import SchemaView as _SchemaView
 
 from ..api.schema import info
+from ..views import SignedDownloadView
 from .viewsets import (
     EnkelvoudigInformatieObjectAuditTrailViewSet,
     EnkelvoudigInformatieObjectViewSet,
@@ -52,6 +53,11 @@ urlpatterns = [
                 ),
                 # actual API
                 url(r"^", include(router.urls)),
+                path(
+                    "downloads/<str:token>",
+                    SignedDownloadView.as_view(),
+                    name="enkelvoudiginformatieobject-signed-download",
+                ),
                 # should not be picked up by drf-yasg
                 path("", router.APIRootView.as_view(), name="api-root-documenten"),
                 path("", include("vng_api_common.api.urls")),
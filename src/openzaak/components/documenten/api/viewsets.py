@@ -1,17 +1,13 @@
 # SPDX-License-Identifier: EUPL-1.2
 # Copyright (C) 2019 - 2022 Dimpact
-from django.conf import settings
 from django.db import transaction
-from django.http import FileResponse
 from django.utils.translation import ugettext_lazy as _
 
 from django_loose_fk.virtual_models import ProxyMixin
-from django_sendfile import sendfile
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from rest_framework.serializers import ValidationError
 from rest_framework.settings import api_settings
@@ -19,12 +15,17 @@ from vng_api_common.audittrails.viewsets import (
     AuditTrailViewSet,
     AuditTrailViewsetMixin,
 )
-from vng_api_common.notifications.viewsets import NotificationViewSetMixin
-from vng_api_common.viewsets import CheckQueryParamsMixin
 
+from openzaak.notifications.viewsets import NotificationViewSetMixin
 from openzaak.utils.data_filtering import ListFilterByAuthorizationsMixin
-from openzaak.utils.mixins import CMISConnectionPoolMixin, ConvertCMISAdapterExceptions
-from openzaak.utils.permissions import AuthRequired
+from openzaak.utils.mixins import (
+    CheckQueryParamsMixin,
+    CMISConnectionPoolMixin,
+    ConvertCMISAdapterExceptions,
+    PrefetchRemoteObjectsMixin,
+)
+from openzaak.utils.pagination import OptimizedPagination, StreamingListMixin
+from openzaak.utils.permissions import AuthRequired, get_permission_data
 from openzaak.utils.schema import COMMON_ERROR_RESPONSES, use_ref
 
 from ..models import (
@@ -33,6 +34,7 @@ from ..models import (
     ObjectInformatieObject,
 )
 from .audits import AUDIT_DRC
+from .download import get_download_response
 from .filters import (
     EnkelvoudigInformatieObjectDetailFilter,
     EnkelvoudigInformatieObjectListFilter,
@@ -40,6 +42,7 @@ from .filters import (
     ObjectInformatieObjectFilter,
 )
 from .kanalen import KANAAL_DOCUMENTEN
+from .parsers import DocumentMultiPartParser
 from .permissions import InformationObjectAuthRequired
 from .renderers import BinaryFileRenderer
 from .scopes import (
@@ -83,6 +86,8 @@ class EnkelvoudigInformatieObjectViewSet(
     NotificationViewSetMixin,
     ListFilterByAuthorizationsMixin,
     AuditTrailViewsetMixin,
+    PrefetchRemoteObjectsMixin,
+    StreamingListMixin,
     viewsets.ModelViewSet,
 ):
     """
@@ -185,7 +190,10 @@ class EnkelvoudigInformatieObjectViewSet(
     )
     lookup_field = "uuid"
     serializer_class = EnkelvoudigInformatieObjectSerializer
-    pagination_class = PageNumberPagination
+    pagination_class = OptimizedPagination
+    # the API schema only documents the JSON body, the multipart body is an
+    # alternative to upload large files
+    parser_classes = (*api_settings.DEFAULT_PARSER_CLASSES, DocumentMultiPartParser)
     permission_classes = (InformationObjectAuthRequired,)
     required_scopes = {
         "list": SCOPE_DOCUMENTEN_ALLES_LEZEN,
@@ -269,15 +277,7 @@ class EnkelvoudigInformatieObjectViewSet(
     @action(methods=["get"], detail=True, name="enkelvoudiginformatieobject_download")
     def download(self, request, *args, **kwargs):
         eio = self.get_object()
-        if settings.CMIS_ENABLED:
-            return FileResponse(eio.inhoud.file, as_attachment=True)
-        else:
-            return sendfile(
-                request,
-                eio.inhoud.path,
-                attachment=True,
-                mimetype="application/octet-stream",
-            )
+        return get_download_response(request, eio)
 
     @swagger_auto_schema(
         request_body=LockEnkelvoudigInformatieObjectSerializer,
@@ -311,7 +311,9 @@ class EnkelvoudigInformatieObjectViewSet(
     @action(detail=True, methods=["post"])
     def unlock(self, request, *args, **kwargs):
         eio = self.get_object()
-        eio_data = self.get_serializer(eio).data
+        eio_data = get_permission_data(
+            eio, InformationObjectAuthRequired.permission_fields, request
+        )
         canonical = eio.canonical
 
         # check if it's a force unlock by administrator
@@ -438,6 +440,7 @@ class ObjectInformatieObjectViewSet(
     ConvertCMISAdapterExceptions,
     CheckQueryParamsMixin,
     ListFilterByAuthorizationsMixin,
+    PrefetchRemoteObjectsMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
     viewsets.ReadOnlyModelViewSet,
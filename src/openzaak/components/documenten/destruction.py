@@ -0,0 +1,308 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+"""
+Destroy documents in bulk, for example for the destruction of an archive.
+
+Destroying a document through the API checks its references and deletes its
+gebruiksrechten with separate queries - or CMIS requests - per document. Here, the
+documents are destroyed in batches, and the references and gebruiksrechten of a batch
+are retrieved with a few set-based queries. Documents which are still related to a
+zaak or besluit are skipped, like the API refuses to destroy them.
+
+Like the API, the audit trails of the destroyed documents are removed and a destroy
+notification is sent for every destroyed document, with every batch.
+"""
+import logging
+from typing import Dict, Iterable, Iterator, List, Set
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from djangorestframework_camel_case.util import camelize
+from drc_cmis import client_builder
+from drc_cmis.utils.exceptions import DocumentDoesNotExistError
+from rest_framework import status
+from vng_api_common.audittrails.models import AuditTrail
+from vng_api_common.constants import CommonResourceAction
+from vng_api_common.notifications.api.serializers import NotificatieSerializer
+from vng_api_common.notifications.models import NotificationsConfig
+from zds_client import ClientError
+
+from openzaak.components.besluiten.models import BesluitInformatieObject
+from openzaak.components.zaken.models import ZaakInformatieObject
+from openzaak.notifications.models import OutboxNotification
+from openzaak.notifications.outbox import build_outbox_notification
+
+from .api.kanalen import KANAAL_DOCUMENTEN
+from .models import (
+    EnkelvoudigInformatieObject,
+    EnkelvoudigInformatieObjectCanonical,
+    Gebruiksrechten,
+)
+from .query.cache import invalidate
+from .query.cmis import get_object_url
+from .utils import private_media_storage_cmis
+
+logger = logging.getLogger(__name__)
+
+notifs_logger = logging.getLogger("vng_api_common.notifications.viewsets")
+
+BATCH_SIZE = 100
+
+
+class BatchResult:
+    """
+    The uuids of the documents in a batch, by outcome.
+    """
+
+    def __init__(self, destroyed: List[str], referenced: List[str], missing: List[str]):
+        self.destroyed = destroyed
+        self.referenced = referenced
+        self.missing = missing
+
+
+def get_referenced_canonicals(canonical_ids: Iterable[int]) -> Set[int]:
+    """
+    Return the ids of the canonicals which are related to a zaak or besluit.
+    """
+    canonical_ids = list(canonical_ids)
+    return set(
+        ZaakInformatieObject.objects.filter(
+            _informatieobject__in=canonical_ids
+        ).values_list("_informatieobject", flat=True)
+    ) | set(
+        BesluitInformatieObject.objects.filter(
+            _informatieobject__in=canonical_ids
+        ).values_list("_informatieobject", flat=True)
+    )
+
+
+def get_referenced_urls(urls: Iterable[str]) -> Set[str]:
+    """
+    Return the URLs of the documents in the DMS which are related to a zaak or besluit.
+    """
+    urls = list(urls)
+    return set(
+        ZaakInformatieObject.objects.filter(_informatieobject_url__in=urls).values_list(
+            "_informatieobject_url", flat=True
+        )
+    ) | set(
+        BesluitInformatieObject.objects.filter(
+            _informatieobject_url__in=urls
+        ).values_list("_informatieobject_url", flat=True)
+    )
+
+
+def build_destroy_message(document: EnkelvoudigInformatieObject) -> dict:
+    """
+    Build the notification message for the destruction of the document.
+    """
+    url = document.get_url()
+    if document._informatieobjecttype_id:
+        informatieobjecttype = get_object_url(document._informatieobjecttype)
+    else:
+        informatieobjecttype = document._informatieobjecttype_url
+
+    message_data = {
+        "kanaal": KANAAL_DOCUMENTEN.label,
+        "hoofd_object": url,
+        "resource": EnkelvoudigInformatieObject._meta.model_name,
+        "resource_url": url,
+        "actie": CommonResourceAction.destroy,
+        "aanmaakdatum": timezone.now(),
+        "kenmerken": KANAAL_DOCUMENTEN.get_kenmerken(
+            document, {"informatieobjecttype": informatieobjecttype}
+        ),
+    }
+    return camelize(NotificatieSerializer(instance=message_data).data)
+
+
+def notify_destroyed(documents: List[EnkelvoudigInformatieObject]) -> None:
+    """
+    Announce the destruction of the documents, like the API does.
+
+    The messages are stored in the outbox with one query, or sent one after the other
+    once the transaction is committed.
+    """
+    if settings.NOTIFICATIONS_DISABLED or not documents:
+        return
+
+    messages = [build_destroy_message(document) for document in documents]
+    if settings.NOTIFICATIONS_OUTBOX:
+        OutboxNotification.objects.bulk_create(
+            [
+                build_outbox_notification(message, status.HTTP_204_NO_CONTENT)
+                for message in messages
+            ]
+        )
+        return
+
+    client = NotificationsConfig.get_client()
+    if client is None:
+        raise RuntimeError("Could not build a client for Notifications API")
+
+    def _send():
+        for message in messages:
+            try:
+                client.create("notificaties", message)
+            except ClientError:
+                notifs_logger.warning(
+                    "Could not deliver message to %s",
+                    client.base_url,
+                    exc_info=True,
+                    extra={
+                        "notification_msg": message,
+                        "status_code": status.HTTP_204_NO_CONTENT,
+                    },
+                )
+
+    transaction.on_commit(_send)
+
+
+def delete_audittrails(urls: Iterable[str]) -> None:
+    """
+    Delete the audit trails of the destroyed documents, like the API does.
+    """
+    AuditTrail.objects.filter(hoofd_object__in=list(urls)).delete()
+
+
+def destroy_documents(
+    uuids: Iterable[str], batch_size: int = BATCH_SIZE, dry_run: bool = False
+) -> Iterator[BatchResult]:
+    """
+    Destroy the documents with the given uuids, with all their versions.
+
+    The uuids are consumed lazily and a result is yielded for every batch, once it's
+    destroyed. Without the CMIS adapter, every batch is destroyed in a transaction.
+    With ``dry_run``, the documents are only checked.
+    """
+    batch = []
+    for uuid in uuids:
+        batch.append(str(uuid))
+        if len(batch) == batch_size:
+            yield _destroy_batch(batch, dry_run)
+            batch = []
+
+    if batch:
+        yield _destroy_batch(batch, dry_run)
+
+
+def _destroy_batch(uuids: List[str], dry_run: bool) -> BatchResult:
+    uuids = list(dict.fromkeys(uuids))
+    if settings.CMIS_ENABLED:
+        return _destroy_cmis_batch(uuids, dry_run)
+
+    with transaction.atomic():
+        return _destroy_db_batch(uuids, dry_run)
+
+
+def _destroy_db_batch(uuids: List[str], dry_run: bool) -> BatchResult:
+    # lock the documents, so no relations or versions can be added before they're
+    # destroyed
+    canonical_ids = set(
+        EnkelvoudigInformatieObjectCanonical.objects.select_for_update(of=("self",))
+        .filter(enkelvoudiginformatieobject__uuid__in=uuids)
+        .values_list("pk", flat=True)
+    )
+    canonical_uuids: Dict[int, str] = {}
+    files: Dict[int, List[str]] = {}
+    versions = EnkelvoudigInformatieObject.objects.filter(
+        canonical__in=canonical_ids
+    ).values_list("uuid", "canonical", "inhoud")
+    for uuid, canonical_id, name in versions:
+        canonical_uuids[canonical_id] = str(uuid)
+        if name:
+            files.setdefault(canonical_id, []).append(name)
+
+    referenced_ids = get_referenced_canonicals(canonical_ids)
+    destroyed_ids = canonical_ids - referenced_ids
+
+    if destroyed_ids and not dry_run:
+        documents = list(
+            EnkelvoudigInformatieObject.objects.filter(canonical__in=destroyed_ids)
+            .select_related("_informatieobjecttype")
+            .order_by("canonical", "-versie")
+            .distinct("canonical")
+        )
+        notify_destroyed(documents)
+        delete_audittrails(document.get_url() for document in documents)
+
+        # the versions, gebruiksrechten and objectinformatieobjecten are cascaded
+        EnkelvoudigInformatieObjectCanonical.objects.filter(
+            pk__in=destroyed_ids
+        ).delete()
+
+        names = {name for pk in destroyed_ids for name in files.get(pk, ())}
+        # content can be shared with the versions of other documents
+        names -= set(
+            EnkelvoudigInformatieObject.objects.filter(inhoud__in=names).values_list(
+                "inhoud", flat=True
+            )
+        )
+        transaction.on_commit(lambda: _delete_files(names))
+
+    found = set(canonical_uuids.values())
+    return BatchResult(
+        destroyed=[canonical_uuids[pk] for pk in destroyed_ids],
+        referenced=[canonical_uuids[pk] for pk in referenced_ids],
+        missing=[uuid for uuid in uuids if uuid not in found],
+    )
+
+
+def _delete_files(names: Iterable[str]) -> None:
+    for name in names:
+        try:
+            private_media_storage_cmis.delete(name)
+        except OSError:
+            logger.exception("The content %s of a destroyed document remains", name)
+
+
+def _destroy_cmis_batch(uuids: List[str], dry_run: bool) -> BatchResult:
+    documents = (
+        EnkelvoudigInformatieObject.objects.filter(uuid__in=uuids)
+        .order_by("canonical", "-versie")
+        .distinct("canonical")
+    )
+    documents = {document.get_url(): document for document in documents}
+    urls = {url: str(document.uuid) for url, document in documents.items()}
+
+    referenced_urls = get_referenced_urls(urls)
+    destroyed_urls = [url for url in urls if url not in referenced_urls]
+    found = set(urls.values())
+    missing = [uuid for uuid in uuids if uuid not in found]
+
+    if dry_run or not destroyed_urls:
+        destroyed = [urls[url] for url in destroyed_urls]
+    else:
+        destroyed = []
+        client = client_builder.get_cmis_client()
+        for gebruiksrechten in Gebruiksrechten.objects.filter(
+            informatieobject__in=destroyed_urls
+        ):
+            client.delete_content_object(
+                gebruiksrechten.uuid, object_type="gebruiksrechten"
+            )
+
+        deleted_urls = []
+        for url in destroyed_urls:
+            uuid = urls[url]
+            try:
+                client.delete_document(uuid)
+            except DocumentDoesNotExistError:
+                # deleted in the meantime
+                missing.append(uuid)
+            else:
+                destroyed.append(uuid)
+                deleted_urls.append(url)
+            invalidate(uuid)
+
+        with transaction.atomic():
+            notify_destroyed([documents[url] for url in deleted_urls])
+            delete_audittrails(deleted_urls)
+
+    return BatchResult(
+        destroyed=destroyed,
+        referenced=[urls[url] for url in referenced_urls],
+        missing=missing,
+    )
@@ -54,3 +54,4 @@ class EIOLoader(AuthorizedRequestsLoader):
             return
 
         model_instance.locked = data["locked"]
+        model_instance.bestandsomvang = data.get("bestandsomvang")
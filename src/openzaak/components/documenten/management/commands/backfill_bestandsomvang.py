@@ -0,0 +1,71 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+from typing import List
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.utils.translation import gettext_lazy as _
+
+from openzaak.components.documenten.models import EnkelvoudigInformatieObject
+
+
+class Command(BaseCommand):
+    help = _(
+        "Record the size of the content of documents that were saved before the size "
+        "was stored in the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help=_("Number of documents that are updated at once."),
+        )
+
+    def handle(self, *args, **options):
+        if settings.CMIS_ENABLED:
+            self.stdout.write(_("This command does not run with CMIS enabled."))
+            return
+
+        documents = (
+            EnkelvoudigInformatieObject.objects.filter(_bestandsomvang__isnull=True)
+            .exclude(inhoud="")
+            .only("pk", "uuid", "inhoud")
+            .order_by("pk")
+        )
+        self.stdout.write(
+            _("Checking {count} records ...").format(count=documents.count())
+        )
+
+        updated = 0
+        batch = []
+        for document in documents.iterator(chunk_size=options["batch_size"]):
+            try:
+                document._bestandsomvang = document.inhoud.size
+            except OSError:
+                self.stderr.write(
+                    _("The content of document {uuid} is missing.").format(
+                        uuid=document.uuid
+                    )
+                )
+                continue
+
+            batch.append(document)
+            if len(batch) == options["batch_size"]:
+                updated += self.update(batch)
+                batch = []
+
+        if batch:
+            updated += self.update(batch)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                _("Recorded the size of {count} document(s).").format(count=updated)
+            )
+        )
+
+    def update(self, batch: List[EnkelvoudigInformatieObject]) -> int:
+        EnkelvoudigInformatieObject.objects.bulk_update(batch, ["_bestandsomvang"])
+        self.stdout.write(_("Updated {count} records").format(count=len(batch)))
+        return len(batch)
@@ -0,0 +1,105 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+import sys
+import uuid as _uuid
+from typing import Iterable, Iterator
+
+from django.core.management import BaseCommand, CommandError
+from django.utils.translation import gettext_lazy as _
+
+from openzaak.components.documenten.destruction import BATCH_SIZE, destroy_documents
+
+
+class Command(BaseCommand):
+    help = _(
+        "Destroy documents with all their versions, for example for the destruction "
+        "of an archive. Documents which are still related to a zaak or besluit are "
+        "skipped. Like the API, a destroy notification is sent for every destroyed "
+        "document and its audit trail is removed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "uuids", nargs="*", help=_("The uuids of the documents to destroy.")
+        )
+        parser.add_argument(
+            "--file",
+            help=_(
+                "File with the uuids of the documents to destroy, one per line. "
+                "Use '-' to read them from stdin."
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help=_("Number of documents that are destroyed at once."),
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help=_("Only report which documents would be destroyed."),
+        )
+
+    def handle(self, *args, **options):
+        if not options["uuids"] and not options["file"]:
+            raise CommandError(_("Specify the uuids or a file with the uuids."))
+
+        dry_run = options["dry_run"]
+        totals = {"destroyed": 0, "referenced": 0, "missing": 0}
+        for result in destroy_documents(
+            self.get_uuids(options), batch_size=options["batch_size"], dry_run=dry_run
+        ):
+            for uuid in result.referenced:
+                self.stderr.write(
+                    _("Document {uuid} is still related, skipped.").format(uuid=uuid)
+                )
+            for uuid in result.missing:
+                self.stderr.write(
+                    _("Document {uuid} does not exist.").format(uuid=uuid)
+                )
+
+            totals["destroyed"] += len(result.destroyed)
+            totals["referenced"] += len(result.referenced)
+            totals["missing"] += len(result.missing)
+            message = (
+                _("Would destroy {destroyed} document(s) so far")
+                if dry_run
+                else _("Destroyed {destroyed} document(s) so far")
+            )
+            self.stdout.write(message.format(**totals))
+
+        message = (
+            _(
+                "Would destroy {destroyed} document(s), skipped {referenced} related "
+                "and {missing} missing document(s)."
+            )
+            if dry_run
+            else _(
+                "Destroyed {destroyed} document(s), skipped {referenced} related and "
+                "{missing} missing document(s)."
+            )
+        )
+        self.stdout.write(self.style.SUCCESS(message.format(**totals)))
+
+    def get_uuids(self, options) -> Iterator[str]:
+        yield from self.read_uuids(options["uuids"])
+
+        if not options["file"]:
+            return
+        if options["file"] == "-":
+            yield from self.read_uuids(sys.stdin)
+            return
+        with open(options["file"]) as uuids:
+            yield from self.read_uuids(uuids)
+
+    def read_uuids(self, lines: Iterable[str]) -> Iterator[str]:
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                uuid = _uuid.UUID(line)
+            except ValueError:
+                raise CommandError(_("Invalid uuid: {uuid}").format(uuid=line))
+            yield str(uuid)
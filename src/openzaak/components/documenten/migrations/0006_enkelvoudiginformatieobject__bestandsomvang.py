@@ -0,0 +1,29 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+# Generated by Django 3.2.13 on 2022-05-16 14:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "documenten",
+            "0005_alter_enkelvoudiginformatieobject_indicatie_gebruiksrecht",
+        ),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="enkelvoudiginformatieobject",
+            name="_bestandsomvang",
+            field=models.PositiveBigIntegerField(
+                blank=True,
+                editable=False,
+                help_text="Aantal bytes dat de inhoud van INFORMATIEOBJECT in beslag neemt.",
+                null=True,
+                verbose_name="bestandsomvang",
+            ),
+        ),
+    ]
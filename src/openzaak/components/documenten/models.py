@@ -18,9 +18,12 @@ from vng_api_common.constants import ObjectTypes
 from vng_api_common.descriptors import GegevensGroepType
 from vng_api_common.fields import RSINField, VertrouwelijkheidsAanduidingField
 from vng_api_common.models import APIMixin
-from vng_api_common.utils import generate_unique_identification
 from vng_api_common.validators import alphanumeric_excluding_diacritic
 
+from openzaak.utils.identificatie import (
+    generate_unique_identification,
+    register_identificatie,
+)
 from openzaak.utils.mixins import AuditTrailMixin, CMISClientMixin
 
 from ..besluiten.models import BesluitInformatieObject
@@ -31,6 +34,7 @@ from .managers import (
     GebruiksrechtenAdapterManager,
     ObjectInformatieObjectAdapterManager,
 )
+from .query.cache import invalidate
 from .query.django import InformatieobjectQuerySet
 from .utils import private_media_storage_cmis
 from .validators import validate_status
@@ -207,6 +211,8 @@ class InformatieObject(models.Model):
     def save(self, *args, **kwargs):
         if not self.identificatie:
             self.identificatie = generate_unique_identification(self, "creatiedatum")
+        elif self._state.adding:
+            register_identificatie(self)
         super().save(*args, **kwargs)
 
     def clean(self):
@@ -264,6 +270,7 @@ class EnkelvoudigInformatieObjectCanonical(models.Model, CMISClientMixin):
         lock = _uuid.uuid4().hex
         if settings.CMIS_ENABLED:
             self.cmis_client.lock_document(doc_uuid, lock)
+            invalidate(doc_uuid)
         self.lock = lock
 
     def unlock_document(self, doc_uuid, lock, force_unlock=False):
@@ -271,6 +278,7 @@ class EnkelvoudigInformatieObjectCanonical(models.Model, CMISClientMixin):
             self.cmis_client.unlock_document(
                 drc_uuid=doc_uuid, lock=lock, force=force_unlock
             )
+            invalidate(doc_uuid)
         self.lock = ""
 
 
@@ -377,10 +385,19 @@ class EnkelvoudigInformatieObject(
         db_index=True,
     )
 
+    # the size is recorded when the content is saved, so it's not retrieved from the
+    # storage backend for every serialization. Use the ``bestandsomvang`` property.
+    _bestandsomvang = models.PositiveBigIntegerField(
+        _("bestandsomvang"),
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_("Aantal bytes dat de inhoud van INFORMATIEOBJECT in beslag neemt."),
+    )
+
     # When dealing with remote EIO, there is no pk or canonical instance to derive
     # the lock status from. The getters and setters then use this private attribute.
     _locked = False
-    _bestandsomvang = None
     objects = AdapterManager()
 
     class Meta:
@@ -398,7 +415,9 @@ class EnkelvoudigInformatieObject(
 
     @property
     def bestandsomvang(self):
-        if not self._bestandsomvang:
+        # documents saved before the size was recorded, see the
+        # ``backfill_bestandsomvang`` management command
+        if self._bestandsomvang is None and self.inhoud:
             self._bestandsomvang = self.inhoud.size
         return self._bestandsomvang
 
@@ -421,6 +440,9 @@ class EnkelvoudigInformatieObject(
 
     def save(self, *args, **kwargs) -> None:
         if not settings.CMIS_ENABLED:
+            # the size of new content is known without accessing the storage
+            if self.inhoud and not self.inhoud._committed:
+                self._bestandsomvang = self.inhoud.size
             return super().save(*args, **kwargs)
         else:
             model_data = model_to_dict(self)
@@ -454,6 +476,7 @@ class EnkelvoudigInformatieObject(
                 for gebruiksrechten_doc in gebruiksrechten:
                     gebruiksrechten_doc.delete()
             self.cmis_client.delete_document(self.uuid)
+            invalidate(self.uuid)
 
     def destroy(self):
         if settings.CMIS_ENABLED:
@@ -0,0 +1,246 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+"""
+Cache the documents and version histories retrieved from the CMIS repository.
+
+Within a request, the query, the size, url and download of a document each need the
+same CMIS documents. Within a :func:`document_cache_scope`, the documents are cached
+per (uuid, versie). They can also be shared between requests and processes through
+the ``CMIS_DOCUMENTS_CACHE``, when the ``CMIS_DOCUMENTS_CACHE_TIMEOUT`` is set.
+
+Every change of a document through Open Zaak (save, delete, lock and unlock)
+invalidates its cached versions with :func:`invalidate`. The shared cache keeps a
+generation per document, which is replaced on invalidation, so entries written by
+requests that read the document before the change are never read again.
+"""
+import threading
+import uuid as _uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from django.conf import settings
+from django.core.cache import caches
+
+from drc_cmis.connections import get_session
+from zgw_consumers.concurrent import parallel
+
+LATEST = "latest"
+
+# maximum number of version histories that are retrieved concurrently
+VERSIONS_WORKERS = 10
+
+_scope = threading.local()
+
+
+class CachedDocument:
+    """
+    The cached versions of a single document.
+    """
+
+    def __init__(self, generation: Optional[str] = None):
+        self.generation = generation
+        # latest version or versie -> CMIS document
+        self.documents: Dict[Union[str, int], object] = {}
+        self.versions: Optional[List] = None
+
+
+@contextmanager
+def document_cache_scope():
+    """
+    Keep the retrieved CMIS documents within the block, for the current thread.
+    """
+    previous = getattr(_scope, "documents", None)
+    _scope.documents = {}
+    try:
+        yield
+    finally:
+        _scope.documents = previous
+
+
+def _get_generation_key(uuid: str) -> str:
+    return f"cmis_document_generation:{uuid}"
+
+
+def _get_cache_key(uuid: str, generation: str) -> str:
+    return f"cmis_document:{uuid}:{generation}"
+
+
+def _dump(document) -> tuple:
+    # the client holds the configuration and the connections, and is set again
+    # when the document is loaded
+    state = {key: value for key, value in vars(document).items() if key != "client"}
+    return (type(document), state)
+
+
+def _load(dumped: tuple, client):
+    document_class, state = dumped
+    document = document_class.__new__(document_class)
+    vars(document).update(state)
+    document.client = client
+    return document
+
+
+def _get_entry(client, uuid: str) -> CachedDocument:
+    documents = getattr(_scope, "documents", None)
+    if documents is not None and uuid in documents:
+        return documents[uuid]
+
+    entry = CachedDocument()
+    timeout = settings.CMIS_DOCUMENTS_CACHE_TIMEOUT
+    if timeout:
+        cache = caches[settings.CMIS_DOCUMENTS_CACHE]
+        generation_key = _get_generation_key(uuid)
+        # the generation is fixed before the documents are retrieved, so a concurrent
+        # change of the document makes the entry of this request unreachable
+        generation = _uuid.uuid4().hex
+        if cache.add(generation_key, generation, timeout=timeout):
+            entry.generation = generation
+        else:
+            entry.generation = cache.get(generation_key)
+            cached = cache.get(_get_cache_key(uuid, entry.generation))
+            if cached:
+                entry.documents = {
+                    key: _load(dumped, client)
+                    for key, dumped in cached["documents"].items()
+                }
+                if cached["versions"] is not None:
+                    entry.versions = [
+                        _load(dumped, client) for dumped in cached["versions"]
+                    ]
+
+    if documents is not None:
+        documents[uuid] = entry
+    return entry
+
+
+def _store_entry(uuid: str, entry: CachedDocument) -> None:
+    timeout = settings.CMIS_DOCUMENTS_CACHE_TIMEOUT
+    if not timeout or entry.generation is None:
+        return
+
+    cached = {
+        "documents": {
+            key: _dump(document) for key, document in entry.documents.items()
+        },
+        "versions": (
+            [_dump(version) for version in entry.versions]
+            if entry.versions is not None
+            else None
+        ),
+    }
+    caches[settings.CMIS_DOCUMENTS_CACHE].set(
+        _get_cache_key(uuid, entry.generation), cached, timeout=timeout
+    )
+
+
+def get_all_versions(client, document) -> List:
+    """
+    Retrieve all versions of the CMIS document, most recent first.
+
+    The returned list is shared and must not be modified.
+    """
+    uuid = str(document.uuid)
+    entry = _get_entry(client, uuid)
+    if entry.versions is None:
+        entry.versions = client.get_all_versions(document)
+        _store_entry(uuid, entry)
+    return entry.versions
+
+
+def iter_all_versions(client, documents: Iterable) -> Iterator[List]:
+    """
+    Retrieve all versions of each of the CMIS documents, in the order of the documents.
+
+    The version histories that aren't cached are retrieved concurrently, at most
+    ``VERSIONS_WORKERS`` documents ahead of the consumer, so a partially consumed
+    iterator doesn't retrieve all of them. Like :func:`get_all_versions`, the returned
+    lists are shared and must not be modified.
+    """
+    # the configuration is loaded from the database, which the pool threads don't
+    # share with the current thread
+    client.config
+    sessions = set()
+
+    def fetch(document) -> List:
+        # every pool thread has its own connection pool, which is kept for all the
+        # version histories it retrieves
+        sessions.add(get_session())
+        return client.get_all_versions(document)
+
+    pending = deque()
+    try:
+        with parallel(max_workers=VERSIONS_WORKERS) as executor:
+            fetching = {}
+            try:
+                for document in documents:
+                    uuid = str(document.uuid)
+                    entry = _get_entry(client, uuid)
+                    if entry.versions is None and uuid not in fetching:
+                        fetching[uuid] = executor.submit(fetch, document)
+                    pending.append((uuid, entry, fetching.get(uuid)))
+
+                    if len(pending) > VERSIONS_WORKERS:
+                        yield _resolve_versions(*pending.popleft())
+
+                while pending:
+                    yield _resolve_versions(*pending.popleft())
+            finally:
+                for _key, _entry, future in pending:
+                    if future is not None:
+                        future.cancel()
+    finally:
+        for session in sessions:
+            session.close()
+
+
+def _resolve_versions(uuid: str, entry: CachedDocument, future) -> List:
+    if entry.versions is None:
+        entry.versions = future.result()
+        _store_entry(uuid, entry)
+    return entry.versions
+
+
+def get_document(client, uuid: str, versie: Optional[int] = None):
+    """
+    Retrieve the CMIS document with the given Documenten API ``versie``.
+
+    Without a ``versie``, or if the version doesn't exist, the latest version is
+    returned.
+    """
+    uuid = str(uuid)
+    entry = _get_entry(client, uuid)
+    key = LATEST if versie is None else versie
+    if key in entry.documents:
+        return entry.documents[key]
+
+    if LATEST not in entry.documents:
+        entry.documents[LATEST] = client.get_document(drc_uuid=uuid)
+    document = entry.documents[LATEST]
+
+    # only way to get a specific version
+    if versie is not None and document.versie != versie:
+        for version in get_all_versions(client, document):
+            if version.versie == versie:
+                document = version
+                break
+
+    entry.documents[key] = document
+    _store_entry(uuid, entry)
+    return document
+
+
+def invalidate(uuid: str) -> None:
+    """
+    Drop the cached versions of the document, after it was changed.
+    """
+    uuid = str(uuid)
+    documents = getattr(_scope, "documents", None)
+    if documents is not None:
+        documents.pop(uuid, None)
+
+    timeout = settings.CMIS_DOCUMENTS_CACHE_TIMEOUT
+    if timeout:
+        caches[settings.CMIS_DOCUMENTS_CACHE].set(
+            _get_generation_key(uuid), _uuid.uuid4().hex, timeout=timeout
+        )
@@ -4,19 +4,22 @@ import copy
 import datetime
 import logging
 import uuid
-from itertools import groupby
-from operator import attrgetter, itemgetter
-from typing import List, Optional, Tuple
+from collections import defaultdict
+from itertools import chain, islice
+from operator import attrgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from django.db import IntegrityError
-from django.db.models import fields
+from django.db.models import Case, fields
 from django.db.models.query import BaseIterable
 from django.utils import timezone
 from django.utils.text import slugify
 
 from django_loose_fk.virtual_models import ProxyMixin
+from drc_cmis.browser.client import CMISDRCClient
 from drc_cmis.utils.convert import make_absolute_uri
 from drc_cmis.utils.mapper import mapper
+from drc_cmis.utils.query import CMISQuery
 from rest_framework.request import Request
 from vng_api_common.constants import VertrouwelijkheidsAanduiding
 from vng_api_common.tests import reverse
@@ -24,11 +27,13 @@ from vng_api_common.tests import reverse
 from openzaak.loaders import AuthorizedRequestsLoader
 from openzaak.utils.decorators import convert_cmis_adapter_exceptions
 from openzaak.utils.mixins import CMISClientMixin
+from openzaak.utils.query import get_allowed_va
 
 from ...besluiten.models import Besluit
 from ...catalogi.models.informatieobjecttype import InformatieObjectType
 from ...zaken.models import Zaak
 from ..utils import Cmisdoc, CMISStorageFile
+from .cache import invalidate, iter_all_versions
 from .django import (
     InformatieobjectQuerySet,
     InformatieobjectRelatedQuerySet,
@@ -45,19 +50,96 @@ EIO_PROPERTY_MAP = {
 }
 
 
-def sort_results(documents: List, order_by: List[str]) -> List:
+# the documents of a canonical are grouped together, in the order of their creation
+CANONICAL_ORDERING = [("creationDate", False), ("uuid", False)]
+
+# version label of the private working copy of a locked document
+PWC_VERSION_LABEL = "pwc"
+
+
+def get_ordering(
+    order_by: List[str], group_canonical: bool = True
+) -> List[Tuple[str, bool]]:
+    """
+    Translate the ordering of the query into (property, descending) pairs.
+
+    Ordering on canonical first groups the versions of a document, in the order of
+    creation of the documents. Within the versions of a single document
+    (``group_canonical=False``), the canonical order keys are ignored.
+    """
+    _order_keys = [key if not key.startswith("-") else key[1:] for key in order_by]
+    if any(key not in EIO_PROPERTY_MAP for key in _order_keys):
+        raise NotImplementedError(
+            f"Not all order keys in {_order_keys} are implemented yet."
+        )
+
+    ordering = []
+    for index, order_key in enumerate(order_by):
+        descending = order_key.startswith("-")
+        _order_key = order_key if not descending else order_key[1:]
+        if _order_key == "canonical":
+            if group_canonical and index == 0:
+                ordering += CANONICAL_ORDERING
+            elif group_canonical:
+                ordering.append(("uuid", descending))
+            continue
+        ordering.append((EIO_PROPERTY_MAP[_order_key], descending))
+    return ordering
+
+
+def get_order_by_column(attr_name: str) -> str:
+    """
+    Map the property of the CMIS models to the column of an ORDER BY clause.
+    """
+    if attr_name == "creationDate":
+        return "cmis:creationDate"
+    return mapper(attr_name, type="document")
+
+
+def sort_documents(documents: List, ordering: List[Tuple[str, bool]]) -> List:
     # mixing ASC/DESC is not possible in a single sorted(...) call with the `reverse`
     # option, so we need to call sorted for every order key, and do this in reverse.
-    # if the order key starts with `-` to indicate DESC sorting, we need to reverse
-    for order_key in order_by[::-1]:
-        reverse = order_key.startswith("-")
-        _order_key = order_key if not reverse else order_key[1:]
-        documents = sorted(
-            documents, key=attrgetter(EIO_PROPERTY_MAP[_order_key]), reverse=reverse
-        )
+    for attr_name, descending in ordering[::-1]:
+        documents = sorted(documents, key=attrgetter(attr_name), reverse=descending)
     return documents
 
 
+def group_by_canonical(
+    documents: Iterable[Cmisdoc], ordering: List[Tuple[str, bool]]
+) -> List[Cmisdoc]:
+    """
+    Group the documents of the same canonical, in order of their first occurrence.
+
+    The documents within a group are sorted on the ``ordering``.
+    """
+    groups = {}
+    for document in documents:
+        groups.setdefault(document.uuid, []).append(document)
+    return list(
+        chain.from_iterable(
+            sort_documents(group, ordering) if len(group) > 1 else group
+            for group in groups.values()
+        )
+    )
+
+
+def get_max_va_orders(case: Case) -> Dict[str, int]:
+    """
+    Map the informatieobjecttypen of the authorizations to the highest allowed order
+    of the vertrouwelijkheidaanduiding.
+
+    :param case: the CASE/WHEN of the authorizations, see
+      :meth:`openzaak.utils.query.LooseFkAuthorizationsFilterMixin.get_filters`
+    """
+    max_orders = {}
+    for when in case.cases:
+        ((_field, informatieobjecttype),) = when.condition.children
+        url = get_object_url(informatieobjecttype)
+        order = when.result.value
+        max_orders[url] = max(order, max_orders.get(url, order))
+    return max_orders
+
+
 # ---------------------- Model iterables -----------
 
 # TODO Refactor so that all these iterables inherit from a class that implements the shared functionality
@@ -68,117 +150,202 @@ class CMISDocumentIterable(BaseIterable, CMISClientMixin):
 
     def __iter__(self):
         queryset = self.queryset
+        query = queryset.query
+
+        filters = self._check_for_pk_filter(queryset._cmis_query)
+
+        lhs, rhs = self._normalize_filters(filters)
+        ordering = get_ordering(query.order_by)
+
+        if not self._can_page(query):
+            documents = self._query(lhs, rhs, ordering)[0]
+            eios = self._iter_eios(query, filters, documents)
+            yield from islice(eios, query.low_mark, query.high_mark)
+            return
+
+        max_items = None
+        if query.high_mark is not None:
+            max_items = query.high_mark - query.low_mark
+        # a locked document is represented by its latest version, which is replaced
+        # by the private working copy when it's converted
+        documents = self._query(
+            lhs,
+            rhs,
+            ordering,
+            skip_count=query.low_mark,
+            max_items=max_items,
+            exclude_pwc=True,
+        )[0]
+        yield from self._iter_eios(query, filters, documents)
+
+    def get_count(self) -> Optional[int]:
+        """
+        Retrieve the number of documents from the DMS, without the documents.
+
+        Returns ``None`` if the query can't be counted by the DMS. Like the results,
+        the count excludes the private working copies of locked documents.
+        """
+        queryset = self.queryset
+        query = queryset.query
+
+        # the webservice binding retrieves all the documents to count them, which
+        # are not kept
+        if not isinstance(queryset.cmis_client, CMISDRCClient):
+            return None
 
         filters = self._check_for_pk_filter(queryset._cmis_query)
+        if query.is_sliced or not self._can_page(query):
+            return None
 
         lhs, rhs = self._normalize_filters(filters)
+        _documents, num_items = self._query(lhs, rhs, [], max_items=1, exclude_pwc=True)
+        return num_items
+
+    def _can_page(self, django_query) -> bool:
+        # only the distinct query returns one document per result of the CMIS query
+        return "canonical" in django_query.distinct_fields
+
+    def _query(
+        self,
+        lhs: List[str],
+        rhs: List[str],
+        ordering: List[Tuple[str, bool]],
+        skip_count: int = 0,
+        max_items: Optional[int] = None,
+        exclude_pwc: bool = False,
+    ) -> Tuple[List[Cmisdoc], Optional[int]]:
+        """
+        Query the documents in the given order, and the total number of results.
 
-        documents = queryset.cmis_client.query(self.return_type, lhs, rhs)
-        documents = self._process_intermediate(queryset.query, documents)
+        The total is ``None`` if the DMS doesn't know it. With ``exclude_pwc``, the
+        private working copies are left out of the results and the total.
+        """
+        client = self.queryset.cmis_client
+        end = skip_count + max_items if max_items is not None else None
+
+        # the webservice binding of the CMIS adapter doesn't support ordering or
+        # paging the queries
+        if not isinstance(client, CMISDRCClient):
+            documents = client.query(self.return_type, lhs, rhs)
+            if exclude_pwc:
+                documents = [
+                    document
+                    for document in documents
+                    if document.versionLabel != PWC_VERSION_LABEL
+                ]
+            return sort_documents(documents, ordering)[skip_count:end], len(documents)
+
+        if exclude_pwc:
+            lhs = lhs + ["cmis:isPrivateWorkingCopy = false"]
+        where = (" WHERE " + " AND ".join(lhs)) if lhs else ""
+        order_by = ", ".join(
+            f"{get_order_by_column(attr_name)} {'DESC' if descending else 'ASC'}"
+            for attr_name, descending in ordering
+        )
+        order_by = f" ORDER BY {order_by}" if order_by else ""
+        query = CMISQuery(f"SELECT * FROM {self.table}{where}{order_by}")
+
+        data = {
+            "cmisaction": "query",
+            "statement": query(*rhs),
+            "skipCount": skip_count,
+        }
+        if max_items is not None:
+            data["maxItems"] = max_items
+        response = client.post_request(client.base_url, data)
+        documents = client.get_all_results(
+            response, client.get_return_type(self.return_type)
+        )
+        # numItems is optional, and -1 if the DMS doesn't know the number
+        num_items = response.get("numItems")
+        if num_items is None or num_items < 0:
+            num_items = None
+        return documents, num_items
+
+    def _iter_eios(
+        self, django_query, filters: List[Tuple], documents: List[Cmisdoc]
+    ) -> Iterator:
+        documents = self._process_intermediate(django_query, documents)
 
         version = dict(filters).get("versie")
         begin_registratie = dict(filters).get("begin_registratie")
 
-        if self._needs_vertrowelijkaanduiding_filter(filters):
-            documents = self._filter_by_va(filters, documents)
-
         # a collection of (uuid, versie) which is considered unique together. Once such
         # a tuple is seen, no extra results with the same version can be seen. This is
         # required because alfresco tracks cmis:versionLabel for all updates, while they
         # keep the same Documenten API versie (i.e.: there are multiple alfresco versions
         # with the (uuid, versie) combo).
         uuid_version_tuples_seen = set()
+        version_ordering = get_ordering(django_query.order_by, group_canonical=False)
 
-        for document in documents:
-            # distinct on canonical -> we want the latest version of each document, if
-            # a PWC exists, grab that. This means -> don't fetch additional versions
-            if "canonical" in queryset.query.distinct_fields:
-                assert (
-                    "-versie" in queryset.query.order_by
-                ), "Undefined behaviour w/r to version sorting"
-                eio = cmis_doc_to_django_model(
+        # distinct on canonical -> we want the latest version of each document, if
+        # a PWC exists, grab that. This means -> don't fetch additional versions
+        if "canonical" in django_query.distinct_fields:
+            assert (
+                "-versie" in django_query.order_by
+            ), "Undefined behaviour w/r to version sorting"
+            for document in documents:
+                yield cmis_doc_to_django_model(
                     document,
                     skip_pwc=False,
                     version=version,
                     begin_registratie=begin_registratie,
                 )
-                yield eio
+            return
 
-            # general query, we want multiple versions of the same document -> get the entire
-            # version history
-            else:
-                versions = self.cmis_client.get_all_versions(document)
-                versions = sort_results(versions, queryset.query.order_by)
+        # general query, we want multiple versions of the same document -> get the entire
+        # version history. The histories are retrieved concurrently, in the order of
+        # the documents.
+        for versions in iter_all_versions(self.cmis_client, documents):
+            versions = sort_documents(versions, version_ordering)
 
-                seen = set()
-                for version in versions:
-                    if version.versie in seen:
-                        continue
+            seen = set()
+            for document_version in versions:
+                if document_version.versie in seen:
+                    continue
 
-                    uuid_version_combination = (version.uuid, version.versie)
-                    if uuid_version_combination in uuid_version_tuples_seen:
-                        continue
+                uuid_version_combination = (
+                    document_version.uuid,
+                    document_version.versie,
+                )
+                if uuid_version_combination in uuid_version_tuples_seen:
+                    continue
 
-                    # mark version as seen in both scopes
-                    seen.add(version.versie)
-                    uuid_version_tuples_seen.add(uuid_version_combination)
+                # mark version as seen in both scopes
+                seen.add(document_version.versie)
+                uuid_version_tuples_seen.add(uuid_version_combination)
 
-                    yield cmis_doc_to_django_model(version, skip_pwc=True)
+                yield cmis_doc_to_django_model(document_version, skip_pwc=True)
 
     def _process_intermediate(
         self, django_query, documents: List[Cmisdoc]
     ) -> List[Cmisdoc]:
         """
-        Order the results of the CMIS query and throw out non-distinct results.
+        Throw out the non-distinct results of the ordered CMIS query.
         """
-        _order_keys = [
-            key if not key.startswith("-") else key[1:] for key in django_query.order_by
-        ]
-        if any(key not in EIO_PROPERTY_MAP for key in _order_keys):
-            raise NotImplementedError(
-                f"Not all order keys in {_order_keys} are implemented yet."
-            )
-
-        documents = sort_results(documents, django_query.order_by)
-
         if django_query.distinct and not django_query.distinct_fields:
             raise NotImplementedError("Blank distinct not implemented.")
 
-        # now that the ordering is okay, implement the distinct fields
+        # the documents are ordered, so the first un-seen record for every particular
+        # distinct field is kept
         for field in django_query.distinct_fields:
             attr_name = EIO_PROPERTY_MAP[field]
-            to_keep = []
             seen = set()
-            # loop over the sorted documents, and grab the first un-seen record for this
-            # particular distinct field
+            to_keep = []
             for document in documents:
                 value = getattr(document, attr_name)
-                # value already seen -> skip subsequent ones
-                if value in seen:
-                    continue
-
-                # first occurrence - keep the document and mark the value as seen
-                to_keep.append(document)
-                seen.add(value)
-
-            # re-assign the result set of documents to only those to keep, and repeat
-            # for remaining distinct fields
+                if value not in seen:
+                    to_keep.append(document)
+                    seen.add(value)
             documents = to_keep
 
-        # do a final sort, because UUID sorting (canonical) does not mimic reality
-        if _order_keys and _order_keys[0] == "canonical":
-            grouped = []
-            # maintain any groups that may have been bundled by UUID! and then sort the
-            # groups
-            for canonical, group in groupby(documents, key=attrgetter("uuid")):
-                group = list(group)
-                min_creation = min([x.creationDate for x in group])
-                grouped.append((min_creation, group))
-
-            # now the groups are sorted by their logical canonical creation date
-            grouped = sorted(grouped, key=itemgetter(0))
-            # merge the documents together again (flattening the tuples of [int, list])
-            documents = sum([group for _, group in grouped], [])
+        # the ordering on creation date only keeps the versions of a canonical together
+        # if they have the same creation date
+        order_keys = [key.lstrip("-") for key in django_query.order_by]
+        if order_keys and order_keys[0] == "canonical":
+            documents = group_by_canonical(
+                documents, get_ordering(django_query.order_by, group_canonical=False)
+            )
 
         return documents
 
@@ -195,6 +362,10 @@ class CMISDocumentIterable(BaseIterable, CMISClientMixin):
         _lhs = []
         _rhs = []
 
+        # the vertrouwelijkheidaanduiding filter also limits the informatieobjecttypen
+        # to the authorized ones
+        has_va_filter = "_va_order" in dict(filters)
+
         # TODO: make this more declarative
 
         for key, value in filters:
@@ -207,9 +378,14 @@ class CMISDocumentIterable(BaseIterable, CMISClientMixin):
                 _rhs.append(value.isoformat().replace("+00:00", "Z"))
                 continue
             elif key == "_va_order":
+                lhs, rhs = self._build_va_filter(value)
+                _lhs.append(lhs)
+                _rhs += rhs
                 continue
             elif key == "informatieobjecttype":
-                if isinstance(value, list) and len(value) == 0:
+                if isinstance(value, list) and has_va_filter:
+                    continue
+                elif isinstance(value, list) and len(value) == 0:
                     # In this case there are no authorised informatieobjecttypes
                     _lhs.append("drc:document__informatieobjecttype = '%s'")
                     _rhs.append("")
@@ -228,8 +404,10 @@ class CMISDocumentIterable(BaseIterable, CMISClientMixin):
             if name is None:
                 raise NotImplementedError(f"Filter on '{key}' is not implemented yet")
 
-            _rhs.append(value)
-            _lhs.append(f"{name} = '%s'")
+            lhs_filter, rhs_filter = build_filter(name, value)
+
+            _rhs += rhs_filter
+            _lhs += lhs_filter
 
         return _lhs, _rhs
 
@@ -242,41 +420,49 @@ class CMISDocumentIterable(BaseIterable, CMISClientMixin):
 
         return new_filters or filters
 
-    def _needs_vertrowelijkaanduiding_filter(self, filters: List[Tuple]) -> bool:
-        return "_va_order" in dict(filters)
-
-    def _filter_by_va(self, filters: List[Tuple], documents: List) -> List:
-        if len(documents) == 0:
-            return documents
-
-        # get the vertrowelijkaanduiding filter
-        for filter_name, filter_value in filters:
-            if filter_name == "_va_order":
-                # In case there are multiple different vertrouwelijk aanduiding,
-                # it chooses the lowest one
-                all_vertrouwelijkaanduiding = []
-                if isinstance(filter_value, list):
-                    for order in filter_value:
-                        for case in order.cases:
-                            all_vertrouwelijkaanduiding.append(
-                                case.result.identity[1][1]
-                            )
-
-                else:
-                    for case in filter_value.cases:
-                        all_vertrouwelijkaanduiding.append(case.result.identity[1][1])
-                va_order = min(all_vertrouwelijkaanduiding)
-                break
+    def _build_va_filter(self, value: Union[Dict, List[Dict]]) -> Tuple[str, List]:
+        """
+        Limit the vertrouwelijkheidaanduiding per informatieobjecttype.
 
-        filtered_docs = []
-        for cmis_doc in documents:
-            # Check that the vertrouwelijkaanduiding autorisation is as required
-            django_doc = cmis_doc_to_django_model(cmis_doc)
-            doc_va_order = get_doc_va_order(django_doc)
-            if doc_va_order <= va_order:
-                filtered_docs.append(cmis_doc)
+        :param value: one or more mappings of informatieobjecttype to the highest
+          allowed order, see :func:`get_max_va_orders`. When an informatieobjecttype
+          occurs in multiple mappings, the least restrictive order is used.
 
-        return filtered_docs
+        The informatieobjecttypen are grouped by their order, giving at most one
+        ``((type = ... OR ...) AND (vertrouwelijkheidaanduiding = ... OR ...))``
+        clause per order. Every parameter has its own column, which the URL mapping
+        of the webservice binding relies on.
+        """
+        max_orders = {}
+        for orders in value if isinstance(value, list) else [value]:
+            for url, order in orders.items():
+                max_orders[url] = max(order, max_orders.get(url, order))
+
+        iot_column = mapper("informatieobjecttype", type="document")
+        if not max_orders:
+            # In this case there are no authorised informatieobjecttypes
+            return f"{iot_column} = '%s'", [""]
+
+        va_column = mapper("vertrouwelijkheidaanduiding", type="document")
+
+        buckets = defaultdict(list)
+        for url, order in max_orders.items():
+            buckets[order].append(url)
+
+        clauses = []
+        rhs = []
+        for order, urls in sorted(buckets.items()):
+            clause = " OR ".join(f"{iot_column} = '%s'" for _url in urls)
+            rhs += urls
+            allowed_va = get_allowed_va(order)
+            # no clause is needed if every vertrouwelijkheidaanduiding is allowed
+            if len(allowed_va) < len(VertrouwelijkheidsAanduiding.values):
+                va_clause = " OR ".join(f"{va_column} = '%s'" for _va in allowed_va)
+                clause = f"({clause}) AND ({va_clause})"
+                rhs += allowed_va
+            clauses.append(f"( {clause} )")
+
+        return "( " + " OR ".join(clauses) + " )", rhs
 
     def _build_authorisation_filter(
         self, key: str, value: List
@@ -476,6 +662,9 @@ class CMISQuerySet(InformatieobjectQuerySet, CMISClientMixin):
         if self._result_cache is not None:
             return len(self._result_cache)
 
+        count = CMISDocumentIterable(self).get_count()
+        if count is not None:
+            return count
         return len(self)
 
     def union(self, *args, **kwargs):
@@ -532,6 +721,7 @@ class CMISQuerySet(InformatieobjectQuerySet, CMISClientMixin):
                 data=kwargs,
                 content=content,
             )
+            invalidate(document_uuid)
         else:
             kwargs.setdefault("versie", "1")
             new_cmis_document = self.cmis_client.create_document(
@@ -576,6 +766,8 @@ class CMISQuerySet(InformatieobjectQuerySet, CMISClientMixin):
                     ]
                 else:
                     filters["informatieobjecttype"] = get_object_url(value)
+            elif key == "_va_order__lte":
+                filters["_va_order"] = get_max_va_orders(value)
             elif key == "identificatie__regex":
                 if "%" in value:
                     filters[key_bits[0]] = value
@@ -1029,13 +1221,6 @@ def get_object_url(
         return make_absolute_uri(path, request=request)
 
 
-def get_doc_va_order(django_doc):
-    choice_item = VertrouwelijkheidsAanduiding.get_choice(
-        django_doc.vertrouwelijkheidaanduiding
-    )
-    return choice_item.order
-
-
 def build_filter(filter_name, filter_value):
     rhs = []
     lhs = []
@@ -5,13 +5,18 @@ from typing import Dict, Tuple
 from django.apps import apps
 from django.conf import settings
 from django.db import models
+from django.db.models import Q
 
 from django_loose_fk.virtual_models import ProxyMixin
 from vng_api_common.constants import ObjectTypes, VertrouwelijkheidsAanduiding
 
 from openzaak.components.besluiten.models import BesluitInformatieObject
 from openzaak.components.zaken.models import ZaakInformatieObject
-from openzaak.utils.query import BlockChangeMixin, LooseFkAuthorizationsFilterMixin
+from openzaak.utils.query import (
+    AuthorizationsFilterEngines,
+    BlockChangeMixin,
+    LooseFkAuthorizationsFilterMixin,
+)
 
 from ..typing import IORelation
 
@@ -61,21 +66,33 @@ class InformatieobjectAuthorizationsFilterMixin(LooseFkAuthorizationsFilterMixin
             # for which the user is authorized and then return the objects
             # related to those EnkelvoudigInformatieObjectCanonicals
             model = apps.get_model("documenten", "EnkelvoudigInformatieObject")
-            if settings.CMIS_ENABLED:
-                filtered = model.objects.annotate(**annotations).filter(**filters)
-            else:
-                filtered = (
-                    model.objects.annotate(**annotations)
-                    .filter(**filters)
-                    .values("canonical")
-                )
-            queryset = self.filter(informatieobject__in=filtered)
+            filtered = model.objects.annotate(**annotations).filter(**filters)
+            queryset = self._filter_related(filtered)
             # bring it all together now to build the resulting queryset
         else:
             queryset = self.annotate(**annotations).filter(**filters)
 
         return queryset
 
+    def apply_compiled_filter(self, condition: Q) -> models.QuerySet:
+        if not self.authorizations_lookup:
+            return self.filter(condition)
+
+        model = apps.get_model("documenten", "EnkelvoudigInformatieObject")
+        return self._filter_related(model.objects.filter(condition))
+
+    def get_filter_engine(self) -> str:
+        # the CMIS querysets translate the CASE/WHEN of the authorizations into a
+        # predicate of the CMIS query
+        if settings.CMIS_ENABLED:
+            return AuthorizationsFilterEngines.case
+        return super().get_filter_engine()
+
+    def _filter_related(self, informatieobjecten: models.QuerySet) -> models.QuerySet:
+        if not settings.CMIS_ENABLED:
+            informatieobjecten = informatieobjecten.values("canonical")
+        return self.filter(informatieobject__in=informatieobjecten)
+
 
 class InformatieobjectQuerySet(
     InformatieobjectAuthorizationsFilterMixin, models.QuerySet
@@ -0,0 +1,43 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from privates.test import temp_private_root
+
+from ...models import EnkelvoudigInformatieObject
+from ..factories import EnkelvoudigInformatieObjectFactory
+
+
+@temp_private_root()
+class BackfillBestandsomvangTests(TestCase):
+    def test_backfill(self):
+        eio1, eio2 = EnkelvoudigInformatieObjectFactory.create_batch(2)
+        EnkelvoudigInformatieObject.objects.filter(pk=eio1.pk).update(
+            _bestandsomvang=None
+        )
+        stdout = StringIO()
+
+        call_command("backfill_bestandsomvang", batch_size=1, stdout=stdout)
+
+        eio1.refresh_from_db()
+        self.assertEqual(eio1._bestandsomvang, len(b"some data"))
+        self.assertIn("Recorded the size of 1 document(s).", stdout.getvalue())
+
+    def test_missing_content(self):
+        eio = EnkelvoudigInformatieObjectFactory.create()
+        eio.inhoud.storage.delete(eio.inhoud.name)
+        EnkelvoudigInformatieObject.objects.filter(pk=eio.pk).update(
+            _bestandsomvang=None
+        )
+        stderr = StringIO()
+
+        call_command(
+            "backfill_bestandsomvang", stdout=StringIO(), stderr=stderr,
+        )
+
+        eio.refresh_from_db()
+        self.assertIsNone(eio._bestandsomvang)
+        self.assertIn(str(eio.uuid), stderr.getvalue())
@@ -0,0 +1,261 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+import os
+import uuid
+from io import StringIO
+from tempfile import TemporaryDirectory
+from types import SimpleNamespace
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings, tag
+from django.test.utils import CaptureQueriesContext
+
+from drc_cmis.utils.mapper import mapper
+from privates.test import temp_private_root
+from rest_framework import status
+from vng_api_common.audittrails.models import AuditTrail
+from vng_api_common.tests import reverse
+
+from openzaak.components.besluiten.tests.factories import BesluitInformatieObjectFactory
+from openzaak.components.zaken.tests.factories import ZaakInformatieObjectFactory
+from openzaak.notifications.models import OutboxNotification
+from openzaak.utils import build_absolute_url
+from openzaak.utils.tests import APICMISTestCase
+
+from ...models import (
+    EnkelvoudigInformatieObject,
+    EnkelvoudigInformatieObjectCanonical,
+    Gebruiksrechten,
+)
+from ...query.cmis import CMISDocumentIterable
+from ..factories import (
+    EnkelvoudigInformatieObjectCanonicalFactory,
+    EnkelvoudigInformatieObjectFactory,
+    GebruiksrechtenCMISFactory,
+    GebruiksrechtenFactory,
+)
+from ..test_cmis_va_filter import StubDMS
+
+
+@temp_private_root()
+class DestroyDocumentsTests(TestCase):
+    def test_destroy(self):
+        canonical = EnkelvoudigInformatieObjectCanonicalFactory.create(
+            latest_version=None
+        )
+        eio1 = EnkelvoudigInformatieObjectFactory.create(canonical=canonical, versie=1)
+        eio2 = EnkelvoudigInformatieObjectFactory.create(
+            canonical=canonical, uuid=eio1.uuid, versie=2
+        )
+        GebruiksrechtenFactory.create(informatieobject=canonical)
+        unrelated = EnkelvoudigInformatieObjectFactory.create()
+        stdout = StringIO()
+
+        # the content is deleted once the batch is committed
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("destroy_documents", str(eio1.uuid), stdout=stdout)
+
+        self.assertFalse(
+            EnkelvoudigInformatieObjectCanonical.objects.filter(
+                pk=canonical.pk
+            ).exists()
+        )
+        self.assertFalse(Gebruiksrechten.objects.exists())
+        self.assertFalse(os.path.exists(eio1.inhoud.path))
+        self.assertFalse(os.path.exists(eio2.inhoud.path))
+        self.assertEqual(list(EnkelvoudigInformatieObject.objects.all()), [unrelated])
+        self.assertTrue(os.path.exists(unrelated.inhoud.path))
+        self.assertIn(
+            "Destroyed 1 document(s), skipped 0 related and 0 missing document(s).",
+            stdout.getvalue(),
+        )
+
+    @override_settings(NOTIFICATIONS_DISABLED=False, NOTIFICATIONS_OUTBOX=True)
+    def test_notifications_and_audittrails(self):
+        eio, related = EnkelvoudigInformatieObjectFactory.create_batch(2)
+        ZaakInformatieObjectFactory.create(informatieobject=related.canonical)
+        eio_url, related_url = eio.get_url(), related.get_url()
+        AuditTrail.objects.create(hoofd_object=eio_url, resource="EIO", resultaat=200)
+        AuditTrail.objects.create(
+            hoofd_object=related_url, resource="EIO", resultaat=200
+        )
+
+        call_command(
+            "destroy_documents",
+            str(eio.uuid),
+            str(related.uuid),
+            stdout=StringIO(),
+            stderr=StringIO(),
+        )
+
+        notification = OutboxNotification.objects.get()
+        self.assertEqual(notification.main_object, eio_url)
+        self.assertEqual(notification.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(notification.message["kanaal"], "documenten")
+        self.assertEqual(notification.message["actie"], "destroy")
+        self.assertEqual(notification.message["resourceUrl"], eio_url)
+        self.assertEqual(
+            notification.message["kenmerken"],
+            {
+                "bronorganisatie": eio.bronorganisatie,
+                "informatieobjecttype": build_absolute_url(
+                    reverse(eio.informatieobjecttype)
+                ),
+                "vertrouwelijkheidaanduiding": eio.vertrouwelijkheidaanduiding,
+            },
+        )
+        self.assertEqual(
+            list(AuditTrail.objects.values_list("hoofd_object", flat=True)),
+            [related_url],
+        )
+
+    def test_related_documents_are_skipped(self):
+        eio1, eio2, eio3 = EnkelvoudigInformatieObjectFactory.create_batch(3)
+        ZaakInformatieObjectFactory.create(informatieobject=eio1.canonical)
+        BesluitInformatieObjectFactory.create(informatieobject=eio2.canonical)
+        stdout, stderr = StringIO(), StringIO()
+
+        call_command(
+            "destroy_documents",
+            str(eio1.uuid),
+            str(eio2.uuid),
+            str(eio3.uuid),
+            stdout=stdout,
+            stderr=stderr,
+        )
+
+        self.assertEqual(
+            set(EnkelvoudigInformatieObject.objects.values_list("uuid", flat=True)),
+            {eio1.uuid, eio2.uuid},
+        )
+        self.assertIn(str(eio1.uuid), stderr.getvalue())
+        self.assertIn(str(eio2.uuid), stderr.getvalue())
+        self.assertIn(
+            "Destroyed 1 document(s), skipped 2 related and 0 missing document(s).",
+            stdout.getvalue(),
+        )
+
+    def test_dry_run(self):
+        eio = EnkelvoudigInformatieObjectFactory.create()
+        missing = uuid.uuid4()
+        stdout, stderr = StringIO(), StringIO()
+
+        call_command(
+            "destroy_documents",
+            str(eio.uuid),
+            str(missing),
+            dry_run=True,
+            stdout=stdout,
+            stderr=stderr,
+        )
+
+        self.assertTrue(EnkelvoudigInformatieObject.objects.exists())
+        self.assertTrue(os.path.exists(eio.inhoud.path))
+        self.assertIn(str(missing), stderr.getvalue())
+        self.assertIn(
+            "Would destroy 1 document(s), skipped 0 related and 1 missing document(s).",
+            stdout.getvalue(),
+        )
+
+    def test_batches(self):
+        documents = EnkelvoudigInformatieObjectFactory.create_batch(5)
+        tmpdir = TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        path = os.path.join(tmpdir.name, "uuids.txt")
+        with open(path, "w") as uuids:
+            uuids.writelines(f"{document.uuid}\n" for document in documents)
+        stdout = StringIO()
+
+        call_command("destroy_documents", file=path, batch_size=2, stdout=stdout)
+
+        self.assertFalse(EnkelvoudigInformatieObject.objects.exists())
+        self.assertEqual(stdout.getvalue().count("so far"), 3)
+
+    def test_queries_per_batch(self):
+        documents = EnkelvoudigInformatieObjectFactory.create_batch(20)
+        for document in documents[::2]:
+            ZaakInformatieObjectFactory.create(informatieobject=document.canonical)
+
+        def count_queries(documents) -> int:
+            with CaptureQueriesContext(connection) as context:
+                call_command(
+                    "destroy_documents",
+                    *[str(document.uuid) for document in documents],
+                    dry_run=True,
+                    stdout=StringIO(),
+                    stderr=StringIO(),
+                )
+            return len(context.captured_queries)
+
+        self.assertEqual(count_queries(documents[:2]), count_queries(documents))
+
+    def test_invalid_uuid(self):
+        with self.assertRaises(CommandError):
+            call_command("destroy_documents", "not-a-uuid", stdout=StringIO())
+
+    def test_no_uuids(self):
+        with self.assertRaises(CommandError):
+            call_command("destroy_documents")
+
+
+@tag("cmis")
+@override_settings(CMIS_ENABLED=True)
+class DestroyDocumentsCMISTests(APICMISTestCase):
+    def test_destroy(self):
+        eio1, eio2 = EnkelvoudigInformatieObjectFactory.create_batch(2)
+        eio1_url = f"http://testserver{reverse(eio1)}"
+        eio2_url = f"http://testserver{reverse(eio2)}"
+        GebruiksrechtenCMISFactory.create(informatieobject=eio1_url)
+        ZaakInformatieObjectFactory.create(informatieobject=eio2_url)
+        stdout, stderr = StringIO(), StringIO()
+
+        call_command(
+            "destroy_documents",
+            str(eio1.uuid),
+            str(eio2.uuid),
+            stdout=stdout,
+            stderr=stderr,
+        )
+
+        self.assertEqual(
+            [eio.uuid for eio in EnkelvoudigInformatieObject.objects.all()],
+            [eio2.uuid],
+        )
+        self.assertFalse(
+            Gebruiksrechten.objects.filter(informatieobject=eio1_url).exists()
+        )
+        self.assertIn(str(eio2.uuid), stderr.getvalue())
+        self.assertIn(
+            "Destroyed 1 document(s), skipped 1 related and 0 missing document(s).",
+            stdout.getvalue(),
+        )
+
+    def test_dry_run(self):
+        eio = EnkelvoudigInformatieObjectFactory.create()
+
+        call_command(
+            "destroy_documents", str(eio.uuid), dry_run=True, stdout=StringIO()
+        )
+
+        self.assertTrue(EnkelvoudigInformatieObject.objects.exists())
+
+
+@override_settings(CMIS_ENABLED=True)
+class CMISUuidFilterTests(SimpleTestCase):
+    def test_uuid_in(self):
+        column = mapper("uuid", type="document")
+        uuids = [str(uuid.uuid4()) for _ in range(3)]
+        documents = [SimpleNamespace(properties={column: value}) for value in uuids]
+        dms = StubDMS(documents)
+        queryset = EnkelvoudigInformatieObject.objects.filter(uuid__in=uuids[:2])
+        queryset._cmis_client = dms
+
+        iterable = CMISDocumentIterable(queryset)
+        lhs, rhs = iterable._normalize_filters(queryset._cmis_query)
+        results, _num_items = iterable._query(lhs, rhs, [])
+
+        self.assertEqual(results, documents[:2])
+        self.assertEqual(
+            dms.statements[0].count(f"{column} = "), 2,
+        )
@@ -20,6 +20,7 @@ from openzaak.components.zaken.tests.factories import (
     ZaakFactory,
     ZaakInformatieObjectFactory,
 )
+from openzaak.utils.query import AuthorizationsFilterEngines
 from openzaak.utils.tests import JWTAuthMixin
 
 from ..api.scopes import SCOPE_DOCUMENTEN_AANMAKEN, SCOPE_DOCUMENTEN_ALLES_LEZEN
@@ -565,3 +566,22 @@ class ExternalInformatieobjecttypeScopeTests(JWTAuthMixin, APITestCase):
 
         self.assertEqual(response1.status_code, status.HTTP_200_OK)
         self.assertEqual(response2.status_code, status.HTTP_403_FORBIDDEN)
+
+
+@override_settings(AUTORISATIES_FILTER_ENGINE=AuthorizationsFilterEngines.compiled)
+class InformatieObjectReadCorrectScopeCompiledFilterTests(
+    InformatieObjectReadCorrectScopeTests
+):
+    pass
+
+
+@override_settings(AUTORISATIES_FILTER_ENGINE=AuthorizationsFilterEngines.compiled)
+class OioReadCompiledFilterTests(OioReadTests):
+    pass
+
+
+@override_settings(AUTORISATIES_FILTER_ENGINE=AuthorizationsFilterEngines.compiled)
+class ExternalInformatieobjecttypeScopeCompiledFilterTests(
+    ExternalInformatieobjecttypeScopeTests
+):
+    pass
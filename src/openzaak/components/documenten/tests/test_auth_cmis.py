@@ -9,6 +9,7 @@ from django.test import override_settings, tag
 
 from drc_cmis.models import CMISConfig, UrlMapping
 from rest_framework import status
+from vng_api_common.authorizations.models import Autorisatie
 from vng_api_common.constants import (
     ComponentTypes,
     ObjectTypes,
@@ -21,6 +22,7 @@ from openzaak.components.zaken.tests.factories import (
     ZaakFactory,
     ZaakInformatieObjectFactory,
 )
+from openzaak.utils.query import AuthorizationsFilterEngines
 from openzaak.utils.tests import APICMISTestCase, JWTAuthMixin
 
 from ..api.scopes import SCOPE_DOCUMENTEN_AANMAKEN, SCOPE_DOCUMENTEN_ALLES_LEZEN
@@ -162,6 +164,59 @@ class InformatieObjectReadCorrectScopeTests(JWTAuthMixin, APICMISTestCase):
         self.assertEqual(len(response_data), 4)
 
 
+@tag("cmis")
+@override_settings(CMIS_ENABLED=True)
+class MultipleAuthorizationsReadTests(JWTAuthMixin, APICMISTestCase):
+    scopes = [SCOPE_DOCUMENTEN_ALLES_LEZEN]
+    max_vertrouwelijkheidaanduiding = VertrouwelijkheidsAanduiding.openbaar
+    component = ComponentTypes.drc
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.informatieobjecttype = InformatieObjectTypeFactory.create()
+        cls.informatieobjecttype2 = InformatieObjectTypeFactory.create()
+        site = Site.objects.get_current()
+        site.domain = "testserver"
+        site.save()
+        super().setUpTestData()
+
+        Autorisatie.objects.create(
+            applicatie=cls.applicatie,
+            component=ComponentTypes.drc,
+            scopes=[SCOPE_DOCUMENTEN_ALLES_LEZEN],
+            informatieobjecttype=f"http://testserver{reverse(cls.informatieobjecttype2)}",
+            max_vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.geheim,
+        )
+
+    def test_io_list_limited_per_informatieobjecttype(self):
+        eio1 = EnkelvoudigInformatieObjectFactory.create(
+            informatieobjecttype=self.informatieobjecttype,
+            vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.openbaar,
+        )
+        EnkelvoudigInformatieObjectFactory.create(
+            informatieobjecttype=self.informatieobjecttype,
+            vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.geheim,
+        )
+        eio2 = EnkelvoudigInformatieObjectFactory.create(
+            informatieobjecttype=self.informatieobjecttype2,
+            vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.geheim,
+        )
+        EnkelvoudigInformatieObjectFactory.create(
+            informatieobjecttype=self.informatieobjecttype2,
+            vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.zeer_geheim,
+        )
+        url = reverse("enkelvoudiginformatieobject-list")
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {result["url"] for result in response.data["results"]},
+            {f"http://testserver{reverse(eio)}" for eio in (eio1, eio2)},
+        )
+        self.assertEqual(response.data["count"], 2)
+
+
 @tag("cmis")
 @override_settings(CMIS_ENABLED=True)
 class GebruiksrechtenReadTests(JWTAuthMixin, APICMISTestCase):
@@ -639,3 +694,22 @@ class ExternalInformatieobjecttypeScopeTests(JWTAuthMixin, APICMISTestCase):
 
         self.assertEqual(response1.status_code, status.HTTP_200_OK)
         self.assertEqual(response2.status_code, status.HTTP_403_FORBIDDEN)
+
+
+# the CMIS querysets can't translate the compiled filter and use the CASE/WHEN of
+# the authorizations regardless of the configured engine
+@override_settings(AUTORISATIES_FILTER_ENGINE=AuthorizationsFilterEngines.compiled)
+class InformatieObjectReadCorrectScopeCompiledFilterTests(
+    InformatieObjectReadCorrectScopeTests
+):
+    pass
+
+
+@override_settings(AUTORISATIES_FILTER_ENGINE=AuthorizationsFilterEngines.compiled)
+class MultipleAuthorizationsReadCompiledFilterTests(MultipleAuthorizationsReadTests):
+    pass
+
+
+@override_settings(AUTORISATIES_FILTER_ENGINE=AuthorizationsFilterEngines.compiled)
+class OioReadCompiledFilterTests(OioReadTests):
+    pass
@@ -0,0 +1,273 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+import threading
+import time
+from base64 import b64encode
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings, tag
+
+from rest_framework import status
+from vng_api_common.tests import reverse
+
+from openzaak.utils.tests import APICMISTestCase, JWTAuthMixin
+
+from ..query.cache import (
+    VERSIONS_WORKERS,
+    document_cache_scope,
+    get_all_versions,
+    get_document,
+    invalidate,
+    iter_all_versions,
+)
+from .factories import EnkelvoudigInformatieObjectFactory
+from .utils import get_operation_url
+
+UUID = "b09fac1f-f295-4b44-a94b-97126edec2f3"
+
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "axes": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    "oidc": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    "autorisaties": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    "remote_objects": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    "cmis_documents": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
+
+
+class Document:
+    def __init__(self, uuid: str, versie: int, client):
+        self.uuid = uuid
+        self.versie = versie
+        self.client = client
+
+
+class Client:
+    """
+    Stand-in for the CMIS client, counting the retrieved documents.
+    """
+
+    config = None
+
+    def __init__(self, versions: int = 3, delay: float = 0):
+        self.num_versions = versions
+        self.delay = delay
+        self.calls = []
+        self.concurrent = 0
+        self.max_concurrent = 0
+        self.lock = threading.Lock()
+
+    def get_document(self, drc_uuid: str):
+        self.calls.append(("get_document", drc_uuid))
+        return Document(drc_uuid, self.num_versions, self)
+
+    def get_all_versions(self, document):
+        with self.lock:
+            self.calls.append(("get_all_versions", document.uuid))
+            self.concurrent += 1
+            self.max_concurrent = max(self.concurrent, self.max_concurrent)
+        time.sleep(self.delay)
+        with self.lock:
+            self.concurrent -= 1
+        return [
+            Document(document.uuid, versie, self)
+            for versie in range(self.num_versions, 0, -1)
+        ]
+
+
+@override_settings(CACHES=CACHES)
+class DocumentCacheTests(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        caches["cmis_documents"].clear()
+        self.addCleanup(caches["cmis_documents"].clear)
+
+    def test_not_cached_outside_scope(self):
+        client = Client()
+
+        get_document(client, UUID)
+        get_document(client, UUID)
+
+        self.assertEqual(len(client.calls), 2)
+
+    def test_cached_within_scope(self):
+        client = Client()
+
+        with document_cache_scope():
+            latest = get_document(client, UUID)
+            for versie in (3, 2, 1, 2):
+                with self.subTest(versie=versie):
+                    document = get_document(client, UUID, versie)
+
+                    self.assertEqual(document.versie, versie)
+
+            versions = get_all_versions(client, latest)
+
+        self.assertEqual([version.versie for version in versions], [3, 2, 1])
+        self.assertEqual(
+            client.calls, [("get_document", UUID), ("get_all_versions", UUID)]
+        )
+
+    def test_unknown_version_returns_latest(self):
+        client = Client()
+
+        with document_cache_scope():
+            document = get_document(client, UUID, 4)
+
+        self.assertEqual(document.versie, 3)
+
+    def test_invalidate_within_scope(self):
+        client = Client()
+
+        with document_cache_scope():
+            get_document(client, UUID, 1)
+            invalidate(UUID)
+            get_document(client, UUID, 1)
+
+        self.assertEqual(len(client.calls), 4)
+
+    @override_settings(CMIS_DOCUMENTS_CACHE_TIMEOUT=60)
+    def test_shared_between_scopes(self):
+        client, other_client = Client(), Client()
+
+        with document_cache_scope():
+            get_document(client, UUID, 1)
+
+        with document_cache_scope():
+            document = get_document(other_client, UUID, 1)
+            latest = get_document(other_client, UUID)
+
+        self.assertEqual(document.versie, 1)
+        self.assertEqual(latest.versie, 3)
+        # the cached documents use the client of the request
+        self.assertIs(document.client, other_client)
+        self.assertEqual(other_client.calls, [])
+
+    @override_settings(CMIS_DOCUMENTS_CACHE_TIMEOUT=60)
+    def test_invalidate_shared(self):
+        client = Client()
+        get_document(client, UUID)
+
+        invalidate(UUID)
+        client.num_versions = 4
+        document = get_document(client, UUID)
+
+        self.assertEqual(document.versie, 4)
+        self.assertEqual(len(client.calls), 2)
+
+    @override_settings(CMIS_DOCUMENTS_CACHE_TIMEOUT=60)
+    def test_entries_of_concurrent_requests_are_discarded(self):
+        client = Client()
+
+        with document_cache_scope():
+            # the document is retrieved before the change...
+            get_document(client, UUID)
+            # ... which is made in another request
+            with document_cache_scope():
+                invalidate(UUID)
+            client.num_versions = 4
+            get_document(client, UUID, 2)
+
+        document = get_document(client, UUID)
+
+        self.assertEqual(document.versie, 4)
+
+
+@override_settings(CACHES=CACHES)
+class IterAllVersionsTests(SimpleTestCase):
+    def test_versions_in_order_of_documents(self):
+        client = Client(delay=0.01)
+        documents = [Document(f"uuid-{index}", 3, client) for index in range(30)]
+
+        results = list(iter_all_versions(client, documents))
+
+        self.assertEqual(
+            [[(doc.uuid, doc.versie) for doc in versions] for versions in results],
+            [
+                [(f"uuid-{index}", versie) for versie in (3, 2, 1)]
+                for index in range(30)
+            ],
+        )
+        # retrieved concurrently, by a bounded number of threads
+        self.assertGreater(client.max_concurrent, 1)
+        self.assertLessEqual(client.max_concurrent, VERSIONS_WORKERS)
+
+    def test_partially_consumed(self):
+        client = Client()
+        documents = [Document(f"uuid-{index}", 3, client) for index in range(50)]
+
+        versions = iter_all_versions(client, documents)
+        next(versions)
+        versions.close()
+
+        self.assertLessEqual(len(client.calls), VERSIONS_WORKERS + 1)
+
+    def test_cached_within_scope(self):
+        client = Client()
+        document = Document(UUID, 3, client)
+
+        with document_cache_scope():
+            get_all_versions(client, document)
+            results = list(iter_all_versions(client, [document, document]))
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(client.calls, [("get_all_versions", UUID)])
+
+    def test_duplicate_documents_retrieved_once(self):
+        client = Client()
+        document = Document(UUID, 3, client)
+
+        results = list(iter_all_versions(client, [document, document]))
+
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(client.calls, [("get_all_versions", UUID)])
+
+
+@tag("cmis")
+@override_settings(CMIS_ENABLED=True, CACHES=CACHES, CMIS_DOCUMENTS_CACHE_TIMEOUT=60)
+class DocumentCacheAPITests(JWTAuthMixin, APICMISTestCase):
+
+    heeft_alle_autorisaties = True
+
+    def setUp(self):
+        super().setUp()
+        caches["cmis_documents"].clear()
+        self.addCleanup(caches["cmis_documents"].clear)
+
+    def test_update_invalidates_cache(self):
+        eio = EnkelvoudigInformatieObjectFactory.create(inhoud__data=b"inhoud1")
+        eio_url = reverse(eio)
+        download_url = get_operation_url(
+            "enkelvoudiginformatieobject_download", uuid=eio.uuid
+        )
+        response = self.client.get(download_url)
+        self.assertEqual(response.getvalue(), b"inhoud1")
+
+        lock = self.client.post(f"{eio_url}/lock").data["lock"]
+        response = self.client.patch(
+            eio_url, {"inhoud": b64encode(b"inhoud2").decode(), "lock": lock}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.client.post(f"{eio_url}/unlock", {"lock": lock})
+
+        response = self.client.get(download_url)
+
+        self.assertEqual(response.getvalue(), b"inhoud2")
+
+        response = self.client.get(download_url, {"versie": 1})
+
+        self.assertEqual(response.getvalue(), b"inhoud1")
+
+    def test_delete_invalidates_cache(self):
+        eio = EnkelvoudigInformatieObjectFactory.create()
+        download_url = get_operation_url(
+            "enkelvoudiginformatieobject_download", uuid=eio.uuid
+        )
+        self.client.get(download_url)
+
+        response = self.client.delete(reverse(eio))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        response = self.client.get(download_url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
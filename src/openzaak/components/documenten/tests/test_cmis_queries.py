@@ -1,12 +1,24 @@
 # SPDX-License-Identifier: EUPL-1.2
 # Copyright (C) 2020 Dimpact
+from datetime import datetime
+from types import SimpleNamespace
+
 from django.contrib.sites.models import Site
-from django.test import override_settings, tag
+from django.test import SimpleTestCase, override_settings, tag
+
+from drc_cmis.browser.client import CMISDRCClient
 
 from openzaak.utils.tests import APICMISTestCase
 
 from ..models import EnkelvoudigInformatieObject
+from ..query.cmis import (
+    CMISDocumentIterable,
+    get_ordering,
+    group_by_canonical,
+    sort_documents,
+)
 from .factories import EnkelvoudigInformatieObjectFactory
+from .test_cmis_va_filter import StubDMS
 
 
 @tag("cmis")
@@ -81,3 +93,162 @@ class QueryTests(APICMISTestCase):
         self.assertEqual(
             [eio.identificatie for eio in second_filter], [eio2.identificatie],
         )
+
+    def test_ordering_groups_versions_of_canonical(self):
+        eio1 = EnkelvoudigInformatieObjectFactory.create(identificatie="001")
+        eio2 = EnkelvoudigInformatieObjectFactory.create(identificatie="002")
+        EnkelvoudigInformatieObject.objects.filter(uuid=eio1.uuid).update(versie=2)
+
+        eios = EnkelvoudigInformatieObject.objects.order_by("canonical", "-versie")
+
+        self.assertEqual(
+            [(eio.uuid, eio.versie) for eio in eios],
+            [(eio1.uuid, 2), (eio1.uuid, 1), (eio2.uuid, 1)],
+        )
+
+    def test_slice_distinct(self):
+        eios = [
+            EnkelvoudigInformatieObjectFactory.create(identificatie=f"00{index}")
+            for index in range(3)
+        ]
+        queryset = EnkelvoudigInformatieObject.objects.order_by(
+            "canonical", "-versie"
+        ).distinct("canonical")
+
+        self.assertEqual(queryset.count(), 3)
+        self.assertEqual(
+            [eio.uuid for eio in queryset[1:3]], [eio.uuid for eio in eios[1:3]]
+        )
+        self.assertEqual(queryset[0].uuid, eios[0].uuid)
+
+    def test_slice_distinct_locked_document(self):
+        eio1 = EnkelvoudigInformatieObjectFactory.create(identificatie="001")
+        eio2 = EnkelvoudigInformatieObjectFactory.create(identificatie="002")
+        eio1.canonical.lock_document(doc_uuid=eio1.uuid)
+        queryset = EnkelvoudigInformatieObject.objects.order_by(
+            "canonical", "-versie"
+        ).distinct("canonical")
+
+        eios = list(queryset[:1]) + list(queryset[1:2]) + list(queryset[2:3])
+
+        self.assertEqual({eio.uuid for eio in eios}, {eio1.uuid, eio2.uuid})
+        self.assertEqual(len(eios), 2)
+
+    def test_slice_all_versions(self):
+        eio = EnkelvoudigInformatieObjectFactory.create(identificatie="001")
+        EnkelvoudigInformatieObject.objects.filter(uuid=eio.uuid).update(versie=2)
+
+        eios = EnkelvoudigInformatieObject.objects.order_by("canonical", "-versie")
+
+        self.assertEqual([eio.versie for eio in eios[1:]], [1])
+
+
+def document(uuid: str, versie: int, created: int):
+    return SimpleNamespace(
+        uuid=uuid, versie=versie, creationDate=datetime(2022, 1, created)
+    )
+
+
+class OrderingTests(SimpleTestCase):
+    def test_get_ordering(self):
+        for order_by, group_canonical, expected in [
+            (
+                ["canonical", "-versie"],
+                True,
+                [("creationDate", False), ("uuid", False), ("versie", True)],
+            ),
+            (["canonical", "-versie"], False, [("versie", True)]),
+            (["versie", "-canonical"], True, [("versie", False), ("uuid", True)]),
+            ([], True, []),
+        ]:
+            with self.subTest(order_by=order_by, group_canonical=group_canonical):
+                self.assertEqual(get_ordering(order_by, group_canonical), expected)
+
+    def test_get_ordering_not_implemented(self):
+        with self.assertRaises(NotImplementedError):
+            get_ordering(["titel"])
+
+    def test_sort_and_group(self):
+        documents = [
+            document("b", 1, created=2),
+            document("a", 1, created=1),
+            document("a", 2, created=3),
+            document("c", 1, created=2),
+        ]
+
+        documents = group_by_canonical(
+            sort_documents(documents, get_ordering(["canonical", "-versie"])),
+            get_ordering(["canonical", "-versie"], group_canonical=False),
+        )
+
+        self.assertEqual(
+            [(doc.uuid, doc.versie) for doc in documents],
+            [("a", 2), ("a", 1), ("b", 1), ("c", 1)],
+        )
+
+
+class StubBrowserClient(CMISDRCClient):
+    """
+    Stand-in for the browser binding client, recording the posted queries.
+    """
+
+    base_url = "https://dms.example.com/browser"
+
+    def __init__(self, response: dict):
+        self.response = response
+        self.requests = []
+
+    def post_request(self, url, data, headers=None, files=None):
+        self.requests.append(data)
+        return self.response
+
+    def get_all_results(self, json, return_type):
+        return json["results"]
+
+
+@override_settings(CMIS_ENABLED=True)
+class PagingTests(SimpleTestCase):
+    def get_iterable(self, client) -> CMISDocumentIterable:
+        queryset = EnkelvoudigInformatieObject.objects.order_by(
+            "canonical", "-versie"
+        ).distinct("canonical")
+        queryset._cmis_client = client
+        return CMISDocumentIterable(queryset)
+
+    def test_count_excludes_private_working_copies(self):
+        client = StubBrowserClient({"results": [], "numItems": 3})
+
+        count = self.get_iterable(client).get_count()
+
+        self.assertEqual(count, 3)
+        self.assertIn(
+            "WHERE cmis:isPrivateWorkingCopy = false", client.requests[0]["statement"]
+        )
+
+    def test_unknown_count(self):
+        for response in [{"results": []}, {"results": [], "numItems": -1}]:
+            with self.subTest(response=response):
+                client = StubBrowserClient(response)
+
+                self.assertIsNone(self.get_iterable(client).get_count())
+
+    def test_page_excludes_private_working_copies(self):
+        properties = {"drc:document__titel": "titel"}
+        documents = [
+            SimpleNamespace(uuid="a", versionLabel="pwc", properties=properties),
+            SimpleNamespace(uuid="a", versionLabel="1.0", properties=properties),
+            SimpleNamespace(uuid="b", versionLabel="1.0", properties=properties),
+        ]
+        iterable = self.get_iterable(StubDMS(documents))
+
+        page, num_items = iterable._query(
+            ["drc:document__titel = '%s'"],
+            ["titel"],
+            [],
+            skip_count=1,
+            max_items=1,
+            exclude_pwc=True,
+        )
+
+        self.assertEqual(page, documents[2:])
+        self.assertEqual(num_items, 2)
@@ -0,0 +1,212 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+"""
+Test the vertrouwelijkheidaanduiding filter of the CMIS queries against a stub DMS.
+"""
+import re
+from itertools import cycle
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.db.models import Case, IntegerField, Value, When
+from django.test import SimpleTestCase, override_settings
+
+from drc_cmis.utils.mapper import mapper
+from drc_cmis.utils.query import CMISQuery
+from vng_api_common.constants import VertrouwelijkheidsAanduiding
+
+from ..models import EnkelvoudigInformatieObject
+from ..query.cmis import CMISDocumentIterable, get_max_va_orders
+
+IOTYPE = "https://externe.catalogus.nl/api/v1/informatieobjecttypen/{}"
+
+CONDITION = re.compile(r"([\w:]+) = '((?:[^'\\]|\\.)*)'")
+
+
+class StubDMS:
+    """
+    Stand-in for the CMIS client, evaluating the WHERE clause of the queries on the
+    documents in memory.
+    """
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.statements = []
+
+    def query(self, return_type_name, lhs, rhs):
+        statement = CMISQuery(" AND ".join(lhs))(*rhs)
+        self.statements.append(statement)
+
+        expression = CONDITION.sub(
+            lambda match: f"properties[{match.group(1)!r}] == {match.group(2)!r}",
+            statement,
+        )
+        expression = expression.replace(" AND ", " and ").replace(" OR ", " or ")
+        return [
+            document
+            for document in self.documents
+            if eval(expression, {"properties": document.properties})
+        ]
+
+
+def get_order(vertrouwelijkheidaanduiding: str) -> int:
+    return VertrouwelijkheidsAanduiding.get_choice(vertrouwelijkheidaanduiding).order
+
+
+def build_case(authorizations: dict) -> Case:
+    return Case(
+        *[
+            When(_informatieobjecttype_url=url, then=Value(get_order(va)))
+            for url, va in authorizations.items()
+        ],
+        output_field=IntegerField(),
+    )
+
+
+@override_settings(CMIS_ENABLED=True)
+class VertrouwelijkheidaanduidingFilterTests(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.iot_column = mapper("informatieobjecttype", type="document")
+        self.va_column = mapper("vertrouwelijkheidaanduiding", type="document")
+
+    def create_document(self, informatieobjecttype: str, va: str):
+        return SimpleNamespace(
+            informatieobjecttype=informatieobjecttype,
+            vertrouwelijkheidaanduiding=va,
+            properties={self.iot_column: informatieobjecttype, self.va_column: va},
+        )
+
+    def query(self, dms, authorizations: dict) -> list:
+        order_case = VertrouwelijkheidsAanduiding.get_order_expression(
+            "vertrouwelijkheidaanduiding"
+        )
+        queryset = EnkelvoudigInformatieObject.objects.annotate(
+            _va_order=order_case
+        ).filter(
+            _informatieobjecttype_url__in=list(authorizations),
+            _va_order__lte=build_case(authorizations),
+        )
+        queryset._cmis_client = dms
+
+        iterable = CMISDocumentIterable(queryset)
+        lhs, rhs = iterable._normalize_filters(queryset._cmis_query)
+        documents, _num_items = iterable._query(lhs, rhs, [])
+        return documents
+
+    def test_max_va_orders(self):
+        case = Case(
+            When(_informatieobjecttype_url=IOTYPE.format(1), then=Value(1)),
+            When(_informatieobjecttype_url=IOTYPE.format(2), then=Value(5)),
+            When(_informatieobjecttype_url=IOTYPE.format(1), then=Value(3)),
+            output_field=IntegerField(),
+        )
+
+        self.assertEqual(
+            get_max_va_orders(case), {IOTYPE.format(1): 3, IOTYPE.format(2): 5}
+        )
+
+    def test_limited_per_informatieobjecttype(self):
+        authorizations = {
+            IOTYPE.format(1): VertrouwelijkheidsAanduiding.openbaar,
+            IOTYPE.format(2): VertrouwelijkheidsAanduiding.geheim,
+            IOTYPE.format(3): VertrouwelijkheidsAanduiding.zeer_geheim,
+        }
+        documents = [
+            self.create_document(IOTYPE.format(iot), va)
+            for iot in range(1, 5)
+            for va in VertrouwelijkheidsAanduiding.values
+        ]
+
+        results = self.query(StubDMS(documents), authorizations)
+
+        expected = [
+            document
+            for document in documents
+            if document.informatieobjecttype in authorizations
+            and get_order(document.vertrouwelijkheidaanduiding)
+            <= get_order(authorizations[document.informatieobjecttype])
+        ]
+        self.assertEqual(results, expected)
+        # the documents of the other informatieobjecttypen aren't limited to the
+        # lowest order of the authorizations
+        self.assertIn(
+            (IOTYPE.format(2), VertrouwelijkheidsAanduiding.geheim),
+            [
+                (doc.informatieobjecttype, doc.vertrouwelijkheidaanduiding)
+                for doc in results
+            ],
+        )
+
+    def test_no_authorizations(self):
+        documents = [
+            self.create_document(
+                IOTYPE.format(1), VertrouwelijkheidsAanduiding.openbaar
+            )
+        ]
+
+        results = self.query(StubDMS(documents), {})
+
+        self.assertEqual(results, [])
+
+    def test_least_restrictive_authorization(self):
+        iterable = CMISDocumentIterable(EnkelvoudigInformatieObject.objects.all())
+
+        _lhs, rhs = iterable._build_va_filter(
+            [
+                {IOTYPE.format(1): get_order(VertrouwelijkheidsAanduiding.openbaar)},
+                {IOTYPE.format(1): get_order(VertrouwelijkheidsAanduiding.intern)},
+            ]
+        )
+
+        self.assertEqual(
+            rhs,
+            [
+                IOTYPE.format(1),
+                VertrouwelijkheidsAanduiding.openbaar,
+                VertrouwelijkheidsAanduiding.beperkt_openbaar,
+                VertrouwelijkheidsAanduiding.intern,
+            ],
+        )
+
+    def test_many_authorizations(self):
+        """
+        Assert that the filter is evaluated by the DMS, in a bounded number of clauses.
+        """
+        levels = cycle(VertrouwelijkheidsAanduiding.values)
+        authorizations = {IOTYPE.format(index): next(levels) for index in range(1000)}
+        documents = [
+            self.create_document(IOTYPE.format(index % 1200), va)
+            for index, va in zip(
+                range(5000), cycle(VertrouwelijkheidsAanduiding.values)
+            )
+        ]
+        dms = StubDMS(documents)
+
+        with patch(
+            "openzaak.components.documenten.query.cmis.cmis_doc_to_django_model"
+        ) as mock_convert:
+            results = self.query(dms, authorizations)
+
+        self.assertEqual(len(dms.statements), 1)
+        mock_convert.assert_not_called()
+        # one clause per vertrouwelijkheidaanduiding, without a separate filter on the
+        # informatieobjecttypen
+        statement = dms.statements[0]
+        self.assertEqual(
+            statement.count(f"{self.iot_column} ="), len(authorizations),
+        )
+        self.assertLessEqual(
+            statement.count(f"{self.va_column} ="),
+            len(VertrouwelijkheidsAanduiding.values) ** 2,
+        )
+        self.assertEqual(
+            len(results),
+            sum(
+                1
+                for document in documents
+                if document.informatieobjecttype in authorizations
+                and get_order(document.vertrouwelijkheidaanduiding)
+                <= get_order(authorizations[document.informatieobjecttype])
+            ),
+        )
@@ -0,0 +1,97 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+from base64 import b64encode
+from io import BytesIO
+
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import InMemoryUploadedFile, TemporaryUploadedFile
+from django.test import SimpleTestCase, override_settings
+
+from ..api.decoders import decode_base64, decode_base64_file
+
+CONTENT = bytes(range(256)) * 10
+
+
+class DecodeBase64Tests(SimpleTestCase):
+    def assertDecodeError(self, data: str, code: str, message: str = None):
+        with self.assertRaises(ValidationError) as context:
+            decode_base64(data, BytesIO(), window_size=8)
+
+        self.assertEqual(context.exception.code, code)
+        if message:
+            self.assertEqual(context.exception.message, message)
+
+    def test_decode_in_windows(self):
+        for length in range(10):
+            data = b64encode(CONTENT[:length]).decode()
+
+            for window_size in (4, 8, 12, 1024):
+                with self.subTest(length=length, window_size=window_size):
+                    destination = BytesIO()
+
+                    size = decode_base64(data, destination, window_size=window_size)
+
+                    self.assertEqual(size, length)
+                    self.assertEqual(destination.getvalue(), CONTENT[:length])
+
+    def test_whitespace_is_ignored(self):
+        data = b64encode(CONTENT).decode()
+        lines = "\r\n".join(data[index : index + 76] for index in range(0, 3416, 76))
+        destination = BytesIO()
+
+        size = decode_base64(lines + "\n", destination, window_size=8)
+
+        self.assertEqual(size, len(CONTENT))
+        self.assertEqual(destination.getvalue(), CONTENT)
+
+    def test_invalid_character(self):
+        self.assertDecodeError(
+            "c29tZ$BmaWxl",
+            "invalid-base64",
+            "Invalid base64 character '$' at position 5",
+        )
+
+    def test_invalid_character_in_later_window(self):
+        self.assertDecodeError(
+            "c29tZSBmaWxl-A==",
+            "invalid-base64",
+            "Invalid base64 character '-' at position 12",
+        )
+
+    def test_data_after_padding(self):
+        self.assertDecodeError(
+            "QQ==QUJD", "invalid-base64", "Invalid base64 character 'Q' at position 4"
+        )
+
+    def test_incorrect_padding(self):
+        self.assertDecodeError(
+            b64encode(b"some file content").decode()[:-1], "incorrect-base64-padding"
+        )
+
+    def test_too_much_padding(self):
+        self.assertDecodeError("QUJD=", "incorrect-base64-padding")
+
+
+class DecodeBase64FileTests(SimpleTestCase):
+    def test_small_file_in_memory(self):
+        uploaded_file = decode_base64_file(b64encode(CONTENT).decode(), "doc.bin")
+
+        self.assertIsInstance(uploaded_file, InMemoryUploadedFile)
+        self.assertEqual(uploaded_file.name, "doc.bin")
+        self.assertEqual(uploaded_file.size, len(CONTENT))
+        self.assertEqual(uploaded_file.read(), CONTENT)
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=100)
+    def test_large_file_on_disk(self):
+        uploaded_file = decode_base64_file(b64encode(CONTENT).decode(), "doc.bin")
+
+        self.assertIsInstance(uploaded_file, TemporaryUploadedFile)
+        self.assertEqual(uploaded_file.size, len(CONTENT))
+        self.assertEqual(uploaded_file.read(), CONTENT)
+
+    def test_data_uri(self):
+        data = f"data:text/plain;base64,{b64encode(b'some data').decode()}"
+
+        uploaded_file = decode_base64_file(data, "doc.bin")
+
+        self.assertEqual(uploaded_file.read(), b"some data")
@@ -0,0 +1,279 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+import os
+from io import BytesIO
+from types import SimpleNamespace
+from unittest import skipIf
+
+from django.test import SimpleTestCase, override_settings, tag
+
+from freezegun import freeze_time
+from privates.test import temp_private_root
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from openzaak.utils.tests import APICMISTestCase, JWTAuthMixin
+
+from ..api.download import RangeNotSatisfiable, get_etag, parse_range
+from ..utils import CMISContentStream
+from .factories import EnkelvoudigInformatieObjectFactory
+from .utils import get_operation_url
+
+CONTENT = b"0123456789" * 1000
+
+
+class ParseRangeTests(SimpleTestCase):
+    def test_parse_range(self):
+        for header, expected in [
+            ("bytes=0-99", (0, 99)),
+            ("bytes=100-", (100, 9999)),
+            ("bytes=-100", (9900, 9999)),
+            ("bytes=9000-20000", (9000, 9999)),
+            ("bytes=-20000", (0, 9999)),
+            # not supported or invalid, the complete content is returned
+            ("bytes=0-99,200-299", None),
+            ("bytes=99-0", None),
+            ("bytes=-", None),
+            ("items=0-99", None),
+        ]:
+            with self.subTest(header=header):
+                self.assertEqual(parse_range(header, 10000), expected)
+
+    def test_not_satisfiable(self):
+        for header, size in [
+            ("bytes=10000-", 10000),
+            ("bytes=-0", 10000),
+            ("bytes=-100", 0),
+        ]:
+            with self.subTest(header=header, size=size):
+                with self.assertRaises(RangeNotSatisfiable):
+                    parse_range(header, size)
+
+    def test_etag(self):
+        eio = SimpleNamespace(
+            uuid="b09fac1f-f295-4b44-a94b-97126edec2f3",
+            versie=1,
+            integriteit_algoritme="",
+            integriteit_waarde="",
+        )
+        etag = get_etag(eio)
+
+        self.assertEqual(etag, get_etag(eio))
+        self.assertNotEqual(
+            etag, get_etag(SimpleNamespace(**{**vars(eio), "versie": 2}))
+        )
+        self.assertNotEqual(
+            etag,
+            get_etag(
+                SimpleNamespace(
+                    **{
+                        **vars(eio),
+                        "integriteit_algoritme": "md5",
+                        "integriteit_waarde": "abc",
+                    }
+                )
+            ),
+        )
+
+
+class CMISContentStreamTests(SimpleTestCase):
+    def read_all(self, stream: CMISContentStream) -> bytes:
+        return b"".join(iter(lambda: stream.read(3), b""))
+
+    def test_read_range(self):
+        stream = CMISContentStream(BytesIO(b"0123456789"), skip=0, length=4)
+
+        self.assertEqual(self.read_all(stream), b"0123")
+
+    def test_skip_to_range(self):
+        stream = CMISContentStream(BytesIO(b"0123456789"), skip=2, length=5)
+
+        self.assertEqual(self.read_all(stream), b"23456")
+
+
+@override_settings(SENDFILE_BACKEND="django_sendfile.backends.simple")
+@temp_private_root()
+class DownloadTests(JWTAuthMixin, APITestCase):
+
+    heeft_alle_autorisaties = True
+
+    def test_etag(self):
+        eio = EnkelvoudigInformatieObjectFactory.create(inhoud__data=CONTENT)
+        url = get_operation_url("enkelvoudiginformatieobject_download", uuid=eio.uuid)
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["ETag"], get_etag(eio))
+
+    def test_if_none_match(self):
+        eio = EnkelvoudigInformatieObjectFactory.create(inhoud__data=CONTENT)
+        url = get_operation_url("enkelvoudiginformatieobject_download", uuid=eio.uuid)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=get_etag(eio))
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], get_etag(eio))
+
+    def test_if_match_other_version(self):
+        eio = EnkelvoudigInformatieObjectFactory.create(inhoud__data=CONTENT)
+        url = get_operation_url("enkelvoudiginformatieobject_download", uuid=eio.uuid)
+
+        response = self.client.get(url, HTTP_IF_MATCH='"other"')
+
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+
+
+@override_settings(
+    SENDFILE_BACKEND="django_sendfile.backends.simple", DOWNLOAD_REDIRECT_EXPIRY=60
+)
+@temp_private_root()
+class DownloadRedirectTests(JWTAuthMixin, APITestCase):
+
+    heeft_alle_autorisaties = True
+
+    def setUp(self):
+        super().setUp()
+        self.eio = EnkelvoudigInformatieObjectFactory.create(inhoud__data=CONTENT)
+        self.url = get_operation_url(
+            "enkelvoudiginformatieobject_download", uuid=self.eio.uuid
+        )
+
+    def test_redirect(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(response["ETag"], get_etag(self.eio))
+
+        # the signed URL doesn't need the credentials
+        self.client.credentials()
+        response = self.client.get(response["Location"])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(response.streaming_content), CONTENT)
+
+    def test_if_none_match(self):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=get_etag(self.eio))
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_expired(self):
+        with freeze_time("2022-01-01T12:00:00"):
+            location = self.client.get(self.url)["Location"]
+
+        with freeze_time("2022-01-01T12:01:01"):
+            response = self.client.get(location)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_tampered(self):
+        location = self.client.get(self.url)["Location"]
+
+        response = self.client.get(location[:-1])
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_no_permission(self):
+        self.applicatie.heeft_alle_autorisaties = False
+        self.applicatie.save()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_disabled(self):
+        location = self.client.get(self.url)["Location"]
+
+        with override_settings(DOWNLOAD_REDIRECT_EXPIRY=0):
+            response = self.client.get(location)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@tag("cmis")
+@override_settings(CMIS_ENABLED=True)
+class DownloadCMISTests(JWTAuthMixin, APICMISTestCase):
+
+    heeft_alle_autorisaties = True
+
+    def setUp(self):
+        super().setUp()
+        self.eio = EnkelvoudigInformatieObjectFactory.create(inhoud__data=CONTENT)
+        self.url = get_operation_url(
+            "enkelvoudiginformatieobject_download", uuid=self.eio.uuid
+        )
+
+    def test_download(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response.getvalue(), CONTENT)
+        self.assertEqual(response["Content-Length"], str(len(CONTENT)))
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(response["ETag"], get_etag(self.eio))
+
+    def test_range(self):
+        for header, start, end in [
+            ("bytes=0-99", 0, 99),
+            ("bytes=5000-", 5000, 9999),
+            ("bytes=-10", 9990, 9999),
+        ]:
+            with self.subTest(header=header):
+                response = self.client.get(self.url, HTTP_RANGE=header)
+
+                self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+                self.assertEqual(response.getvalue(), CONTENT[start : end + 1])
+                self.assertEqual(response["Content-Length"], str(end - start + 1))
+                self.assertEqual(
+                    response["Content-Range"], f"bytes {start}-{end}/{len(CONTENT)}"
+                )
+
+    def test_range_not_satisfiable(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=20000-")
+
+        self.assertEqual(
+            response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+        )
+        self.assertEqual(response["Content-Range"], f"bytes */{len(CONTENT)}")
+
+    def test_if_range_other_version(self):
+        response = self.client.get(
+            self.url, HTTP_RANGE="bytes=0-99", HTTP_IF_RANGE='"other"'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.getvalue(), CONTENT)
+
+    def test_if_none_match(self):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=get_etag(self.eio))
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+@tag("cmis")
+@skipIf(os.getenv("CMIS_BINDING") == "WEBSERVICE", "BROWSER binding specific tests")
+@override_settings(
+    CMIS_ENABLED=True,
+    DOWNLOAD_REDIRECT_EXPIRY=60,
+    CMIS_CONTENT_REDIRECT_URL="/dms-content/",
+)
+class DownloadRedirectCMISTests(JWTAuthMixin, APICMISTestCase):
+
+    heeft_alle_autorisaties = True
+
+    def test_redirect(self):
+        eio = EnkelvoudigInformatieObjectFactory.create(inhoud__data=CONTENT)
+        url = get_operation_url("enkelvoudiginformatieobject_download", uuid=eio.uuid)
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+
+        response = self.client.get(response["Location"])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, b"")
+        self.assertTrue(response["X-Accel-Redirect"].startswith("/dms-content/"))
+        self.assertIn("/s/api/node/content/", response["X-Accel-Redirect"])
+        self.assertNotIn("Authorization", response)
@@ -5,8 +5,10 @@ Test the flow described in https://github.com/VNG-Realisatie/gemma-zaken/issues/
 """
 import base64
 from datetime import date
+from unittest.mock import patch
 from urllib.parse import urlparse
 
+from django.core.files.storage import FileSystemStorage
 from django.test import override_settings
 
 from privates.test import temp_private_root
@@ -95,3 +97,20 @@ class US39TestCase(JWTAuthMixin, APITestCase):
             download_url.path,
             get_operation_url("enkelvoudiginformatieobject_download", uuid=eio.uuid),
         )
+
+    def test_bestandsomvang_is_recorded(self):
+        eio = EnkelvoudigInformatieObjectFactory.create()
+
+        eio.refresh_from_db()
+        self.assertEqual(eio._bestandsomvang, len(b"some data"))
+
+    def test_list_does_not_access_storage(self):
+        EnkelvoudigInformatieObjectFactory.create_batch(2)
+        list_url = get_operation_url("enkelvoudiginformatieobject_list")
+
+        with patch.object(FileSystemStorage, "size") as mock_size:
+            response = self.client.get(list_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["bestandsomvang"], 9)
+        mock_size.assert_not_called()
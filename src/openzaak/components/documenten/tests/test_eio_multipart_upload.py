@@ -0,0 +1,128 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+import hashlib
+from datetime import date
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+
+from freezegun import freeze_time
+from privates.test import temp_private_root
+from rest_framework import status
+from rest_framework.test import APITestCase
+from vng_api_common.constants import VertrouwelijkheidsAanduiding
+from vng_api_common.tests import reverse
+
+from openzaak.components.catalogi.tests.factories import InformatieObjectTypeFactory
+from openzaak.utils.tests import JWTAuthMixin
+
+from ..constants import ChecksumAlgoritmes
+from ..models import EnkelvoudigInformatieObject
+from .factories import EnkelvoudigInformatieObjectFactory
+from .utils import get_operation_url
+
+CONTENT = b"some large document" * 1000
+
+
+@override_settings(SENDFILE_BACKEND="django_sendfile.backends.simple")
+@temp_private_root()
+class MultipartUploadTests(JWTAuthMixin, APITestCase):
+
+    heeft_alle_autorisaties = True
+
+    def get_data(self) -> dict:
+        informatieobjecttype = InformatieObjectTypeFactory.create(concept=False)
+        return {
+            "identificatie": "AMS20180701001",
+            "bronorganisatie": "159351741",
+            "creatiedatum": "2018-07-01",
+            "titel": "document.bin",
+            "auteur": "ANONIEM",
+            "taal": "dut",
+            "bestandsnaam": "document.bin",
+            "inhoud": SimpleUploadedFile("document.bin", CONTENT),
+            "informatieobjecttype": f"http://testserver{reverse(informatieobjecttype)}",
+            "vertrouwelijkheidaanduiding": VertrouwelijkheidsAanduiding.openbaar,
+        }
+
+    @freeze_time("2022-05-01")
+    def test_create(self):
+        url = get_operation_url("enkelvoudiginformatieobject_create")
+
+        response = self.client.post(url, self.get_data(), format="multipart")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+
+        eio = EnkelvoudigInformatieObject.objects.get()
+        self.assertEqual(eio.inhoud.read(), CONTENT)
+        self.assertEqual(eio.bestandsnaam, "document.bin")
+        self.assertEqual(response.data["bestandsomvang"], len(CONTENT))
+        self.assertEqual(
+            eio.integriteit,
+            {
+                "algoritme": ChecksumAlgoritmes.sha_256,
+                "waarde": hashlib.sha256(CONTENT).hexdigest(),
+                "datum": date(2022, 5, 1),
+            },
+        )
+
+        download_response = self.client.get(response.data["inhoud"])
+
+        self.assertEqual(download_response.getvalue(), CONTENT)
+
+    def test_create_with_integriteit(self):
+        url = get_operation_url("enkelvoudiginformatieobject_create")
+        data = {
+            **self.get_data(),
+            "integriteit.algoritme": ChecksumAlgoritmes.md5,
+            "integriteit.waarde": hashlib.md5(CONTENT).hexdigest(),
+            "integriteit.datum": "2018-07-01",
+        }
+
+        response = self.client.post(url, data, format="multipart")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+
+        eio = EnkelvoudigInformatieObject.objects.get()
+        self.assertEqual(
+            eio.integriteit,
+            {
+                "algoritme": ChecksumAlgoritmes.md5,
+                "waarde": hashlib.md5(CONTENT).hexdigest(),
+                "datum": date(2018, 7, 1),
+            },
+        )
+
+    def test_update(self):
+        eio = EnkelvoudigInformatieObjectFactory.create()
+        lock_url = get_operation_url("enkelvoudiginformatieobject_lock", uuid=eio.uuid)
+        lock = self.client.post(lock_url).data["lock"]
+        url = get_operation_url("enkelvoudiginformatieobject_update", uuid=eio.uuid)
+
+        response = self.client.patch(
+            url,
+            {"inhoud": SimpleUploadedFile("document.bin", CONTENT), "lock": lock},
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+
+        latest_version = eio.canonical.latest_version
+        self.assertEqual(latest_version.versie, 2)
+        self.assertEqual(latest_version.inhoud.read(), CONTENT)
+        self.assertEqual(
+            latest_version.integriteit["waarde"], hashlib.sha256(CONTENT).hexdigest()
+        )
+
+    def test_json_body_still_supported(self):
+        url = get_operation_url("enkelvoudiginformatieobject_create")
+        data = self.get_data()
+        data["inhoud"] = "c29tZSBkYXRh"
+
+        response = self.client.post(url, data)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+
+        eio = EnkelvoudigInformatieObject.objects.get()
+        self.assertEqual(eio.inhoud.read(), b"some data")
+        self.assertEqual(eio.integriteit["algoritme"], "")
@@ -182,6 +182,37 @@ class EnkelvoudigInformatieObjectTests(JWTAuthMixin, APITestCase):
         error = get_validation_errors(response, "inhoud")
         self.assertEqual(error["code"], "incorrect-base64-padding")
 
+    @temp_private_root()
+    def test_inhoud_invalid_character(self):
+        iotype = InformatieObjectTypeFactory.create()
+        iotype_url = reverse(iotype)
+
+        url = reverse("enkelvoudiginformatieobject-list")
+        content = {
+            "identificatie": uuid.uuid4().hex,
+            "bronorganisatie": "159351741",
+            "creatiedatum": "2018-06-27",
+            "titel": "detailed summary",
+            "auteur": "test_auteur",
+            "formaat": "txt",
+            "taal": "eng",
+            "bestandsnaam": "dummy.txt",
+            # URL-safe base64 is not accepted
+            "inhoud": "c29tZSBmaWxl-A==",
+            "link": "http://een.link",
+            "beschrijving": "test_beschrijving",
+            "informatieobjecttype": iotype_url,
+            "vertrouwelijkheidaanduiding": "openbaar",
+        }
+
+        response = self.client.post(url, content)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        error = get_validation_errors(response, "inhoud")
+        self.assertEqual(error["code"], "invalid-base64")
+        self.assertEqual(error["reason"], "Invalid base64 character '-' at position 12")
+
     @temp_private_root()
     def test_inhoud_correct_padding(self):
         iotype = InformatieObjectTypeFactory.create(concept=False)
@@ -3,21 +3,28 @@
 import io
 from decimal import Decimal
 from io import BytesIO
-from typing import TypeVar
+from typing import BinaryIO, Callable, Optional, TypeVar
 
 from django.conf import settings
 from django.core.files.base import File
 from django.core.files.storage import Storage
 from django.utils.functional import LazyObject
 
+import requests
+from drc_cmis.browser.client import CMISDRCClient
 from drc_cmis.client_builder import get_cmis_client
 from drc_cmis.models import Vendor
 from privates.storages import PrivateMediaFileSystemStorage
 
+from .query.cache import get_document
+
 # In the CMIS adapter, the Document object can be from either the Browser or Webservice binding module.
 # So, this is to simplify the type hint
 Cmisdoc = TypeVar("Cmisdoc")
 
+# number of bytes that are read at once to skip to the start of a range
+SKIP_CHUNK_SIZE = 2 ** 16
+
 
 class CMISStorageFile(File):
     def __init__(self, uuid_version):
@@ -58,6 +65,44 @@ class CMISStorageFile(File):
         self.file.close()
 
 
+class CMISContentStream:
+    """
+    Read a range of the content of a document, while it's retrieved from the DMS.
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        skip: int,
+        length: int,
+        close: Optional[Callable[[], None]] = None,
+    ):
+        self._stream = stream
+        self._skip = skip
+        self._remaining = length
+        self._close = close or stream.close
+
+    def read(self, num_bytes: Optional[int] = None) -> bytes:
+        # the DMS may return the complete content instead of the requested range
+        while self._skip:
+            skipped = self._stream.read(min(self._skip, SKIP_CHUNK_SIZE))
+            if not skipped:
+                break
+            self._skip -= len(skipped)
+
+        if num_bytes is None or num_bytes < 0 or num_bytes > self._remaining:
+            num_bytes = self._remaining
+        if not num_bytes:
+            return b""
+
+        data = self._stream.read(num_bytes)
+        self._remaining -= len(data)
+        return data
+
+    def close(self):
+        self._close()
+
+
 class CMISStorage(Storage):
     _cmis_client = None
 
@@ -93,6 +138,41 @@ class CMISStorage(Storage):
         content_bytes = cmis_doc.get_content_stream()
         return content_bytes
 
+    def open_content(
+        self, uuid_version: str, start: int, end: int
+    ) -> CMISContentStream:
+        """
+        Stream the content of the document from the ``start`` up to and including the
+        ``end`` byte.
+        """
+        length = max(end - start + 1, 0)
+        if not length:
+            return CMISContentStream(BytesIO(), 0, 0)
+
+        cmis_doc = self._get_cmis_doc(uuid_version)
+        client = self.cmis_client
+        # the webservice binding returns the content in the SOAP response
+        if not isinstance(client, CMISDRCClient):
+            return CMISContentStream(cmis_doc.get_content_stream(), start, length)
+
+        headers = {}
+        if length < cmis_doc.contentStreamLength:
+            headers["Range"] = f"bytes={start}-{end}"
+        # the response outlives the connection pool of the request, which is closed
+        # before the content is streamed
+        response = requests.get(
+            client.root_folder_url,
+            params={"objectId": cmis_doc.objectId, "cmisaction": "content"},
+            auth=(client.user, client.password),
+            headers=headers,
+            stream=True,
+        )
+        response.raise_for_status()
+        response.raw.decode_content = True
+
+        skip = start if response.status_code != 206 else 0
+        return CMISContentStream(response.raw, skip, length, close=response.close)
+
     def size(self, uuid_version: str) -> int:
         cmis_doc = self._get_cmis_doc(uuid_version)
         return cmis_doc.contentStreamLength
@@ -130,15 +210,7 @@ class CMISStorage(Storage):
     def _get_cmis_doc(self, uuid_version: str) -> Cmisdoc:
         uuid, wanted_version = uuid_version.split(";")
         wanted_version = int(Decimal(wanted_version))
-        cmis_doc = self.cmis_client.get_document(drc_uuid=uuid)
-        # only way to get a specific version
-        if cmis_doc.versie != wanted_version:
-            all_versions = self.cmis_client.get_all_versions(cmis_doc)
-            for version in all_versions:
-                if version.versie == wanted_version:
-                    cmis_doc = version
-                    break
-        return cmis_doc
+        return get_document(self.cmis_client, uuid, wanted_version)
 
 
 class PrivateMediaStorageWithCMIS(LazyObject):
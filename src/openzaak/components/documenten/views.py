@@ -1,7 +1,14 @@
 # SPDX-License-Identifier: EUPL-1.2
 # Copyright (C) 2020 Dimpact
+from django.conf import settings
+from django.core import signing
+from django.http import Http404
+from django.views import View
+
 from privates.views import PrivateMediaView as _PrivateMediaView
 
+from .api.download import get_signed_download_response
+
 
 class PrivateMediaView(_PrivateMediaView):
     def get_sendfile_opts(self):
@@ -9,3 +16,20 @@ class PrivateMediaView(_PrivateMediaView):
             "attachment": True,
             "attachment_filename": self.get_object().bestandsnaam,
         }
+
+
+class SignedDownloadView(View):
+    """
+    Serve the content a download was redirected to.
+
+    The permissions were checked by the download, the signed URL is valid for
+    ``DOWNLOAD_REDIRECT_EXPIRY`` seconds.
+    """
+
+    def get(self, request, token: str, **kwargs):
+        if not settings.DOWNLOAD_REDIRECT_EXPIRY:
+            raise Http404
+        try:
+            return get_signed_download_response(request, token)
+        except signing.BadSignature:
+            raise Http404
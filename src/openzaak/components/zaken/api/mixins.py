@@ -1,22 +1,38 @@
 # SPDX-License-Identifier: EUPL-1.2
-# Copyright (C) 2020 Dimpact
-from typing import Optional
-
-from django.db import models
-
-from rest_framework import serializers
+# Copyright (C) 2020 - 2022 Dimpact
+import logging
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import models, transaction
+
+from rest_framework import serializers, status
+from rest_framework.response import Response
+from vng_api_common.audittrails.models import AuditTrail
+from vng_api_common.compat import get_header
+from vng_api_common.constants import CommonResourceAction
+from vng_api_common.notifications.models import NotificationsConfig
+from vng_api_common.permissions import bypass_permissions, get_required_scopes
+from zds_client import ClientError
 
 from openzaak.components.zaken.api.scopes import SCOPE_ZAKEN_GEFORCEERD_BIJWERKEN
 from openzaak.components.zaken.models import Zaak
+from openzaak.notifications.models import OutboxNotification
+from openzaak.notifications.outbox import build_outbox_notification
+from openzaak.utils.permissions import AuthRequired, get_permission_data
 
 from .exceptions import ZaakClosed
-from .serializers import ZaakSerializer
+from .permissions import ZaakAuthRequired
+
+notifs_logger = logging.getLogger("vng_api_common.notifications.viewsets")
 
 
 class ClosedZaakMixin:
     def _has_override(self, zaak: Zaak) -> bool:
         jwt_auth = self.request.jwt_auth
-        zaak_data = ZaakSerializer(zaak, context={"request": self.request}).data
+        zaak_data = get_permission_data(
+            zaak, ZaakAuthRequired.permission_fields, self.request
+        )
         return jwt_auth.has_auth(
             scopes=SCOPE_ZAKEN_GEFORCEERD_BIJWERKEN,
             zaaktype=zaak_data["zaaktype"],
@@ -74,3 +90,148 @@ class ClosedZaakMixin:
         zaak = instance.zaak
         self._check_zaak_closed(zaak)
         super().perform_destroy(instance)
+
+
+class BulkCreateMixin:
+    """
+    Create a batch of resources in a single transaction.
+
+    The list serializer of the resource performs the bulk inserts. Permissions are
+    checked for every resource in the batch, and the audit trails and notifications
+    are the same as for the ``create`` action, but they are written and sent in bulk.
+    """
+
+    def check_batch_permissions(self, request, batch: list) -> None:
+        if bypass_permissions(request):
+            return
+
+        scopes_required = get_required_scopes(self)
+        component = self.queryset.model._meta.app_label
+        for permission in self.get_permissions():
+            if not isinstance(permission, AuthRequired):
+                continue
+
+            for data in batch:
+                if not isinstance(data, dict):
+                    continue
+                fields = permission.get_fields(data)
+                if not request.jwt_auth.has_auth(scopes_required, component, **fields):
+                    self.permission_denied(request)
+
+    def create_batch(self, request) -> Response:
+        if isinstance(request.data, list):
+            self.check_batch_permissions(request, request.data)
+
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        with transaction.atomic():
+            created = serializer.save()
+            # re-fetch with the related objects of the viewset queryset
+            instances = list(
+                self.get_queryset()
+                .filter(pk__in=[instance.pk for instance in created])
+                .order_by("pk")
+            )
+            data = self.get_serializer(instances, many=True).data
+
+            self.create_batch_audittrails(data, instances)
+            self.notify_batch(data, instances)
+
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    def create_batch_audittrails(
+        self, batch_data: List[dict], instances: List[models.Model]
+    ) -> None:
+        """
+        Bulk version of :meth:`AuditTrailMixin.create_audittrail` for created objects.
+        """
+        jwt_auth = self.request.jwt_auth
+        applications = jwt_auth.applicaties
+        if applications:
+            app_id, app_presentation = str(applications[0].uuid), applications[0].label
+        else:
+            app_id = get_header(self.request, "X-NLX-Request-Application-Id")
+            app_presentation = app_id
+
+        common = {
+            "bron": self.audit.component_name,
+            "logrecord_id": get_header(self.request, "X-NLX-Logrecord-ID") or "",
+            "applicatie_id": app_id,
+            "applicatie_weergave": app_presentation,
+            "actie": CommonResourceAction.create,
+            "actie_weergave": CommonResourceAction.labels.get(
+                CommonResourceAction.create, ""
+            ),
+            "gebruikers_id": jwt_auth.payload.get("user_id") or "",
+            "gebruikers_weergave": jwt_auth.payload.get("user_representation") or "",
+            "resultaat": status.HTTP_201_CREATED,
+            "resource": self.basename,
+            "toelichting": get_header(self.request, "X-Audit-Toelichting") or "",
+            "oud": None,
+        }
+
+        trails = []
+        for data, instance in zip(batch_data, instances):
+            if self.basename == self.audit.main_resource:
+                main_object = data["url"]
+            else:
+                main_object = self.get_audittrail_main_object_url(
+                    data, self.audit.main_resource
+                )
+            trails.append(
+                AuditTrail(
+                    hoofd_object=main_object,
+                    resource_url=data["url"],
+                    resource_weergave=instance.unique_representation(),
+                    nieuw=data,
+                    **common,
+                )
+            )
+        AuditTrail.objects.bulk_create(trails)
+
+    def notify_batch(self, batch_data: List[dict], instances: List[models.Model]):
+        """
+        Bulk version of :meth:`NotificationMixin.notify` for created objects.
+
+        The messages are stored in the outbox with one query, or sent one after the
+        other once the transaction is committed.
+        """
+        if settings.NOTIFICATIONS_DISABLED:
+            return
+
+        messages = []
+        for data, instance in zip(batch_data, instances):
+            message = self.construct_message(data, instance=instance)
+            message["actie"] = CommonResourceAction.create
+            messages.append(message)
+
+        if settings.NOTIFICATIONS_OUTBOX:
+            OutboxNotification.objects.bulk_create(
+                [
+                    build_outbox_notification(message, status.HTTP_201_CREATED)
+                    for message in messages
+                ]
+            )
+            return
+
+        client = NotificationsConfig.get_client()
+        if client is None:
+            raise RuntimeError("Could not build a client for Notifications API")
+
+        def _send():
+            for message in messages:
+                try:
+                    client.create("notificaties", message)
+                except ClientError:
+                    notifs_logger.warning(
+                        "Could not deliver message to %s",
+                        client.base_url,
+                        exc_info=True,
+                        extra={
+                            "notification_msg": message,
+                            "status_code": status.HTTP_201_CREATED,
+                        },
+                    )
+
+        self.schedule_notification(_send)
@@ -1,6 +1,8 @@
 # SPDX-License-Identifier: EUPL-1.2
-# Copyright (C) 2019 - 2020 Dimpact
+# Copyright (C) 2019 - 2022 Dimpact
 import logging
+from collections import Counter, defaultdict
+from typing import List
 
 from django.conf import settings
 from django.db import transaction
@@ -37,6 +39,7 @@ from openzaak.components.documenten.api.fields import EnkelvoudigInformatieObjec
 from openzaak.utils.api import create_remote_oio
 from openzaak.utils.auth import get_auth
 from openzaak.utils.exceptions import DetermineProcessEndDateException
+from openzaak.utils.identificatie import register_identificatie, reserve_identificaties
 from openzaak.utils.validators import (
     LooseFkIsImmutableValidator,
     LooseFkResourceValidator,
@@ -125,6 +128,101 @@ class RelevanteZaakSerializer(serializers.HyperlinkedModelSerializer):
         self.fields["aard_relatie"].help_text += f"\n\n{value_display_mapping}"
 
 
+def allocate_identificaties(zaken: List[Zaak]) -> None:
+    """
+    Generate the missing identificaties of a batch of zaken.
+
+    The numbers are reserved in one block per year, rather than once per zaak.
+    """
+    per_year = defaultdict(list)
+    for zaak in zaken:
+        if zaak.identificatie:
+            register_identificatie(zaak)
+        else:
+            per_year[zaak.registratiedatum.year].append(zaak)
+
+    for year, batch in per_year.items():
+        identificaties = reserve_identificaties(Zaak, year, len(batch))
+        for zaak, identificatie in zip(batch, identificaties):
+            zaak.identificatie = identificatie
+
+
+class ZaakBulkCreateSerializer(serializers.ListSerializer):
+    """
+    Create a batch of zaken with bulk inserts.
+
+    This replicates :meth:`ZaakSerializer.create` and :meth:`Zaak.save` for all the
+    zaken at once.
+    """
+
+    max_batch_size = 1000
+
+    def validate(self, attrs: List[dict]) -> List[dict]:
+        if len(attrs) > self.max_batch_size:
+            raise serializers.ValidationError(
+                _("A batch may contain at most %(max)d zaken.")
+                % {"max": self.max_batch_size},
+                code="max-batch-size",
+            )
+
+        identificaties = Counter(
+            (zaak["bronorganisatie"], zaak["identificatie"])
+            for zaak in attrs
+            if zaak.get("identificatie")
+        )
+        if any(count > 1 for count in identificaties.values()):
+            raise serializers.ValidationError(
+                _("The identificaties must be unique within the batch."),
+                code="identificatie-niet-uniek",
+            )
+        return attrs
+
+    @transaction.atomic
+    def create(self, validated_data: List[dict]) -> List[Zaak]:
+        zaken, gegevensgroepen, nested = [], [], []
+        for data in validated_data:
+            data = data.copy()
+            nested.append(
+                (
+                    data.pop("zaakkenmerk_set", []),
+                    data.pop("relevante_andere_zaken", []),
+                )
+            )
+            gegevensgroepen.append(
+                {
+                    name: data.pop(name)
+                    for name in ("verlenging", "opschorting")
+                    if name in data
+                }
+            )
+            if "vertrouwelijkheidaanduiding" not in data:
+                data["vertrouwelijkheidaanduiding"] = data[
+                    "zaaktype"
+                ].vertrouwelijkheidaanduiding
+            zaken.append(Zaak(**data))
+
+        for zaak, groepen in zip(zaken, gegevensgroepen):
+            for name, value in groepen.items():
+                setattr(zaak, name, value)
+            # see Zaak.save
+            if zaak.betalingsindicatie == BetalingsIndicatie.nvt:
+                zaak.laatste_betaaldatum = None
+        allocate_identificaties(zaken)
+
+        Zaak.objects.bulk_create(zaken)
+
+        kenmerken, relaties = [], []
+        for zaak, (kenmerken_data, relaties_data) in zip(zaken, nested):
+            kenmerken += [ZaakKenmerk(zaak=zaak, **data) for data in kenmerken_data]
+            relaties += [
+                RelevanteZaakRelatie(zaak=zaak, **data) for data in relaties_data
+            ]
+        ZaakKenmerk.objects.bulk_create(kenmerken)
+        RelevanteZaakRelatie.objects.bulk_create(relaties)
+
+        return zaken
+
+
 class ZaakSerializer(
     NestedGegevensGroepMixin,
     NestedCreateMixin,
@@ -188,11 +286,11 @@ class ZaakSerializer(
     )
 
     resultaat = serializers.HyperlinkedRelatedField(
+        source="resultaat_uuid",
         read_only=True,
         allow_null=True,
         view_name="resultaat-detail",
         lookup_url_kwarg="uuid",
-        lookup_field="uuid",
         help_text=_(
             "URL-referentie naar het RESULTAAT. Indien geen resultaat bekend is, dan is de waarde 'null'"
         ),
@@ -245,6 +343,7 @@ class ZaakSerializer(
             "archiefactiedatum",
             "resultaat",
         )
+        list_serializer_class = ZaakBulkCreateSerializer
         extra_kwargs = {
             "url": {"lookup_field": "uuid"},
             "uuid": {"read_only": True},
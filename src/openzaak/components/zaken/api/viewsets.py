@@ -8,11 +8,11 @@ from django.shortcuts import get_object_or_404
 from django.utils.translation import ugettext_lazy as _
 
 from django_loose_fk.virtual_models import ProxyMixin
+from drf_yasg.utils import swagger_auto_schema
 from rest_framework import mixins, viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.filters import OrderingFilter
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.reverse import reverse
 from rest_framework.settings import api_settings
 from vng_api_common.audittrails.viewsets import (
@@ -23,19 +23,25 @@ from vng_api_common.audittrails.viewsets import (
 )
 from vng_api_common.filters import Backend
 from vng_api_common.geo import GeoMixin
-from vng_api_common.notifications.viewsets import (
-    NotificationCreateMixin,
-    NotificationDestroyMixin,
-    NotificationViewSetMixin,
-)
 from vng_api_common.search import SearchMixin
 from vng_api_common.utils import lookup_kwargs_to_filters
-from vng_api_common.viewsets import CheckQueryParamsMixin, NestedViewSetMixin
+from vng_api_common.viewsets import NestedViewSetMixin
 from zgw_consumers.models import Service
 
+from openzaak.notifications.viewsets import (
+    NotificationCreateMixin,
+    NotificationDestroyMixin,
+    NotificationViewSetMixin,
+)
 from openzaak.utils.api import delete_remote_oio
 from openzaak.utils.data_filtering import ListFilterByAuthorizationsMixin
-from openzaak.utils.permissions import AuthRequired
+from openzaak.utils.mixins import CheckQueryParamsMixin, PrefetchRemoteObjectsMixin
+from openzaak.utils.pagination import (
+    LargeCollectionMixin,
+    OptimizedPagination,
+    StreamingListMixin,
+)
+from openzaak.utils.permissions import AuthRequired, get_permission_data
 
 from ..models import (
     KlantContact,
@@ -60,7 +66,7 @@ from .filters import (
     ZaakObjectFilter,
 )
 from .kanalen import KANAAL_ZAKEN
-from .mixins import ClosedZaakMixin
+from .mixins import BulkCreateMixin, ClosedZaakMixin
 from .permissions import ZaakAuthRequired, ZaakNestedAuthRequired
 from .scopes import (
     SCOPE_STATUSSEN_TOEVOEGEN,
@@ -94,6 +100,9 @@ class ZaakViewSet(
     SearchMixin,
     CheckQueryParamsMixin,
     ListFilterByAuthorizationsMixin,
+    BulkCreateMixin,
+    PrefetchRemoteObjectsMixin,
+    StreamingListMixin,
     viewsets.ModelViewSet,
 ):
     """
@@ -213,12 +222,9 @@ class ZaakViewSet(
                 queryset=RelevanteZaakRelatie.objects.select_related("_relevant_zaak"),
             ),
             "zaakkenmerk_set",
-            "resultaat",
             "zaakeigenschap_set",
-            models.Prefetch(
-                "status_set", queryset=Status.objects.order_by("-datum_status_gezet")
-            ),
         )
+        .annotate_current_status_and_resultaat()
         .order_by("-pk")
     )
     serializer_class = ZaakSerializer
@@ -227,7 +233,7 @@ class ZaakViewSet(
     filterset_class = ZaakFilter
     ordering_fields = ("startdatum",)
     lookup_field = "uuid"
-    pagination_class = PageNumberPagination
+    pagination_class = OptimizedPagination
 
     permission_classes = (ZaakAuthRequired,)
     required_scopes = {
@@ -235,6 +241,7 @@ class ZaakViewSet(
         "retrieve": SCOPE_ZAKEN_ALLES_LEZEN,
         "_zoek": SCOPE_ZAKEN_ALLES_LEZEN,
         "create": SCOPE_ZAKEN_CREATE,
+        "_bulk": SCOPE_ZAKEN_CREATE,
         "update": SCOPE_ZAKEN_BIJWERKEN | SCOPE_ZAKEN_GEFORCEERD_BIJWERKEN,
         "partial_update": SCOPE_ZAKEN_BIJWERKEN | SCOPE_ZAKEN_GEFORCEERD_BIJWERKEN,
         "destroy": SCOPE_ZAKEN_ALLES_VERWIJDEREN,
@@ -261,6 +268,21 @@ class ZaakViewSet(
 
     _zoek.is_search_action = True
 
+    @swagger_auto_schema(auto_schema=None)
+    @action(methods=("post",), detail=False)
+    def _bulk(self, request, *args, **kwargs):
+        """
+        Maak een reeks ZAAKen aan in één transactie.
+
+        De request body is een lijst van ZAAKen, die op dezelfde manier
+        gevalideerd worden als bij het aanmaken van een enkele ZAAK. Indien één
+        van de ZAAKen ongeldig is, wordt geen enkele ZAAK aangemaakt.
+
+        Deze operatie is een Open Zaak uitbreiding en maakt geen deel uit van de
+        Zaken API standaard.
+        """
+        return self.create_batch(request)
+
     def perform_update(self, serializer):
         """
         Perform the update of the Case.
@@ -274,7 +296,9 @@ class ZaakViewSet(
 
         """
         zaak = self.get_object()
-        zaak_data = self.get_serializer(zaak).data
+        zaak_data = get_permission_data(
+            zaak, ZaakAuthRequired.permission_fields, self.request
+        )
 
         if not self.request.jwt_auth.has_auth(
             scopes=SCOPE_ZAKEN_GEFORCEERD_BIJWERKEN,
@@ -324,6 +348,8 @@ class StatusViewSet(
     AuditTrailCreateMixin,
     CheckQueryParamsMixin,
     ListFilterByAuthorizationsMixin,
+    PrefetchRemoteObjectsMixin,
+    StreamingListMixin,
     mixins.CreateModelMixin,
     viewsets.ReadOnlyModelViewSet,
 ):
@@ -360,7 +386,7 @@ class StatusViewSet(
     serializer_class = StatusSerializer
     filterset_class = StatusFilter
     lookup_field = "uuid"
-    pagination_class = PageNumberPagination
+    pagination_class = OptimizedPagination
 
     permission_classes = (ZaakAuthRequired,)
     permission_main_object = "zaak"
@@ -389,7 +415,9 @@ class StatusViewSet(
           insufficient permissions
         """
         zaak = serializer.validated_data["zaak"]
-        zaak_data = ZaakSerializer(zaak, context={"request": self.request}).data
+        zaak_data = get_permission_data(
+            zaak, ZaakAuthRequired.permission_fields, self.request
+        )
         component = self.queryset.model._meta.app_label
 
         if not self.request.jwt_auth.has_auth(
@@ -421,6 +449,7 @@ class ZaakObjectViewSet(
     ListFilterByAuthorizationsMixin,
     AuditTrailCreateMixin,
     ClosedZaakMixin,
+    StreamingListMixin,
     mixins.CreateModelMixin,
     viewsets.ReadOnlyModelViewSet,
 ):
@@ -447,7 +476,7 @@ class ZaakObjectViewSet(
     serializer_class = ZaakObjectSerializer
     filterset_class = ZaakObjectFilter
     lookup_field = "uuid"
-    pagination_class = PageNumberPagination
+    pagination_class = OptimizedPagination
 
     permission_classes = (ZaakAuthRequired,)
     permission_main_object = "zaak"
@@ -468,6 +497,8 @@ class ZaakInformatieObjectViewSet(
     CheckQueryParamsMixin,
     ListFilterByAuthorizationsMixin,
     ClosedZaakMixin,
+    PrefetchRemoteObjectsMixin,
+    LargeCollectionMixin,
     viewsets.ModelViewSet,
 ):
 
@@ -598,6 +629,8 @@ class ZaakEigenschapViewSet(
     AuditTrailCreateMixin,
     NestedViewSetMixin,
     ClosedZaakMixin,
+    PrefetchRemoteObjectsMixin,
+    LargeCollectionMixin,
     mixins.CreateModelMixin,
     viewsets.ReadOnlyModelViewSet,
 ):
@@ -654,6 +687,7 @@ class KlantContactViewSet(
     ListFilterByAuthorizationsMixin,
     AuditTrailCreateMixin,
     ClosedZaakMixin,
+    StreamingListMixin,
     mixins.CreateModelMixin,
     viewsets.ReadOnlyModelViewSet,
 ):
@@ -681,7 +715,7 @@ class KlantContactViewSet(
     serializer_class = KlantContactSerializer
     filterset_class = KlantContactFilter
     lookup_field = "uuid"
-    pagination_class = PageNumberPagination
+    pagination_class = OptimizedPagination
 
     permission_classes = (ZaakAuthRequired,)
     permission_main_object = "zaak"
@@ -702,6 +736,8 @@ class RolViewSet(
     CheckQueryParamsMixin,
     ListFilterByAuthorizationsMixin,
     ClosedZaakMixin,
+    PrefetchRemoteObjectsMixin,
+    StreamingListMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
     viewsets.ReadOnlyModelViewSet,
@@ -745,7 +781,7 @@ class RolViewSet(
     serializer_class = RolSerializer
     filterset_class = RolFilter
     lookup_field = "uuid"
-    pagination_class = PageNumberPagination
+    pagination_class = OptimizedPagination
 
     permission_classes = (ZaakAuthRequired,)
     permission_main_object = "zaak"
@@ -765,6 +801,8 @@ class ResultaatViewSet(
     CheckQueryParamsMixin,
     ListFilterByAuthorizationsMixin,
     ClosedZaakMixin,
+    PrefetchRemoteObjectsMixin,
+    StreamingListMixin,
     viewsets.ModelViewSet,
 ):
     """
@@ -814,7 +852,7 @@ class ResultaatViewSet(
     serializer_class = ResultaatSerializer
     filterset_class = ResultaatFilter
     lookup_field = "uuid"
-    pagination_class = PageNumberPagination
+    pagination_class = OptimizedPagination
 
     permission_classes = (ZaakAuthRequired,)
     permission_main_object = "zaak"
@@ -830,7 +868,7 @@ class ResultaatViewSet(
     audit = AUDIT_ZRC
 
 
-class ZaakAuditTrailViewSet(AuditTrailViewSet):
+class ZaakAuditTrailViewSet(LargeCollectionMixin, AuditTrailViewSet):
     """
     Opvragen van Audit trails horend bij een ZAAK.
 
@@ -855,6 +893,7 @@ class ZaakBesluitViewSet(
     AuditTrailDestroyMixin,
     NestedViewSetMixin,
     ClosedZaakMixin,
+    PrefetchRemoteObjectsMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
     viewsets.ReadOnlyModelViewSet,
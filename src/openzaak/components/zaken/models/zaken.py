@@ -25,11 +25,14 @@ from vng_api_common.constants import (
 from vng_api_common.descriptors import GegevensGroepType
 from vng_api_common.fields import RSINField, VertrouwelijkheidsAanduidingField
 from vng_api_common.models import APIMixin
-from vng_api_common.utils import generate_unique_identification
 
 from openzaak.client import fetch_object
 from openzaak.components.documenten.loaders import EIOLoader
 from openzaak.utils.fields import DurationField
+from openzaak.utils.identificatie import (
+    generate_unique_identification,
+    register_identificatie,
+)
 from openzaak.utils.mixins import AuditTrailMixin
 
 from ..constants import AardZaakRelatie, BetalingsIndicatie, IndicatieMachtiging
@@ -327,6 +330,8 @@ class Zaak(AuditTrailMixin, APIMixin, models.Model):
             self.identificatie = generate_unique_identification(
                 self, "registratiedatum"
             )
+        elif self._state.adding:
+            register_identificatie(self)
 
         if (
             self.betalingsindicatie == BetalingsIndicatie.nvt
@@ -338,9 +343,23 @@ class Zaak(AuditTrailMixin, APIMixin, models.Model):
 
     @property
     def current_status_uuid(self):
-        status = self.status_set.first()
+        # annotated by ZaakQuerySet.annotate_current_status_and_resultaat
+        if hasattr(self, "_current_status_uuid"):
+            return self._current_status_uuid
+
+        status = self.status_set.order_by("-datum_status_gezet").first()
         return status.uuid if status else None
 
+    @property
+    def resultaat_uuid(self):
+        if hasattr(self, "_resultaat_uuid"):
+            return self._resultaat_uuid
+
+        try:
+            return self.resultaat.uuid
+        except Resultaat.DoesNotExist:
+            return None
+
     @property
     def is_closed(self) -> bool:
         return self.einddatum is not None
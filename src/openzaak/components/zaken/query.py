@@ -42,7 +42,23 @@ class ZaakAuthorizationsFilterMixin(LooseFkAuthorizationsFilterMixin):
 
 
 class ZaakQuerySet(ZaakAuthorizationsFilterMixin, models.QuerySet):
-    pass
+    def annotate_current_status_and_resultaat(self) -> models.QuerySet:
+        """
+        Annotate the UUIDs of the current status and the resultaat of the zaken.
+
+        The UUIDs are selected with subqueries, rather than prefetching all the
+        statuses of the zaken.
+        """
+        from .models import Resultaat, Status
+
+        current_status = Status.objects.filter(zaak=models.OuterRef("pk")).order_by(
+            "-datum_status_gezet"
+        )
+        resultaat = Resultaat.objects.filter(zaak=models.OuterRef("pk"))
+        return self.annotate(
+            _current_status_uuid=models.Subquery(current_status.values("uuid")[:1]),
+            _resultaat_uuid=models.Subquery(resultaat.values("uuid")[:1]),
+        )
 
 
 class ZaakRelatedQuerySet(ZaakAuthorizationsFilterMixin, models.QuerySet):
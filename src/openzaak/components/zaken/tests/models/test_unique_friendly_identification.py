@@ -1,12 +1,35 @@
 # SPDX-License-Identifier: EUPL-1.2
 # Copyright (C) 2019 - 2020 Dimpact
+from datetime import date
+
+from django.db import connection
+
 from freezegun import freeze_time
 from rest_framework.test import APITestCase
 
+from openzaak.utils.identificatie import (
+    get_sequence_name,
+    reserve_identificaties,
+    sync_sequences,
+)
+
+from ...models import Zaak
 from ..factories import ZaakFactory
 
 
+def sequence_exists(name: str) -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s)", [name])
+        return cursor.fetchone()[0] is not None
+
+
 class UniqueFriendlyIdentificationTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        # the sequences are created in the transaction of the test, and are dropped
+        # again when it's rolled back
+        sync_sequences(years=[2018, 2019])
+
     @freeze_time("2019-01-01")
     def test_create_zaak_unique_id(self):
         zaak = ZaakFactory.create()
@@ -31,3 +54,77 @@ class UniqueFriendlyIdentificationTests(APITestCase):
         zaak3 = ZaakFactory.create()
 
         self.assertEqual(zaak3.identificatie, "ZAAK-2019-0000000003")
+
+    @freeze_time("2019-01-01")
+    def test_sync_continues_after_existing_zaken(self):
+        ZaakFactory.create(identificatie="ZAAK-2019-0000000041")
+        Zaak.objects.update(identificatie="ZAAK-2019-0000000050")
+
+        sync_sequences(years=[2019])
+        zaak = ZaakFactory.create()
+
+        self.assertEqual(zaak.identificatie, "ZAAK-2019-0000000051")
+
+    @freeze_time("2019-01-01")
+    def test_sync_does_not_reset_sequence(self):
+        zaak = ZaakFactory.create()
+        zaak.delete()
+
+        sync_sequences(years=[2019])
+        zaak = ZaakFactory.create()
+
+        self.assertEqual(zaak.identificatie, "ZAAK-2019-0000000002")
+
+    @freeze_time("2019-01-01")
+    def test_explicit_identificatie_advances_numbering(self):
+        ZaakFactory.create()
+        ZaakFactory.create(identificatie="ZAAK-2019-0000000010")
+        ZaakFactory.create(identificatie="ZAAK-2019-0000000005")
+
+        zaak = ZaakFactory.create()
+
+        self.assertEqual(zaak.identificatie, "ZAAK-2019-0000000011")
+
+    def test_explicit_identificatie_other_format(self):
+        ZaakFactory.create(registratiedatum=date(2019, 1, 1))
+        ZaakFactory.create(identificatie="ZAAK-2019-123")
+
+        zaak = ZaakFactory.create(registratiedatum=date(2019, 1, 1))
+
+        self.assertEqual(zaak.identificatie, "ZAAK-2019-0000000002")
+
+    def test_reserve_identificaties(self):
+        ZaakFactory.create(registratiedatum=date(2019, 1, 1))
+
+        identificaties = reserve_identificaties(Zaak, 2019, 3)
+
+        self.assertEqual(
+            identificaties,
+            ["ZAAK-2019-0000000002", "ZAAK-2019-0000000003", "ZAAK-2019-0000000004",],
+        )
+        zaak = ZaakFactory.create(registratiedatum=date(2019, 1, 1))
+        self.assertEqual(zaak.identificatie, "ZAAK-2019-0000000005")
+
+
+class SequenceSyncTests(APITestCase):
+    @freeze_time("2019-06-01")
+    def test_default_years(self):
+        ZaakFactory.create(registratiedatum=date(2015, 1, 1))
+
+        sync_sequences()
+
+        for year in (2015, 2019, 2020):
+            with self.subTest(year=year):
+                self.assertTrue(sequence_exists(get_sequence_name(Zaak, year)))
+        self.assertFalse(sequence_exists(get_sequence_name(Zaak, 2016)))
+
+    def test_without_sequence(self):
+        ZaakFactory.create(registratiedatum=date(2017, 1, 1))
+
+        identificaties = reserve_identificaties(Zaak, 2017, 2)
+
+        self.assertEqual(
+            identificaties, ["ZAAK-2017-0000000002", "ZAAK-2017-0000000003"]
+        )
+        # allocating numbers never creates the sequence
+        self.assertFalse(sequence_exists(get_sequence_name(Zaak, 2017)))
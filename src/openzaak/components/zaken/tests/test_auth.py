@@ -3,11 +3,14 @@
 """
 Guarantee that the proper authorization machinery is in place.
 """
+from unittest.mock import patch
+
 from django.test import override_settings, tag
 
 from mozilla_django_oidc_db.models import OpenIDConnectConfig
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
 from vng_api_common.constants import ComponentTypes, VertrouwelijkheidsAanduiding
 from vng_api_common.tests import AuthCheckMixin, reverse
 
@@ -18,13 +21,17 @@ from openzaak.components.catalogi.tests.factories import (
     EigenschapFactory,
     ZaakTypeFactory,
 )
+from openzaak.utils.permissions import get_permission_data
+from openzaak.utils.query import AuthorizationsFilterEngines
 from openzaak.utils.tests import JWTAuthMixin
 
+from ..api.permissions import ZaakAuthRequired
 from ..api.scopes import (
     SCOPE_ZAKEN_ALLES_LEZEN,
     SCOPE_ZAKEN_BIJWERKEN,
     SCOPE_ZAKEN_CREATE,
 )
+from ..api.serializers import ZaakSerializer
 from ..models import ZaakBesluit, ZaakInformatieObject
 from .factories import (
     ResultaatFactory,
@@ -190,8 +197,11 @@ class ZaakListPerformanceTests(JWTAuthMixin, APITestCase):
         BASE_NUM_QUERIES = 4
         # queries because of the permission checks
         PERMISSION_CHECK_NUM_QUERIES = 2
-        # queries because of the list endpoint itself
-        ENDPOINT_NUM_QUERIES = 8
+        # queries because of the list endpoint itself. This was 8 before the
+        # authorizations were re-used from the permission checks (one query less) and
+        # the current status and resultaat were annotated instead of prefetched (two
+        # queries less)
+        ENDPOINT_NUM_QUERIES = 8 - 1 - 2
         TOTAL_EXPECTED_QUERIES = (
             BASE_NUM_QUERIES + PERMISSION_CHECK_NUM_QUERIES + ENDPOINT_NUM_QUERIES
         )
@@ -976,3 +986,79 @@ class ExternalZaaktypeScopeTests(JWTAuthMixin, APITestCase):
 
         self.assertEqual(response1.status_code, status.HTTP_200_OK)
         self.assertEqual(response2.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class PermissionDataTests(JWTAuthMixin, APITestCase):
+    scopes = [SCOPE_ZAKEN_ALLES_LEZEN]
+    max_vertrouwelijkheidaanduiding = VertrouwelijkheidsAanduiding.openbaar
+    component = ComponentTypes.zrc
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.zaaktype = ZaakTypeFactory.create()
+        super().setUpTestData()
+
+    def test_object_permission_check_does_not_serialize_zaak(self):
+        status1 = StatusFactory.create(
+            zaak__zaaktype=self.zaaktype,
+            zaak__vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.openbaar,
+        )
+
+        with patch.object(ZaakSerializer, "to_representation") as m:
+            response = self.client.get(reverse(status1))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        m.assert_not_called()
+
+    def test_local_zaaktype(self):
+        zaak = ZaakFactory.create(
+            zaaktype=self.zaaktype,
+            vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.geheim,
+        )
+        request = Request(APIRequestFactory().get("/"))
+
+        data = get_permission_data(zaak, ZaakAuthRequired.permission_fields, request)
+
+        self.assertEqual(
+            data,
+            {
+                "zaaktype": f"http://testserver{reverse(self.zaaktype)}",
+                "vertrouwelijkheidaanduiding": VertrouwelijkheidsAanduiding.geheim,
+            },
+        )
+
+    def test_external_zaaktype_is_not_fetched(self):
+        zaaktype = "https://externe.catalogus.nl/api/v1/zaaktypen/1"
+        zaak = ZaakFactory.create(
+            zaaktype=zaaktype,
+            vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.openbaar,
+        )
+        request = Request(APIRequestFactory().get("/"))
+
+        with patch("openzaak.loaders.AuthorizedRequestsLoader.fetch_object") as m:
+            data = get_permission_data(
+                zaak, ZaakAuthRequired.permission_fields, request
+            )
+
+        m.assert_not_called()
+        self.assertEqual(data["zaaktype"], zaaktype)
+
+
+@override_settings(AUTORISATIES_FILTER_ENGINE=AuthorizationsFilterEngines.compiled)
+class ZaakReadCorrectScopeCompiledFilterTests(ZaakReadCorrectScopeTests):
+    pass
+
+
+@override_settings(AUTORISATIES_FILTER_ENGINE=AuthorizationsFilterEngines.compiled)
+class StatusReadCompiledFilterTests(StatusReadTests):
+    pass
+
+
+@override_settings(AUTORISATIES_FILTER_ENGINE=AuthorizationsFilterEngines.compiled)
+class ZaakInformatieObjectCompiledFilterTests(ZaakInformatieObjectTests):
+    pass
+
+
+@override_settings(AUTORISATIES_FILTER_ENGINE=AuthorizationsFilterEngines.compiled)
+class ExternalZaaktypeScopeCompiledFilterTests(ExternalZaaktypeScopeTests):
+    pass
@@ -0,0 +1,381 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+import json
+from datetime import date
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+from vng_api_common.constants import VertrouwelijkheidsAanduiding
+from vng_api_common.tests import reverse
+
+from openzaak.components.catalogi.tests.factories import ZaakTypeFactory
+from openzaak.utils.pagination import (
+    OptimizedPagination,
+    OptionalPagination,
+    build_keyset_filter,
+    get_ordering_value,
+)
+from openzaak.utils.streaming import StreamingJSONResponse
+from openzaak.utils.tests import ClearCachesMixin, JWTAuthMixin
+
+from ..api.scopes import SCOPE_ZAKEN_ALLES_LEZEN
+from ..models import Zaak, ZaakInformatieObject
+from .factories import ZaakEigenschapFactory, ZaakFactory, ZaakInformatieObjectFactory
+from .utils import ZAAK_READ_KWARGS, ZAAK_WRITE_KWARGS, get_operation_url
+
+
+@patch.object(OptimizedPagination, "page_size", 2)
+class ZaakCursorPaginationTests(JWTAuthMixin, APITestCase):
+    scopes = [SCOPE_ZAKEN_ALLES_LEZEN]
+    max_vertrouwelijkheidaanduiding = VertrouwelijkheidsAanduiding.openbaar
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.zaaktype = ZaakTypeFactory.create(concept=False)
+        super().setUpTestData()
+
+    def _create_zaak(self, **kwargs) -> Zaak:
+        kwargs.setdefault("zaaktype", self.zaaktype)
+        kwargs.setdefault(
+            "vertrouwelijkheidaanduiding", VertrouwelijkheidsAanduiding.openbaar
+        )
+        return ZaakFactory.create(**kwargs)
+
+    def _walk(self, params: dict) -> list:
+        """
+        Follow the next links and return the identificaties of all pages.
+        """
+        pages = []
+        response = self.client.get(reverse(Zaak), params, **ZAAK_READ_KWARGS)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+            data = response.json()
+            self.assertIsNone(data["count"])
+            self.assertIsNone(data["previous"])
+            pages.append([zaak["identificatie"] for zaak in data["results"]])
+
+            if not data["next"]:
+                return pages
+            self.assertNotIn("page=", data["next"])
+            response = self.client.get(data["next"], **ZAAK_READ_KWARGS)
+
+    def test_default_ordering(self):
+        for i in range(5):
+            self._create_zaak(identificatie=f"ZAAK-{i}")
+
+        pages = self._walk({"cursor": ""})
+
+        self.assertEqual(
+            pages, [["ZAAK-4", "ZAAK-3"], ["ZAAK-2", "ZAAK-1"], ["ZAAK-0"]]
+        )
+
+    def test_ordering_with_equal_sort_keys(self):
+        self._create_zaak(identificatie="ZAAK-3", startdatum=date(2022, 3, 1))
+        self._create_zaak(identificatie="ZAAK-1a", startdatum=date(2022, 1, 1))
+        self._create_zaak(identificatie="ZAAK-2", startdatum=date(2022, 2, 1))
+        self._create_zaak(identificatie="ZAAK-1b", startdatum=date(2022, 1, 1))
+
+        with self.subTest("ascending"):
+            pages = self._walk({"cursor": "", "ordering": "startdatum"})
+
+            self.assertEqual(pages, [["ZAAK-1a", "ZAAK-1b"], ["ZAAK-2", "ZAAK-3"]])
+
+        with self.subTest("descending"):
+            pages = self._walk({"cursor": "", "ordering": "-startdatum"})
+
+            self.assertEqual(pages, [["ZAAK-3", "ZAAK-2"], ["ZAAK-1a", "ZAAK-1b"]])
+
+    def test_filters_and_authorizations(self):
+        for i in range(3):
+            self._create_zaak(identificatie=f"ZAAK-{i}", bronorganisatie="517439943")
+        self._create_zaak(identificatie="OTHER-ORG", bronorganisatie="000000000")
+        self._create_zaak(
+            identificatie="CONFIDENTIAL",
+            bronorganisatie="517439943",
+            vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.geheim,
+        )
+        self._create_zaak(
+            identificatie="OTHER-ZAAKTYPE",
+            bronorganisatie="517439943",
+            zaaktype=ZaakTypeFactory.create(concept=False),
+        )
+
+        pages = self._walk({"cursor": "", "bronorganisatie": "517439943"})
+
+        self.assertEqual(pages, [["ZAAK-2", "ZAAK-1"], ["ZAAK-0"]])
+
+    def test_invalid_cursor(self):
+        self._create_zaak()
+
+        response = self.client.get(
+            reverse(Zaak), {"cursor": "not-a-cursor"}, **ZAAK_READ_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_number_pagination_unchanged(self):
+        for i in range(3):
+            self._create_zaak()
+
+        response = self.client.get(reverse(Zaak), {"page": 2}, **ZAAK_READ_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data["count"], 3)
+        self.assertEqual(len(data["results"]), 1)
+        self.assertIsNotNone(data["previous"])
+
+
+class KeysetFilterTests(TestCase):
+    def _walk(self, ordering: list) -> list:
+        """
+        Retrieve the zaken one by one with the keyset filter.
+        """
+        queryset = Zaak.objects.order_by(*ordering)
+        identificaties = []
+        zaak = queryset.first()
+        while zaak is not None:
+            identificaties.append(zaak.identificatie)
+            values = [get_ordering_value(zaak, lookup) for lookup in ordering]
+            zaak = queryset.filter(build_keyset_filter(Zaak, ordering, values)).first()
+        return identificaties
+
+    def test_null_sort_keys(self):
+        ZaakFactory.create(identificatie="ZAAK-NULL-1", einddatum=None)
+        ZaakFactory.create(identificatie="ZAAK-2", einddatum=date(2022, 2, 1))
+        ZaakFactory.create(identificatie="ZAAK-NULL-2", einddatum=None)
+        ZaakFactory.create(identificatie="ZAAK-1", einddatum=date(2022, 1, 1))
+
+        for ordering in (["einddatum", "pk"], ["-einddatum", "pk"]):
+            with self.subTest(ordering=ordering):
+                expected = list(
+                    Zaak.objects.order_by(*ordering).values_list(
+                        "identificatie", flat=True
+                    )
+                )
+
+                self.assertEqual(self._walk(ordering), expected)
+                self.assertEqual(len(expected), 4)
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "axes": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        "oidc": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        "autorisaties": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        "remote_objects": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    },
+)
+class ZaakPaginationCountTests(ClearCachesMixin, JWTAuthMixin, APITestCase):
+    heeft_alle_autorisaties = True
+
+    @override_settings(PAGINATION_COUNT_CACHE_TIMEOUT=60)
+    def test_cached_count(self):
+        ZaakFactory.create_batch(2, bronorganisatie="517439943")
+        url = reverse(Zaak)
+        params = {"bronorganisatie": "517439943"}
+
+        response = self.client.get(url, params, **ZAAK_READ_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["count"], 2)
+        self.assertNotIn("X-Count-Approximate", response)
+
+        ZaakFactory.create(bronorganisatie="517439943")
+
+        with self.subTest("same query"):
+            response = self.client.get(url, {**params, "page": 1}, **ZAAK_READ_KWARGS)
+
+            self.assertEqual(response.json()["count"], 2)
+            self.assertEqual(len(response.json()["results"]), 3)
+            self.assertEqual(response["X-Count-Approximate"], "true")
+
+        with self.subTest("other query"):
+            response = self.client.get(
+                url, {"bronorganisatie": "000000000"}, **ZAAK_READ_KWARGS
+            )
+
+            self.assertEqual(response.json()["count"], 0)
+            self.assertNotIn("X-Count-Approximate", response)
+
+    @override_settings(PAGINATION_COUNT_CACHE_TIMEOUT=60)
+    def test_pages_beyond_cached_count(self):
+        ZaakFactory.create_batch(2)
+        url = reverse(Zaak)
+        self.client.get(url, **ZAAK_READ_KWARGS)
+        ZaakFactory.create_batch(2)
+
+        with patch.object(OptimizedPagination, "page_size", 2):
+            first_page = self.client.get(url, **ZAAK_READ_KWARGS).json()
+            response = self.client.get(url, {"page": 2}, **ZAAK_READ_KWARGS)
+            last_page = self.client.get(url, {"page": 3}, **ZAAK_READ_KWARGS)
+
+        self.assertEqual(first_page["count"], 2)
+        self.assertIsNotNone(first_page["next"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(len(data["results"]), 2)
+        self.assertIsNone(data["next"])
+        self.assertIsNotNone(data["previous"])
+        self.assertEqual(last_page.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(PAGINATION_COUNT_ESTIMATE_THRESHOLD=1)
+    def test_estimated_count(self):
+        ZaakFactory.create_batch(3)
+
+        response = self.client.get(reverse(Zaak), **ZAAK_READ_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(response.json()["count"], int)
+        self.assertEqual(response["X-Count-Approximate"], "true")
+
+    @override_settings(PAGINATION_COUNT_ESTIMATE_THRESHOLD=1_000_000)
+    def test_count_below_estimate_threshold(self):
+        ZaakFactory.create_batch(3)
+
+        response = self.client.get(reverse(Zaak), **ZAAK_READ_KWARGS)
+
+        self.assertEqual(response.json()["count"], 3)
+        self.assertNotIn("X-Count-Approximate", response)
+
+
+@patch.object(OptimizedPagination, "page_size", 2)
+class ZaakStreamingListTests(JWTAuthMixin, APITestCase):
+    heeft_alle_autorisaties = True
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        ZaakFactory.create_batch(3)
+
+    def _get(self, params: dict):
+        response = self.client.get(reverse(Zaak), params, **ZAAK_READ_KWARGS)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_streamed_page_equals_regular_page(self):
+        for params in ({}, {"page": 2}, {"cursor": ""}):
+            with self.subTest(params=params):
+                expected = self._get(params)
+
+                with override_settings(STREAMING_RESPONSES=True), patch(
+                    "openzaak.utils.pagination.StreamingListMixin.stream_chunk_size", 1,
+                ):
+                    response = self._get(params)
+
+                self.assertTrue(response.streaming)
+                self.assertEqual(response["Content-Crs"], "EPSG:4326")
+                self.assertEqual(
+                    json.loads(b"".join(response.streaming_content)), expected.json()
+                )
+
+    @override_settings(STREAMING_RESPONSES=True)
+    def test_error_in_first_chunk(self):
+        with patch.object(
+            StreamingJSONResponse, "render_records", side_effect=ValueError("boom")
+        ):
+            response = self.client.get(reverse(Zaak), **ZAAK_READ_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertFalse(response.streaming)
+
+    @override_settings(STREAMING_RESPONSES=True)
+    @patch("openzaak.utils.pagination.StreamingListMixin.stream_chunk_size", 1)
+    def test_error_in_later_chunk(self):
+        render_records = StreamingJSONResponse.render_records
+        rendered = []
+
+        def fail_after_first_chunk(response, records):
+            if rendered:
+                raise ValueError("boom")
+            rendered.append(records)
+            return render_records(response, records)
+
+        with patch.object(
+            StreamingJSONResponse, "render_records", fail_after_first_chunk
+        ), self.assertLogs("openzaak.utils.streaming", "ERROR"):
+            response = self._get({})
+            content = b"".join(response.streaming_content)
+
+        self.assertTrue(response.streaming)
+        # the truncated body is not valid JSON
+        with self.assertRaises(ValueError):
+            json.loads(content)
+
+    @override_settings(STREAMING_RESPONSES=True)
+    def test_search_not_streamed(self):
+        url = get_operation_url("zaak__zoek")
+        data = {
+            "zaakgeometrie": {
+                "within": {
+                    "type": "Polygon",
+                    "coordinates": [[[0, 0], [0, 1], [1, 1], [1, 0], [0, 0]]],
+                }
+            }
+        }
+
+        response = self.client.post(url, data, **ZAAK_WRITE_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.streaming)
+
+
+@patch.object(OptionalPagination, "page_size", 2)
+class LargeCollectionTests(JWTAuthMixin, APITestCase):
+    heeft_alle_autorisaties = True
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.zaak = ZaakFactory.create()
+        ZaakInformatieObjectFactory.create_batch(3, zaak=cls.zaak)
+        ZaakEigenschapFactory.create_batch(3, zaak=cls.zaak)
+
+    def test_unpaginated_by_default(self):
+        response = self.client.get(reverse(ZaakInformatieObject))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.streaming)
+        self.assertEqual(len(response.json()), 3)
+
+    def test_opt_in_pagination(self):
+        url = reverse("zaakeigenschap-list", kwargs={"zaak_uuid": self.zaak.uuid})
+
+        for params in ({"page": 1}, {"cursor": ""}):
+            with self.subTest(params=params):
+                response = self.client.get(url, params)
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                data = response.json()
+                self.assertEqual(len(data["results"]), 2)
+                self.assertIsNotNone(data["next"])
+
+    @override_settings(STREAMING_RESPONSES=True)
+    def test_streamed(self):
+        expected = self.client.get(reverse(ZaakInformatieObject), {"page": 1}).json()
+
+        with patch(
+            "openzaak.utils.pagination.LargeCollectionMixin.stream_chunk_size", 2
+        ):
+            response = self.client.get(reverse(ZaakInformatieObject))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertIn("API-version", response)
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(len(data), 3)
+        self.assertEqual(data[:2], expected["results"])
+        self.assertIn("aardRelatieWeergave", data[0])
+
+    @override_settings(STREAMING_RESPONSES=True)
+    def test_streamed_empty(self):
+        zaak = ZaakFactory.create()
+        url = reverse("zaakeigenschap-list", kwargs={"zaak_uuid": zaak.uuid})
+
+        response = self.client.get(url)
+
+        self.assertEqual(json.loads(b"".join(response.streaming_content)), [])
@@ -0,0 +1,206 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+from unittest.mock import patch
+
+from django.test import override_settings
+
+import requests_mock
+from freezegun import freeze_time
+from rest_framework import status
+from rest_framework.test import APITestCase
+from vng_api_common.audittrails.models import AuditTrail
+from vng_api_common.constants import VertrouwelijkheidsAanduiding
+from vng_api_common.tests import reverse
+
+from openzaak.components.catalogi.tests.factories import ZaakTypeFactory
+from openzaak.notifications.tests import mock_oas_get
+from openzaak.notifications.tests.mixins import NotificationServiceMixin
+from openzaak.utils.tests import JWTAuthMixin
+
+from ..api.scopes import SCOPE_ZAKEN_CREATE
+from ..models import Zaak, ZaakKenmerk
+from .utils import ZAAK_WRITE_KWARGS
+
+
+def get_zaak_data(zaaktype, **overrides) -> dict:
+    return {
+        "zaaktype": f"http://testserver{reverse(zaaktype)}",
+        "vertrouwelijkheidaanduiding": VertrouwelijkheidsAanduiding.openbaar,
+        "bronorganisatie": "517439943",
+        "verantwoordelijkeOrganisatie": "517439943",
+        "registratiedatum": "2022-01-13",
+        "startdatum": "2022-01-13",
+        **overrides,
+    }
+
+
+class ZaakBulkCreateTests(JWTAuthMixin, APITestCase):
+    heeft_alle_autorisaties = True
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.zaaktype = ZaakTypeFactory.create(concept=False)
+        cls.url = reverse("zaak-_bulk")
+
+    def test_create_batch(self):
+        data = [
+            get_zaak_data(
+                self.zaaktype, kenmerken=[{"kenmerk": "kenmerk-1", "bron": "bron"}],
+            ),
+            get_zaak_data(self.zaaktype, identificatie="ZAAK-EXPLICIT"),
+            get_zaak_data(self.zaaktype, registratiedatum="2021-12-31"),
+        ]
+
+        response = self.client.post(self.url, data, **ZAAK_WRITE_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(
+            [zaak["identificatie"] for zaak in response.json()],
+            ["ZAAK-2022-0000000001", "ZAAK-EXPLICIT", "ZAAK-2021-0000000001"],
+        )
+        self.assertEqual(Zaak.objects.count(), 3)
+        kenmerk = ZaakKenmerk.objects.get()
+        self.assertEqual(kenmerk.zaak.identificatie, "ZAAK-2022-0000000001")
+        self.assertEqual(
+            response.json()[0]["kenmerken"], [{"kenmerk": "kenmerk-1", "bron": "bron"}]
+        )
+
+        audittrails = AuditTrail.objects.order_by("pk")
+        self.assertEqual(audittrails.count(), 3)
+        self.assertEqual(
+            [trail.resource_url for trail in audittrails],
+            [zaak["url"] for zaak in response.json()],
+        )
+        self.assertEqual(audittrails[0].actie, "create")
+        self.assertEqual(
+            audittrails[0].resource_weergave, "517439943 - ZAAK-2022-0000000001"
+        )
+
+    def test_identificaties_continue_numbering(self):
+        first = self.client.post(
+            self.url, [get_zaak_data(self.zaaktype)], **ZAAK_WRITE_KWARGS
+        )
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED, first.data)
+
+        response = self.client.post(
+            self.url, [get_zaak_data(self.zaaktype)] * 2, **ZAAK_WRITE_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(
+            [zaak["identificatie"] for zaak in response.json()],
+            ["ZAAK-2022-0000000002", "ZAAK-2022-0000000003"],
+        )
+
+    def test_invalid_item_creates_nothing(self):
+        data = [
+            get_zaak_data(self.zaaktype),
+            get_zaak_data(self.zaaktype, zaaktype="https://example.com/invalid"),
+        ]
+
+        response = self.client.post(self.url, data, **ZAAK_WRITE_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Zaak.objects.exists())
+        self.assertFalse(AuditTrail.objects.exists())
+
+    def test_duplicate_identificaties_in_batch(self):
+        data = [
+            get_zaak_data(self.zaaktype, identificatie="ZAAK-1"),
+            get_zaak_data(self.zaaktype, identificatie="ZAAK-1"),
+        ]
+
+        response = self.client.post(self.url, data, **ZAAK_WRITE_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Zaak.objects.exists())
+
+
+class ZaakBulkCreatePermissionTests(JWTAuthMixin, APITestCase):
+    scopes = [SCOPE_ZAKEN_CREATE]
+    max_vertrouwelijkheidaanduiding = VertrouwelijkheidsAanduiding.openbaar
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.zaaktype = ZaakTypeFactory.create(concept=False)
+        cls.url = reverse("zaak-_bulk")
+        super().setUpTestData()
+
+    def test_all_items_authorized(self):
+        data = [get_zaak_data(self.zaaktype), get_zaak_data(self.zaaktype)]
+
+        response = self.client.post(self.url, data, **ZAAK_WRITE_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+
+    def test_unauthorized_zaaktype(self):
+        data = [
+            get_zaak_data(self.zaaktype),
+            get_zaak_data(ZaakTypeFactory.create(concept=False)),
+        ]
+
+        response = self.client.post(self.url, data, **ZAAK_WRITE_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Zaak.objects.exists())
+
+    def test_unauthorized_vertrouwelijkheidaanduiding(self):
+        data = [
+            get_zaak_data(
+                self.zaaktype,
+                vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.geheim,
+            )
+        ]
+
+        response = self.client.post(self.url, data, **ZAAK_WRITE_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+@requests_mock.Mocker()
+@freeze_time("2022-01-14")
+@override_settings(NOTIFICATIONS_DISABLED=False, CMIS_ENABLED=False)
+class ZaakBulkCreateNotificationTests(
+    NotificationServiceMixin, JWTAuthMixin, APITestCase
+):
+    heeft_alle_autorisaties = True
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("zaak-_bulk")
+
+    @patch("zds_client.Client.from_url")
+    def test_notifications_sent_after_commit(self, m, mock_client):
+        mock_oas_get(m)
+        client = mock_client.return_value
+        zaaktype = ZaakTypeFactory.create(concept=False)
+        data = [get_zaak_data(zaaktype), get_zaak_data(zaaktype)]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data, **ZAAK_WRITE_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(client.create.call_count, 2)
+        for zaak, call in zip(response.json(), client.create.call_args_list):
+            self.assertEqual(
+                call[0],
+                (
+                    "notificaties",
+                    {
+                        "kanaal": "zaken",
+                        "hoofdObject": zaak["url"],
+                        "resource": "zaak",
+                        "resourceUrl": zaak["url"],
+                        "actie": "create",
+                        "aanmaakdatum": "2022-01-14T00:00:00Z",
+                        "kenmerken": {
+                            "bronorganisatie": "517439943",
+                            "zaaktype": zaak["zaaktype"],
+                            "vertrouwelijkheidaanduiding": (
+                                VertrouwelijkheidsAanduiding.openbaar
+                            ),
+                        },
+                    },
+                ),
+            )
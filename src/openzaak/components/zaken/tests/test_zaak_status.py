@@ -1,5 +1,9 @@
 # SPDX-License-Identifier: EUPL-1.2
 # Copyright (C) 2019 - 2020 Dimpact
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from rest_framework import status
@@ -8,7 +12,7 @@ from vng_api_common.tests import reverse
 
 from openzaak.utils.tests import JWTAuthMixin
 
-from .factories import StatusFactory, ZaakFactory
+from .factories import ResultaatFactory, StatusFactory, ZaakFactory
 from .utils import ZAAK_READ_KWARGS
 
 
@@ -32,3 +36,36 @@ class ZaakStatusTests(JWTAuthMixin, APITestCase):
         data = response.json()
 
         self.assertEqual(data["status"], f"http://testserver{status_last_url}")
+
+    def test_list_zaken_current_status_and_resultaat(self):
+        now = timezone.now()
+        zaak1, zaak2 = ZaakFactory.create_batch(2)
+        # created out of order, the latest datum_status_gezet is the current status
+        status_last = StatusFactory.create(datum_status_gezet=now, zaak=zaak1)
+        StatusFactory.create(datum_status_gezet=now - timedelta(days=1), zaak=zaak1)
+        resultaat = ResultaatFactory.create(zaak=zaak1)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("zaak-list"), **ZAAK_READ_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # selected in the query of the zaken
+        for table in ("zaken_status", "zaken_resultaat"):
+            with self.subTest(table=table):
+                self.assertFalse(
+                    any(
+                        query["sql"].startswith(f'SELECT "{table}".')
+                        for query in context.captured_queries
+                    )
+                )
+        data = {zaak["url"]: zaak for zaak in response.json()["results"]}
+        zaak1_data = data[f"http://testserver{reverse(zaak1)}"]
+        zaak2_data = data[f"http://testserver{reverse(zaak2)}"]
+        self.assertEqual(
+            zaak1_data["status"], f"http://testserver{reverse(status_last)}"
+        )
+        self.assertEqual(
+            zaak1_data["resultaat"], f"http://testserver{reverse(resultaat)}"
+        )
+        self.assertIsNone(zaak2_data["status"])
+        self.assertIsNone(zaak2_data["resultaat"])
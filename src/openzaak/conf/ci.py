@@ -20,6 +20,11 @@ CACHES = {
     # See: https://github.com/jazzband/django-axes/blob/master/docs/configuration.rst#cache-problems
     "axes": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
     "oidc": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    # test cases roll back the database without firing signals, a process-wide cache
+    # would leak authorizations between tests
+    "autorisaties": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    "remote_objects": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    "cmis_documents": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
 }
 
 LOGGING = LOGGING_SETTINGS  # Minimally required logging is nice
@@ -71,6 +71,9 @@ CACHES = {
     "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
     "axes": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
     "oidc": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "autorisaties": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "remote_objects": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "cmis_documents": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
 }
 
 REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] += (
@@ -99,6 +99,30 @@ CACHES = {
             "IGNORE_EXCEPTIONS": True,
         },
     },
+    "autorisaties": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": f"redis://{config('CACHE_AUTORISATIES', 'localhost:6379/0')}",
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "IGNORE_EXCEPTIONS": True,
+        },
+    },
+    "remote_objects": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": f"redis://{config('CACHE_REMOTE_OBJECTS', 'localhost:6379/0')}",
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "IGNORE_EXCEPTIONS": True,
+        },
+    },
+    "cmis_documents": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": f"redis://{config('CACHE_CMIS_DOCUMENTS', 'localhost:6379/0')}",
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "IGNORE_EXCEPTIONS": True,
+        },
+    },
 }
 
 #
@@ -570,6 +594,11 @@ PRIVATE_MEDIA_URL = "/private-media/"
 SENDFILE_BACKEND = config("SENDFILE_BACKEND", "django_sendfile.backends.nginx")
 SENDFILE_ROOT = PRIVATE_MEDIA_ROOT
 SENDFILE_URL = PRIVATE_MEDIA_URL
+# Redirect downloads to a signed URL that is valid for this many seconds, and which is
+# served by the reverse proxy. Disabled when 0.
+DOWNLOAD_REDIRECT_EXPIRY = config("DOWNLOAD_REDIRECT_EXPIRY", default=0)
+# internal location of the reverse proxy that forwards to the DMS
+CMIS_CONTENT_REDIRECT_URL = config("CMIS_CONTENT_REDIRECT_URL", default="/dms-content/")
 
 #
 # DJANGO-LOOSE-FK -- handle internal and external API resources
@@ -620,6 +649,9 @@ MOZILLA_DJANGO_OIDC_DB_CACHE_TIMEOUT = 5 * 60
 OPENZAAK_API_CONTACT_EMAIL = "support@maykinmedia.nl"
 OPENZAAK_API_CONTACT_URL = "https://www.maykinmedia.nl"
 STORE_FAILED_NOTIFS = True
+# Store notifications in the outbox, to be sent by the process_notification_outbox
+# worker, see openzaak.notifications.outbox
+NOTIFICATIONS_OUTBOX = config("NOTIFICATIONS_OUTBOX", default=False)
 
 # Expiry time in seconds for JWT
 JWT_EXPIRY = config("JWT_EXPIRY", default=3600)
@@ -628,10 +660,44 @@ JWT_LEEWAY = config("JWT_LEEWAY", default=0)
 
 CUSTOM_CLIENT_FETCHER = "openzaak.utils.auth.get_client"
 
+# Cross-request cache of the Applicaties/Autorisaties per client ID, refers to the
+# CACHES setting. Entries are invalidated on change, the timeout is a safety net.
+AUTORISATIES_CACHE = "autorisaties"
+AUTORISATIES_CACHE_TIMEOUT = config("AUTORISATIES_CACHE_TIMEOUT", default=60 * 60)
+# How list endpoints are filtered on the authorizations, see
+# openzaak.utils.query.AuthorizationsFilterEngines
+AUTORISATIES_FILTER_ENGINE = config("AUTORISATIES_FILTER_ENGINE", default="case")
+
+# Counts of paginated list endpoints, see openzaak.utils.pagination. The timeout (in
+# seconds) and threshold (in records) disable the caching/estimates when 0.
+PAGINATION_COUNT_CACHE = "default"
+PAGINATION_COUNT_CACHE_TIMEOUT = config("PAGINATION_COUNT_CACHE_TIMEOUT", default=0)
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = config(
+    "PAGINATION_COUNT_ESTIMATE_THRESHOLD", default=0
+)
+
+# Serialize and render the list responses per chunk of records in a streaming
+# response, see openzaak.utils.streaming
+STREAMING_RESPONSES = config("STREAMING_RESPONSES", default=False)
+
+# Cache of the objects fetched from external APIs, see openzaak.loaders. The timeouts
+# are in seconds, the cache is disabled when 0. Errors are cached with the negative
+# timeout.
+REMOTE_OBJECTS_CACHE = "remote_objects"
+REMOTE_OBJECTS_CACHE_TIMEOUT = config("REMOTE_OBJECTS_CACHE_TIMEOUT", default=0)
+REMOTE_OBJECTS_NEGATIVE_CACHE_TIMEOUT = config(
+    "REMOTE_OBJECTS_NEGATIVE_CACHE_TIMEOUT", default=0
+)
+
 CMIS_ENABLED = config("CMIS_ENABLED", default=False)
 CMIS_MAPPER_FILE = config(
     "CMIS_MAPPER_FILE", default=os.path.join(BASE_DIR, "config", "cmis_mapper.json")
 )
 CMIS_URL_MAPPING_ENABLED = config("CMIS_URL_MAPPING_ENABLED", default=False)
+# Cache of the documents retrieved from the DMS, shared between requests, see
+# openzaak.components.documenten.query.cache. The timeout is in seconds, the shared
+# cache is disabled when 0.
+CMIS_DOCUMENTS_CACHE = "cmis_documents"
+CMIS_DOCUMENTS_CACHE_TIMEOUT = config("CMIS_DOCUMENTS_CACHE_TIMEOUT", default=0)
 
 VNG_COMPONENTS_BRANCH = "stable/1.0.x"
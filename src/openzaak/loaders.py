@@ -1,85 +1,295 @@
 # SPDX-License-Identifier: EUPL-1.2
 # Copyright (C) 2019 - 2020 Dimpact
+import copy
+import hashlib
 import json
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from functools import lru_cache
 from inspect import getmembers
-from typing import Any, Dict
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
 
+from django.conf import settings
+from django.core.cache import caches
 from django.db import models
 from django.db.models.base import ModelBase
 
 import requests
+from django_loose_fk.fields import FkOrURLField
 from django_loose_fk.loaders import BaseLoader, FetchError, FetchJsonError
 from django_loose_fk.virtual_models import virtual_model_factory
 from djangorestframework_camel_case.util import underscoreize
 from vng_api_common.descriptors import GegevensGroepType
+from zgw_consumers.concurrent import parallel
 
+# cached objects with an ETag are kept this long after they expire, to revalidate them
+ETAG_RETENTION = 24 * 60 * 60
 
-class AuthorizedRequestsLoader(BaseLoader):
+_sessions: Dict[Optional[int], requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+_pending_fetches: Dict[str, Future] = {}
+_pending_fetches_lock = threading.Lock()
+
+# remote objects prefetched for the current request, see :func:`prefetch_remote_objects`
+_prefetched = threading.local()
+
+PREFETCH_WORKERS = 10
+
+
+def get_session(service) -> requests.Session:
     """
-    Fetch external API objects with Authorization header.
+    Get the session of the service, which keeps the connections to it open.
     """
+    key = service.pk if service else None
+    with _sessions_lock:
+        if key not in _sessions:
+            _sessions[key] = requests.Session()
+        return _sessions[key]
 
-    @staticmethod
-    def fetch_object(url: str, do_underscoreize=True) -> dict:
-        from zgw_consumers.models import Service
 
-        # TODO should we replace it with Service.get_client() and use it instead of requests?
-        # but in this case we couldn't catch separate FetchJsonError
-        client_auth_header = Service.get_auth_header(url)
-        headers = client_auth_header or {}
+def _get_cache_key(url: str) -> str:
+    return f"remote_object:{hashlib.md5(url.encode('utf-8')).hexdigest()}"
+
+
+def _request_json(url: str, cached: Optional[dict], service) -> Any:
+    """
+    Retrieve the JSON of the remote object, and cache the result.
+
+    A cached object that expired is revalidated with its ETag.
+    """
+    cache = caches[settings.REMOTE_OBJECTS_CACHE]
+    timeout = settings.REMOTE_OBJECTS_CACHE_TIMEOUT
+    negative_timeout = settings.REMOTE_OBJECTS_NEGATIVE_CACHE_TIMEOUT
+
+    headers = dict(service.build_client().auth_header) if service else {}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+
+    try:
+        response = get_session(service).get(url, headers=headers)
+    except requests.exceptions.RequestException as exc:
+        raise FetchError(exc.args[0]) from exc
+
+    if cached and response.status_code == requests.codes.not_modified:
+        cached["expires"] = time.time() + timeout
+        cache.set(_get_cache_key(url), cached, timeout=timeout + ETAG_RETENTION)
+        return cached["data"]
 
-        try:
-            response = requests.get(url, headers=headers)
-        except requests.exceptions.RequestException as exc:
-            raise FetchError(exc.args[0]) from exc
+    try:
+        response.raise_for_status()
+    except requests.HTTPError as exc:
+        if negative_timeout and 400 <= response.status_code < 500:
+            entry = {"error": exc.args[0], "expires": time.time() + negative_timeout}
+            cache.set(_get_cache_key(url), entry, timeout=negative_timeout)
+        raise FetchError(exc.args[0]) from exc
 
-        try:
-            response.raise_for_status()
-        except requests.HTTPError as exc:
-            raise FetchError(exc.args[0]) from exc
+    try:
+        data = response.json()
+    except json.JSONDecodeError as exc:
+        raise FetchJsonError(exc.args[0]) from exc
 
-        try:
-            data = response.json()
-        except json.JSONDecodeError as exc:
-            raise FetchJsonError(exc.args[0]) from exc
+    if timeout:
+        etag = response.headers.get("ETag")
+        entry = {"data": data, "etag": etag, "expires": time.time() + timeout}
+        cache_timeout = timeout + ETAG_RETENTION if etag else timeout
+        cache.set(_get_cache_key(url), entry, timeout=cache_timeout)
+    return data
 
+
+def fetch_json(url: str, service=None) -> Any:
+    """
+    Fetch the JSON of a remote object, from the cache if possible.
+
+    Concurrent fetches of the same URL in this process wait for a single request.
+    The returned data is shared and must not be modified.
+
+    The service of the URL is looked up if it's not given.
+    """
+    prefetched = getattr(_prefetched, "objects", None)
+    if prefetched is not None and url in prefetched:
+        result = prefetched[url]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    cached = None
+    if settings.REMOTE_OBJECTS_CACHE_TIMEOUT or (
+        settings.REMOTE_OBJECTS_NEGATIVE_CACHE_TIMEOUT
+    ):
+        cached = caches[settings.REMOTE_OBJECTS_CACHE].get(_get_cache_key(url))
+        if cached and cached["expires"] > time.time():
+            if "error" in cached:
+                raise FetchError(cached["error"])
+            return cached["data"]
+        if cached and "error" in cached:
+            cached = None
+
+    with _pending_fetches_lock:
+        future = _pending_fetches.get(url)
+        is_fetching = future is None
+        if is_fetching:
+            future = _pending_fetches[url] = Future()
+
+    if not is_fetching:
+        return future.result()
+
+    try:
+        if service is None:
+            from zgw_consumers.models import Service
+
+            service = Service.get_service(url)
+
+        data = _request_json(url, cached, service)
+    except Exception as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(data)
+        return data
+    finally:
+        with _pending_fetches_lock:
+            del _pending_fetches[url]
+
+
+@contextmanager
+def prefetch_scope():
+    """
+    Keep the remote objects prefetched within the block, for the current thread.
+
+    Outside of a prefetch scope, :func:`prefetch_remote_objects` does nothing.
+    """
+    previous = getattr(_prefetched, "objects", None)
+    previous_instances = getattr(_prefetched, "instances", None)
+    _prefetched.objects, _prefetched.instances = {}, {}
+    try:
+        yield
+    finally:
+        _prefetched.objects, _prefetched.instances = previous, previous_instances
+
+
+@lru_cache(maxsize=None)
+def _get_remote_fields(model: ModelBase) -> Tuple[FkOrURLField, ...]:
+    return tuple(
+        field
+        for field in model._meta.get_fields()
+        if isinstance(field, FkOrURLField)
+        and isinstance(field.loader, AuthorizedRequestsLoader)
+    )
+
+
+def _fetch_prefetched(url: str, service) -> Any:
+    try:
+        return fetch_json(url, service)
+    except Exception as exc:
+        return exc
+
+
+def prefetch_remote_objects(instances: Iterable[models.Model]) -> None:
+    """
+    Fetch the remote objects that the instances refer to, concurrently.
+
+    The distinct remote URLs of the loose-fk fields are fetched in a thread pool, so
+    that serializing a page of objects waits for the slowest remote object instead of
+    the sum of all of them. Errors are raised again when the remote object is loaded.
+    """
+    from zgw_consumers.models import Service
+
+    prefetched = getattr(_prefetched, "objects", None)
+    if prefetched is None:
+        return
+
+    urls = set()
+    for instance in instances:
+        for field in _get_remote_fields(type(instance)):
+            url = getattr(instance, field._url_field.attname)
+            if url and url not in prefetched and not field.loader.is_local_url(url):
+                urls.add(url)
+
+    if not urls:
+        return
+
+    # look up the services here, the pool threads use their own database connections
+    services = {url: Service.get_service(url) for url in urls}
+    with parallel(max_workers=min(PREFETCH_WORKERS, len(urls))) as executor:
+        results = executor.map(_fetch_prefetched, services.keys(), services.values())
+        prefetched.update(zip(services.keys(), results))
+
+
+class AuthorizedRequestsLoader(BaseLoader):
+    """
+    Fetch external API objects with Authorization header.
+
+    The connections are pooled per service and the objects are cached, see
+    :func:`fetch_json`.
+    """
+
+    @staticmethod
+    def fetch_object(url: str, do_underscoreize=True) -> dict:
+        data = fetch_json(url)
         if not do_underscoreize:
-            return data
+            return copy.deepcopy(data)
 
         return underscoreize(data)
 
     def load(self, url: str, model: ModelBase) -> models.Model:
         if self.is_local_url(url):
-            # print(url)
-            # assert False, "Stopped here"
             return self.load_local_object(url, model)
 
+        # the virtual models are reused within a prefetch scope
+        instances = getattr(_prefetched, "instances", None)
+        if instances is not None and (url, model) in instances:
+            return instances[(url, model)]
+
         data = self.fetch_object(url)
-        return get_model_instance_with_gegevensgroeps(model, data, loader=self)
+        instance = get_model_instance_with_gegevensgroeps(model, data, loader=self)
+        if instances is not None:
+            instances[(url, model)] = instance
+        return instance
+
+
+@lru_cache(maxsize=None)
+def get_model_field_names(model: ModelBase) -> FrozenSet[str]:
+    """
+    Get the names of the fields that a virtual model of the model accepts.
+    """
+    return frozenset(
+        [field.name for field in model._meta.get_fields() if not field.auto_created]
+        + ["url"]
+    )
+
+
+@lru_cache(maxsize=None)
+def get_gegevensgroep_mappings(model: ModelBase) -> Dict[str, Dict[str, str]]:
+    """
+    Map the keys of the gegevensgroepen of the model to the names of the model fields.
+    """
+    return {
+        name: {key: field.name for key, field in gegevensgroep.mapping.items()}
+        for name, gegevensgroep in getmembers(model)
+        if isinstance(gegevensgroep, GegevensGroepType)
+    }
 
 
 def get_model_instance_with_gegevensgroeps(
     model: ModelBase, data: Dict[str, Any], loader
 ) -> models.Model:
-    field_names = [
-        field.name for field in model._meta.get_fields() if not field.auto_created
-    ] + ["url"]
+    field_names = get_model_field_names(model)
     initial_data = data.copy()
 
     # modify data to include gegevensgroeps members
-    gegevensgroeps = [
-        (a, b) for a, b in getmembers(model) if isinstance(b, GegevensGroepType)
-    ]
-    for gegevensgroep__name, gegevensgroep in gegevensgroeps:
+    for gegevensgroep__name, mapping in get_gegevensgroep_mappings(model).items():
         if gegevensgroep__name in data:
             group_data = data.pop(gegevensgroep__name)
 
             for field, field_value in group_data.items():
-                field_name = gegevensgroep.mapping[field].name
-                data[field_name] = field_value
+                data[mapping[field]] = field_value
 
     # only keep known fields
     data = {key: value for key, value in data.items() if key in field_names}
 
+    # the virtual model classes are cached per model and loader
     virtual_model = virtual_model_factory(model, loader=loader)
     return virtual_model(initial_data=initial_data, **data)
@@ -0,0 +1,40 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+from django.core.management import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import ugettext_lazy as _
+
+from openzaak.utils.identificatie import sync_sequences
+
+
+class Command(BaseCommand):
+    help = _(
+        "Create the sequences of the generated identificaties and seed them from the "
+        "existing identificaties. Run this after migrating the database, and before "
+        "every new year."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--year",
+            type=int,
+            action="append",
+            dest="years",
+            help=_(
+                "Sync the sequences of this year. Can be repeated. Defaults to the "
+                "years of the existing objects and the current and next year."
+            ),
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help=_("The database to sync the sequences of."),
+        )
+
+    def handle(self, *args, **options):
+        names = sync_sequences(years=options["years"], using=options["database"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                _("Synced {count} identificatie sequence(s).").format(count=len(names))
+            )
+        )
@@ -1,37 +1,31 @@
 # SPDX-License-Identifier: EUPL-1.2
 # Copyright (C) 2020 Dimpact
-import logging
-
-from django.contrib import admin
-from django.db import transaction
+from django.contrib import admin, messages
 from django.db.models import QuerySet
 from django.http import HttpRequest
 from django.urls import reverse
 from django.utils.html import format_html
 from django.utils.translation import ugettext_lazy as _
 
-from .models import FailedNotification
-from .resend import ResendFailure, resend_notification
-
-logger = logging.getLogger(__name__)
+from .models import FailedNotification, OutboxNotification
+from .resend import resend_notifications as _resend_notifications
 
 
 def resend_notifications(
     modeladmin: admin.ModelAdmin, request: HttpRequest, queryset: QuerySet
 ) -> None:
-    for failed in queryset:
-        if failed.retried_at is not None:
-            logger.info("Not resending already re-sent notification %d", failed.pk)
-            continue
+    try:
+        sent, failed = _resend_notifications(queryset)
+    except RuntimeError as exc:
+        modeladmin.message_user(request, str(exc), level=messages.ERROR)
+        return
 
-        with transaction.atomic():
-            try:
-                resend_notification(failed)
-            except ResendFailure:
-                continue
-            except Exception:
-                logger.exception("Resend for %d failed", failed.pk)
-                continue
+    modeladmin.message_user(
+        request,
+        _("Resent {sent} notifications, {failed} failed again.").format(
+            sent=sent, failed=failed
+        ),
+    )
 
 
 resend_notifications.short_description = _("Resend %(verbose_name_plural)s")
@@ -56,3 +50,28 @@ class FailedNotificationAdmin(admin.ModelAdmin):
             "admin:django_db_logger_statuslog_change", args=(obj.statuslog_ptr_id,)
         )
         return format_html('<a href="{href}">Log entry</a>', href=href)
+
+
+@admin.register(OutboxNotification)
+class OutboxNotificationAdmin(admin.ModelAdmin):
+    list_display = (
+        "kanaal",
+        "main_object",
+        "actie",
+        "created_at",
+        "attempts",
+        "next_attempt_at",
+    )
+    list_filter = ("attempts",)
+    date_hierarchy = "created_at"
+    search_fields = ("main_object",)
+    readonly_fields = ("main_object", "message", "status_code", "last_error")
+
+    def kanaal(self, obj) -> str:
+        return obj.message["kanaal"]
+
+    def actie(self, obj) -> str:
+        return obj.message["actie"]
+
+    def has_add_permission(self, request) -> bool:
+        return False
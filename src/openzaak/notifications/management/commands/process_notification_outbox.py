@@ -0,0 +1,117 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+import time
+
+from django.core.management import BaseCommand, CommandError
+from django.db import connection
+from django.utils.translation import ugettext_lazy as _
+
+from ...outbox import NotificationSender, OutboxWorker, get_outbox_stats
+
+LOCK_NAME = "notifications_outbox_worker"
+
+
+class Command(BaseCommand):
+    help = _("Send the notifications in the outbox to the Notifications API.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help=_("Stop when the outbox contains no notifications that are due."),
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help=_("Report the number of notifications in the outbox and exit."),
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=10,
+            help=_("Number of notifications sent concurrently."),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help=_("Number of notifications retrieved from the outbox at once."),
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1,
+            help=_("Seconds to wait when there are no notifications to send."),
+        )
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=10,
+            help=_("Attempts before a notification is stored as failed notification."),
+        )
+        parser.add_argument(
+            "--backoff",
+            type=float,
+            default=5,
+            help=_("Seconds before the first retry, doubled for every next retry."),
+        )
+        parser.add_argument(
+            "--max-backoff",
+            type=float,
+            default=60 * 60,
+            help=_("Maximum number of seconds between retries."),
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options["verbosity"]
+        if options["stats"]:
+            self.report_stats()
+            return
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_lock(hashtext(%s))", [LOCK_NAME])
+            if not cursor.fetchone()[0]:
+                raise CommandError(_("Another outbox worker is running."))
+
+        sender = NotificationSender(pool_size=options["workers"])
+        worker = OutboxWorker(
+            sender,
+            workers=options["workers"],
+            batch_size=options["batch_size"],
+            max_attempts=options["max_attempts"],
+            backoff=options["backoff"],
+            max_backoff=options["max_backoff"],
+        )
+        try:
+            self.run(worker, once=options["once"], interval=options["poll_interval"])
+        finally:
+            sender.close()
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(hashtext(%s))", [LOCK_NAME])
+
+    def run(self, worker: OutboxWorker, once: bool, interval: float) -> None:
+        while True:
+            start = time.perf_counter()
+            sent, failed = worker.process_batch()
+            if sent or failed:
+                duration = time.perf_counter() - start
+                self.stdout.write(
+                    f"sent: {sent}, failed: {failed}, "
+                    f"rate: {(sent + failed) / max(duration, 0.001):.1f}/s"
+                )
+                if self.verbosity > 1:
+                    self.report_stats()
+                continue
+
+            if once:
+                break
+            time.sleep(interval)
+
+    def report_stats(self) -> None:
+        stats = get_outbox_stats()
+        oldest_age = stats["oldest_age"]
+        self.stdout.write(
+            f"pending: {stats['pending']}, due: {stats['due']}, "
+            f"retrying: {stats['retrying']}, oldest: "
+            + ("-" if oldest_age is None else f"{oldest_age:.0f}s")
+        )
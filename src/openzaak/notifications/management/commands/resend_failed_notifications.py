@@ -0,0 +1,64 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+import time
+
+from django.core.management import BaseCommand, CommandError
+from django.utils.translation import ugettext_lazy as _
+
+from ...models import FailedNotification
+from ...resend import resend_notifications
+
+
+class Command(BaseCommand):
+    help = _(
+        "Resend the failed notifications that were not retried yet. Notifications "
+        "that fail again are stored as new failed notifications."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--kanaal", help=_("Only resend the notifications of this kanaal."),
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=10,
+            help=_("Number of notifications sent concurrently."),
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help=_("Number of failed notifications retrieved at once."),
+        )
+
+    def handle(self, *args, **options):
+        queryset = FailedNotification.objects.all()
+        if options["kanaal"]:
+            queryset = queryset.filter(message__kanaal=options["kanaal"])
+
+        start = time.perf_counter()
+
+        def progress(sent: int, failed: int) -> None:
+            duration = max(time.perf_counter() - start, 0.001)
+            self.stdout.write(
+                f"sent: {sent}, failed: {failed}, "
+                f"rate: {(sent + failed) / duration:.1f}/s"
+            )
+
+        try:
+            sent, failed = resend_notifications(
+                queryset,
+                workers=options["workers"],
+                chunk_size=options["chunk_size"],
+                progress=progress,
+            )
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Resent {sent} notifications, {failed} failed again in "
+                f"{time.perf_counter() - start:.1f}s."
+            )
+        )
@@ -0,0 +1,82 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+# Generated by Django 3.2.13 on 2022-05-02 10:12
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications_log", "0003_alter_failednotification_message"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxNotification",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "main_object",
+                    models.URLField(
+                        db_index=True,
+                        help_text="URL of the main object of the notification. The notifications of a main object are sent in order.",
+                        max_length=1000,
+                        verbose_name="main object",
+                    ),
+                ),
+                (
+                    "message",
+                    models.JSONField(
+                        help_text="Content of the notification.",
+                        verbose_name="notification message",
+                    ),
+                ),
+                (
+                    "status_code",
+                    models.IntegerField(
+                        help_text="Status code of the response of the request causing the change.",
+                        verbose_name="status_code",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="created at"),
+                ),
+                (
+                    "attempts",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Number of failed attempts to send.",
+                        verbose_name="attempts",
+                    ),
+                ),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(
+                        db_index=True,
+                        default=django.utils.timezone.now,
+                        verbose_name="next attempt at",
+                    ),
+                ),
+                (
+                    "last_error",
+                    models.TextField(blank=True, verbose_name="last error"),
+                ),
+            ],
+            options={
+                "verbose_name": "outbox notification",
+                "verbose_name_plural": "outbox notifications",
+                "ordering": ("pk",),
+            },
+        ),
+    ]
@@ -1,6 +1,7 @@
 # SPDX-License-Identifier: EUPL-1.2
 # Copyright (C) 2020 Dimpact
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
 from django_db_logger.models import StatusLog
@@ -37,3 +38,45 @@ class FailedNotification(StatusLog):
     @property
     def retried(self) -> bool:
         return self.retried_at is not None
+
+
+class OutboxNotification(models.Model):
+    """
+    Notification waiting to be sent to the Notifications API.
+
+    The notifications are stored in the same transaction as the change they
+    announce, and are sent by the ``process_notification_outbox`` worker.
+    """
+
+    main_object = models.URLField(
+        _("main object"),
+        max_length=1000,
+        db_index=True,
+        help_text=_(
+            "URL of the main object of the notification. The notifications of a "
+            "main object are sent in order."
+        ),
+    )
+    message = models.JSONField(
+        _("notification message"), help_text=_("Content of the notification."),
+    )
+    status_code = models.IntegerField(
+        _("status_code"),
+        help_text=_("Status code of the response of the request causing the change."),
+    )
+    created_at = models.DateTimeField(_("created at"), auto_now_add=True)
+    attempts = models.PositiveIntegerField(
+        _("attempts"), default=0, help_text=_("Number of failed attempts to send."),
+    )
+    next_attempt_at = models.DateTimeField(
+        _("next attempt at"), default=timezone.now, db_index=True,
+    )
+    last_error = models.TextField(_("last error"), blank=True)
+
+    class Meta:
+        verbose_name = _("outbox notification")
+        verbose_name_plural = _("outbox notifications")
+        ordering = ("pk",)
+
+    def __str__(self):
+        return f"{self.message['kanaal']} - {self.message['resourceUrl']}"
@@ -0,0 +1,245 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+"""
+Send notifications through an outbox table.
+
+With ``settings.NOTIFICATIONS_OUTBOX`` enabled, the API writes the notifications to
+:class:`openzaak.notifications.models.OutboxNotification` in the same transaction as
+the change they announce, rather than sending them to the Notifications API when the
+transaction is committed. A slow or unavailable Notifications API then no longer
+affects the API responses, and no notification is lost when the process stops.
+
+The ``process_notification_outbox`` management command drains the outbox with the
+:class:`OutboxWorker`.
+"""
+import logging
+from collections import OrderedDict
+from concurrent import futures
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+from django.db.models import Exists, Min, OuterRef
+from django.utils import timezone
+
+import requests
+from requests.adapters import HTTPAdapter
+from vng_api_common.notifications.models import NotificationsConfig
+
+from .models import OutboxNotification
+
+logger = logging.getLogger(__name__)
+
+notifs_logger = logging.getLogger("vng_api_common.notifications.viewsets")
+
+
+def build_outbox_notification(message: dict, status_code: int) -> OutboxNotification:
+    return OutboxNotification(
+        main_object=message["hoofdObject"], message=message, status_code=status_code,
+    )
+
+
+def queue_notification(message: dict, status_code: int) -> OutboxNotification:
+    """
+    Store the notification in the outbox, in the current transaction.
+    """
+    notification = build_outbox_notification(message, status_code)
+    notification.save()
+    return notification
+
+
+def get_outbox_stats() -> Dict[str, Optional[float]]:
+    """
+    Report the depth of the outbox queue.
+
+    ``pending`` is the total number of notifications, ``due`` the number that can be
+    sent now and ``retrying`` the number that failed before. ``oldest_age`` is the age
+    of the oldest notification in seconds.
+    """
+    now = timezone.now()
+    queryset = OutboxNotification.objects.all()
+    oldest = queryset.aggregate(oldest=Min("created_at"))["oldest"]
+    return {
+        "pending": queryset.count(),
+        "due": queryset.filter(next_attempt_at__lte=now).count(),
+        "retrying": queryset.filter(attempts__gt=0).count(),
+        "oldest_age": (now - oldest).total_seconds() if oldest else None,
+    }
+
+
+class NotificationSender:
+    """
+    Send notifications to the configured Notifications API with a pooled session.
+
+    The connections to the Notifications API are kept alive and reused, up to
+    ``pool_size`` concurrent connections.
+    """
+
+    timeout = 10
+
+    def __init__(self, pool_size: int = 10):
+        self.client = NotificationsConfig.get_client()
+        if self.client is None:
+            raise RuntimeError("Could not build a client for Notifications API")
+
+        self.url = urljoin(self.client.base_url, "notificaties")
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        server_certificate = getattr(self.client, "server_certificate_path", None)
+        if server_certificate:
+            self.session.verify = server_certificate
+        client_certificate = getattr(self.client, "client_certificate_path", None)
+        if client_certificate:
+            private_key = getattr(self.client, "client_private_key_path", None)
+            self.session.cert = (
+                (client_certificate, private_key) if private_key else client_certificate
+            )
+
+    def send(self, message: dict) -> Optional[str]:
+        """
+        Send the message and return the error, if it failed.
+        """
+        try:
+            response = self.session.post(
+                self.url,
+                json=message,
+                headers=self.client.auth_header,
+                timeout=self.timeout,
+            )
+        except requests.RequestException as exc:
+            return str(exc) or exc.__class__.__name__
+
+        if not 200 <= response.status_code < 300:
+            return f"{response.status_code}: {response.text[:1000]}"
+        return None
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class OutboxWorker:
+    """
+    Send the notifications in the outbox in batches.
+
+    The notifications of a main object are sent one after the other, in the order
+    they were created. Notifications of different main objects are sent concurrently.
+    When sending fails, the next attempt is delayed with an exponential backoff and
+    the later notifications of the main object wait for it. After ``max_attempts``
+    the notification is stored as failed notification, from where it can be resent
+    manually.
+
+    Only one worker may process the outbox at a time.
+    """
+
+    def __init__(
+        self,
+        sender: NotificationSender,
+        workers: int = 10,
+        batch_size: int = 100,
+        max_attempts: int = 10,
+        backoff: float = 5,
+        max_backoff: float = 60 * 60,
+    ):
+        self.sender = sender
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def get_backoff(self, attempts: int) -> timedelta:
+        seconds = min(self.backoff * 2 ** (attempts - 1), self.max_backoff)
+        return timedelta(seconds=seconds)
+
+    def get_batch(self) -> List[OutboxNotification]:
+        now = timezone.now()
+        # an earlier notification of the main object is waiting for a retry
+        blocked = OutboxNotification.objects.filter(
+            main_object=OuterRef("main_object"),
+            pk__lt=OuterRef("pk"),
+            next_attempt_at__gt=now,
+        )
+        return list(
+            OutboxNotification.objects.filter(next_attempt_at__lte=now)
+            .filter(~Exists(blocked))
+            .order_by("pk")[: self.batch_size]
+        )
+
+    def send_in_order(
+        self, notifications: List[OutboxNotification]
+    ) -> List[Tuple[OutboxNotification, Optional[str]]]:
+        """
+        Send the notifications of a main object, until one of them fails.
+        """
+        results = []
+        for notification in notifications:
+            error = self.sender.send(notification.message)
+            results.append((notification, error))
+            if error:
+                break
+        return results
+
+    def process_batch(self) -> Tuple[int, int]:
+        """
+        Send the next batch of notifications and return the number sent and failed.
+        """
+        batch = self.get_batch()
+        if not batch:
+            return 0, 0
+
+        per_main_object = OrderedDict()
+        for notification in batch:
+            per_main_object.setdefault(notification.main_object, []).append(
+                notification
+            )
+
+        with futures.ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = [
+                result
+                for group_results in executor.map(
+                    self.send_in_order, per_main_object.values()
+                )
+                for result in group_results
+            ]
+
+        sent = [notification.pk for notification, error in results if not error]
+        failed = [(notification, error) for notification, error in results if error]
+        self.record_failures(failed)
+        OutboxNotification.objects.filter(pk__in=sent).delete()
+        return len(sent), len(failed)
+
+    def record_failures(self, failed: List[Tuple[OutboxNotification, str]]) -> None:
+        now = timezone.now()
+        retries, given_up = [], []
+        for notification, error in failed:
+            notification.attempts += 1
+            notification.last_error = error
+            if notification.attempts >= self.max_attempts:
+                given_up.append(notification)
+                continue
+
+            notification.next_attempt_at = now + self.get_backoff(notification.attempts)
+            retries.append(notification)
+
+        OutboxNotification.objects.bulk_update(
+            retries, ["attempts", "last_error", "next_attempt_at"]
+        )
+
+        for notification in given_up:
+            # stored as FailedNotification by the logging configuration
+            notifs_logger.warning(
+                "Could not deliver message to %s after %d attempts: %s",
+                self.sender.url,
+                notification.attempts,
+                notification.last_error,
+                extra={
+                    "notification_msg": notification.message,
+                    "status_code": notification.status_code,
+                },
+            )
+        OutboxNotification.objects.filter(
+            pk__in=[notification.pk for notification in given_up]
+        ).delete()
@@ -1,46 +1,95 @@
 # SPDX-License-Identifier: EUPL-1.2
 # Copyright (C) 2020 Dimpact
 import logging
+from concurrent import futures
+from functools import partial
+from typing import Callable, Optional, Tuple
 
+from django.db.models import Max, QuerySet
 from django.utils import timezone
 
-from vng_api_common.notifications.models import NotificationsConfig
-from zds_client import ClientError
-
 from .models import FailedNotification
+from .outbox import NotificationSender
+
+logger = logging.getLogger(__name__)
 
 notifs_logger = logging.getLogger("vng_api_common.notifications.viewsets")
 
 
-class ResendFailure(Exception):
-    pass
+def _resend(
+    sender: NotificationSender, notification: FailedNotification
+) -> Tuple[bool, Optional[str]]:
+    """
+    Return whether the notification was sent, and the error if it failed.
+    """
+    try:
+        error = sender.send(notification.message)
+    except Exception:
+        logger.exception("Resend for %d failed", notification.pk)
+        return False, None
+    return error is None, error
 
 
-def resend_notification(notification: FailedNotification) -> None:
+def resend_notifications(
+    queryset: QuerySet,
+    workers: int = 10,
+    chunk_size: int = 500,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Tuple[int, int]:
     """
-    Resend a failed notification.
+    Resend the not-retried failed notifications in ``queryset``.
+
+    The notifications are retrieved in chunks and sent concurrently with a single
+    pooled session, after which the chunk is marked as retried with one query. Resends
+    that fail are logged again with the original logger, making them available for
+    future retries. Failed notifications logged while resending are not resent in the
+    same run.
 
-    The message is extracted from the failed notification log. If any resends
-    fail, they are logged again with the same original logger, making them
-    available for future retries.
+    ``progress`` is called with the number of sent and failed notifications after
+    every chunk. Returns the final numbers.
     """
-    assert notification.retried_at is None, "Can only resend not-retried notifications"
-    config = NotificationsConfig.get_solo()
-    client = config.get_client()
+    queryset = queryset.filter(retried_at__isnull=True).order_by("pk")
+    last_pk = queryset.aggregate(last_pk=Max("pk"))["last_pk"]
+    if last_pk is None:
+        return 0, 0
+    queryset = queryset.filter(pk__lte=last_pk).only("message", "status_code")
 
+    sender = NotificationSender(pool_size=workers)
+    sent = failed = 0
+    previous_pk = 0
     try:
-        client.create("notificaties", notification.message)
-    except ClientError as error:
-        notifs_logger.warning(
-            "Could not deliver message to %s",
-            client.base_url,
-            exc_info=True,
-            extra={
-                "notification_msg": notification.message,
-                "status_code": notification.status_code,
-            },
-        )
-        raise ResendFailure from error
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            while True:
+                chunk = list(queryset.filter(pk__gt=previous_pk)[:chunk_size])
+                if not chunk:
+                    break
+                previous_pk = chunk[-1].pk
+
+                results = list(executor.map(partial(_resend, sender), chunk))
+                FailedNotification.objects.filter(
+                    pk__in=[notification.pk for notification in chunk]
+                ).update(retried_at=timezone.now())
+
+                for notification, (ok, error) in zip(chunk, results):
+                    if ok:
+                        sent += 1
+                        continue
+
+                    failed += 1
+                    if error:
+                        notifs_logger.warning(
+                            "Could not deliver message to %s: %s",
+                            sender.url,
+                            error,
+                            extra={
+                                "notification_msg": notification.message,
+                                "status_code": notification.status_code,
+                            },
+                        )
+
+                if progress is not None:
+                    progress(sent, failed)
     finally:
-        notification.retried_at = timezone.now()
-        notification.save()
+        sender.close()
+
+    return sent, failed
@@ -0,0 +1,175 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+import requests_mock
+from freezegun import freeze_time
+from rest_framework import status
+from rest_framework.test import APITestCase
+from vng_api_common.constants import VertrouwelijkheidsAanduiding
+from vng_api_common.tests import reverse
+
+from openzaak.components.catalogi.tests.factories import ZaakTypeFactory
+from openzaak.components.zaken.models import Zaak
+from openzaak.components.zaken.tests.utils import ZAAK_WRITE_KWARGS
+from openzaak.utils.tests import JWTAuthMixin
+
+from ..models import FailedNotification, OutboxNotification
+from ..outbox import NotificationSender, OutboxWorker, queue_notification
+from . import mock_notification_send
+from .mixins import NotificationServiceMixin
+from .utils import LOGGING_SETTINGS
+
+NOTIFICATIONS_URL = "https://notificaties-api.vng.cloud/api/v1/notificaties"
+
+
+def get_message(main_object: str, actie: str = "create") -> dict:
+    return {
+        "kanaal": "zaken",
+        "hoofdObject": main_object,
+        "resource": "zaak",
+        "resourceUrl": main_object,
+        "actie": actie,
+        "aanmaakdatum": "2022-01-01T12:00:00Z",
+        "kenmerken": {},
+    }
+
+
+@override_settings(NOTIFICATIONS_DISABLED=False, NOTIFICATIONS_OUTBOX=True)
+class OutboxQueueTests(JWTAuthMixin, APITestCase):
+    heeft_alle_autorisaties = True
+
+    @patch("zds_client.Client.from_url")
+    def test_notification_stored_in_transaction(self, mock_client):
+        zaaktype = ZaakTypeFactory.create(concept=False)
+        data = {
+            "zaaktype": f"http://testserver{reverse(zaaktype)}",
+            "vertrouwelijkheidaanduiding": VertrouwelijkheidsAanduiding.openbaar,
+            "bronorganisatie": "517439943",
+            "verantwoordelijkeOrganisatie": "517439943",
+            "registratiedatum": "2022-01-13",
+            "startdatum": "2022-01-13",
+        }
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse(Zaak), data, **ZAAK_WRITE_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        mock_client.return_value.create.assert_not_called()
+        notification = OutboxNotification.objects.get()
+        self.assertEqual(notification.main_object, response.json()["url"])
+        self.assertEqual(notification.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(notification.message["actie"], "create")
+        self.assertEqual(notification.message["resourceUrl"], response.json()["url"])
+
+
+@requests_mock.Mocker()
+@override_settings(LOGGING=LOGGING_SETTINGS)
+class OutboxWorkerTests(NotificationServiceMixin, TestCase):
+    def _get_worker(self, **kwargs) -> OutboxWorker:
+        return OutboxWorker(NotificationSender(pool_size=2), **kwargs)
+
+    def _sent_messages(self, m) -> list:
+        return [
+            (request.json()["hoofdObject"], request.json()["actie"])
+            for request in m.request_history
+        ]
+
+    def test_send_in_order(self, m):
+        mock_notification_send(m)
+        queue_notification(get_message("https://zaak/1"), 201)
+        queue_notification(get_message("https://zaak/2"), 201)
+        queue_notification(get_message("https://zaak/1", "update"), 200)
+
+        sent, failed = self._get_worker().process_batch()
+
+        self.assertEqual((sent, failed), (3, 0))
+        self.assertFalse(OutboxNotification.objects.exists())
+        messages = self._sent_messages(m)
+        self.assertEqual(len(messages), 3)
+        self.assertLess(
+            messages.index(("https://zaak/1", "create")),
+            messages.index(("https://zaak/1", "update")),
+        )
+        self.assertIn("Authorization", m.request_history[0].headers)
+
+    @freeze_time("2022-01-01T12:00:00")
+    def test_failure_blocks_main_object(self, m):
+        m.post(
+            NOTIFICATIONS_URL,
+            [
+                {"status_code": 201}
+                if request_number
+                else {"status_code": 500, "text": "error"}
+                for request_number in range(10)
+            ],
+        )
+        first = queue_notification(get_message("https://zaak/1"), 201)
+        queue_notification(get_message("https://zaak/1", "update"), 200)
+        worker = self._get_worker(workers=1, backoff=10)
+
+        with self.subTest("failed"):
+            sent, failed = worker.process_batch()
+
+            self.assertEqual((sent, failed), (0, 1))
+            first.refresh_from_db()
+            self.assertEqual(first.attempts, 1)
+            self.assertEqual(first.last_error, "500: error")
+            self.assertEqual(
+                first.next_attempt_at, timezone.now() + timedelta(seconds=10)
+            )
+
+        with self.subTest("later notifications wait"):
+            queue_notification(get_message("https://zaak/2"), 201)
+
+            sent, failed = worker.process_batch()
+
+            self.assertEqual((sent, failed), (1, 0))
+            self.assertEqual(OutboxNotification.objects.count(), 2)
+            self.assertEqual(self._sent_messages(m)[-1], ("https://zaak/2", "create"))
+
+        with self.subTest("retried in order"), freeze_time("2022-01-01T12:00:10"):
+            sent, failed = worker.process_batch()
+
+            self.assertEqual((sent, failed), (2, 0))
+            self.assertEqual(
+                self._sent_messages(m)[-2:],
+                [("https://zaak/1", "create"), ("https://zaak/1", "update")],
+            )
+
+    def test_max_attempts(self, m):
+        mock_notification_send(m, status_code=503)
+        notification = queue_notification(get_message("https://zaak/1"), 201)
+        worker = self._get_worker(max_attempts=2, backoff=0)
+
+        worker.process_batch()
+        worker.process_batch()
+
+        self.assertFalse(OutboxNotification.objects.exists())
+        failed = FailedNotification.objects.get()
+        self.assertEqual(failed.message, notification.message)
+        self.assertEqual(failed.status_code, 201)
+
+    def test_command(self, m):
+        mock_notification_send(m)
+        for index in range(3):
+            queue_notification(get_message(f"https://zaak/{index}"), 201)
+        stdout = StringIO()
+
+        call_command("process_notification_outbox", "--stats", stdout=stdout)
+
+        self.assertIn("pending: 3, due: 3, retrying: 0", stdout.getvalue())
+
+        call_command(
+            "process_notification_outbox", "--once", batch_size=2, stdout=stdout
+        )
+
+        self.assertFalse(OutboxNotification.objects.exists())
+        self.assertEqual(len(m.request_history), 3)
+        self.assertIn("sent: 2, failed: 0", stdout.getvalue())
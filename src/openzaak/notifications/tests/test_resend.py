@@ -0,0 +1,77 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+import requests_mock
+
+from ..models import FailedNotification
+from . import mock_notification_send
+from .factories import FailedNotificationFactory
+from .mixins import NotificationServiceMixin
+from .utils import LOGGING_SETTINGS
+
+
+@requests_mock.Mocker()
+@override_settings(LOGGING=LOGGING_SETTINGS)
+class ResendFailedNotificationsCommandTests(NotificationServiceMixin, TestCase):
+    def test_resend_in_chunks(self, m):
+        mock_notification_send(m)
+        FailedNotificationFactory.create_batch(5)
+        FailedNotificationFactory.create(retried_at=timezone.now())
+        stdout = StringIO()
+
+        call_command("resend_failed_notifications", chunk_size=2, stdout=stdout)
+
+        self.assertEqual(len(m.request_history), 5)
+        self.assertFalse(
+            FailedNotification.objects.filter(retried_at__isnull=True).exists()
+        )
+        output = stdout.getvalue()
+        self.assertIn("sent: 2, failed: 0", output)
+        self.assertIn("sent: 5, failed: 0", output)
+        self.assertIn("Resent 5 notifications, 0 failed again", output)
+
+    def test_failures_logged_again(self, m):
+        mock_notification_send(m, status_code=503)
+        FailedNotificationFactory.create_batch(2, status_code=201)
+
+        call_command("resend_failed_notifications", chunk_size=1, stdout=StringIO())
+
+        # the new failures are not resent in the same run
+        self.assertEqual(len(m.request_history), 2)
+        self.assertEqual(FailedNotification.objects.count(), 4)
+        new_failures = FailedNotification.objects.filter(retried_at__isnull=True)
+        self.assertEqual(new_failures.count(), 2)
+        self.assertEqual(
+            {failure.status_code for failure in new_failures}, {201},
+        )
+
+    def test_filter_kanaal(self, m):
+        mock_notification_send(m)
+        FailedNotificationFactory.create()
+        other = FailedNotificationFactory.create(
+            message={
+                "aanmaakdatum": "2019-01-01T12:00:00Z",
+                "actie": "create",
+                "hoofdObject": "http://testserver/foo",
+                "kanaal": "documenten",
+                "kenmerken": {},
+                "resource": "enkelvoudiginformatieobject",
+                "resourceUrl": "http://testserver/foo",
+            }
+        )
+
+        call_command(
+            "resend_failed_notifications", kanaal="documenten", stdout=StringIO()
+        )
+
+        self.assertEqual(len(m.request_history), 1)
+        other.refresh_from_db()
+        self.assertIsNotNone(other.retried_at)
+        self.assertEqual(
+            FailedNotification.objects.filter(retried_at__isnull=True).count(), 1
+        )
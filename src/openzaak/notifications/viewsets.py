@@ -0,0 +1,48 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+from django.conf import settings
+from django.db import models
+
+from vng_api_common.notifications.viewsets import (
+    NotificationCreateMixin as _NotificationCreateMixin,
+    NotificationDestroyMixin as _NotificationDestroyMixin,
+    NotificationMixin,
+    NotificationUpdateMixin as _NotificationUpdateMixin,
+)
+
+from .outbox import queue_notification
+
+
+class OutboxNotificationMixin(NotificationMixin):
+    """
+    Store the notifications in the outbox if ``settings.NOTIFICATIONS_OUTBOX`` is
+    enabled, rather than sending them when the transaction is committed.
+    """
+
+    def notify(self, status_code: int, data, instance: models.Model = None) -> None:
+        if not settings.NOTIFICATIONS_OUTBOX:
+            return super().notify(status_code, data, instance=instance)
+
+        if settings.NOTIFICATIONS_DISABLED or not 200 <= status_code < 300:
+            return
+
+        message = self.construct_message(data, instance=instance)
+        queue_notification(message, status_code)
+
+
+class NotificationCreateMixin(OutboxNotificationMixin, _NotificationCreateMixin):
+    pass
+
+
+class NotificationUpdateMixin(OutboxNotificationMixin, _NotificationUpdateMixin):
+    pass
+
+
+class NotificationDestroyMixin(OutboxNotificationMixin, _NotificationDestroyMixin):
+    pass
+
+
+class NotificationViewSetMixin(
+    NotificationCreateMixin, NotificationUpdateMixin, NotificationDestroyMixin
+):
+    pass
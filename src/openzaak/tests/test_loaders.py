@@ -0,0 +1,209 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+import threading
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+
+import requests_mock
+from django_loose_fk.loaders import FetchError
+from freezegun import freeze_time
+from zgw_consumers.constants import APITypes, AuthTypes
+from zgw_consumers.models import Service
+
+from openzaak.components.zaken.tests.factories import ZaakFactory
+from openzaak.components.zaken.tests.utils import get_zaaktype_response
+from openzaak.loaders import (
+    AuthorizedRequestsLoader,
+    fetch_json,
+    get_session,
+    prefetch_remote_objects,
+    prefetch_scope,
+)
+from openzaak.utils.tests import ClearCachesMixin
+
+CATALOGUS = "https://catalogi.example.com/api/v1/catalogussen/1"
+ZAAKTYPE = "https://catalogi.example.com/api/v1/zaaktypen/1"
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "axes": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        "oidc": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        "autorisaties": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        "remote_objects": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    },
+    REMOTE_OBJECTS_CACHE_TIMEOUT=60,
+    REMOTE_OBJECTS_NEGATIVE_CACHE_TIMEOUT=10,
+)
+@requests_mock.Mocker()
+class AuthorizedRequestsLoaderTests(ClearCachesMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.service = Service.objects.create(
+            api_root="https://catalogi.example.com/api/v1/",
+            api_type=APITypes.ztc,
+            auth_type=AuthTypes.zgw,
+            client_id="test",
+            secret="test",
+        )
+
+    def test_pooled_session_per_service(self, m):
+        self.assertIs(get_session(self.service), get_session(self.service))
+        self.assertIsNot(get_session(self.service), get_session(None))
+
+    def test_fetch_with_auth_and_cache(self, m):
+        m.get(ZAAKTYPE, json={"url": ZAAKTYPE, "omschrijvingGeneriek": "foo"})
+
+        data = AuthorizedRequestsLoader.fetch_object(ZAAKTYPE)
+        cached = AuthorizedRequestsLoader.fetch_object(ZAAKTYPE)
+
+        self.assertEqual(data, {"url": ZAAKTYPE, "omschrijving_generiek": "foo"})
+        self.assertEqual(cached, data)
+        self.assertEqual(len(m.request_history), 1)
+        self.assertIn("Authorization", m.request_history[0].headers)
+
+    def test_revalidate_with_etag(self, m):
+        m.get(
+            ZAAKTYPE,
+            [
+                {"json": {"url": ZAAKTYPE}, "headers": {"ETag": '"v1"'}},
+                {"status_code": 304},
+            ],
+        )
+
+        with freeze_time("2022-01-01T12:00:00"):
+            fetch_json(ZAAKTYPE)
+
+        with freeze_time("2022-01-01T12:01:01"):
+            data = fetch_json(ZAAKTYPE)
+
+        self.assertEqual(data, {"url": ZAAKTYPE})
+        self.assertEqual(len(m.request_history), 2)
+        self.assertEqual(m.request_history[1].headers["If-None-Match"], '"v1"')
+
+    def test_expired_without_etag(self, m):
+        m.get(ZAAKTYPE, json={"url": ZAAKTYPE})
+
+        with freeze_time("2022-01-01T12:00:00"):
+            fetch_json(ZAAKTYPE)
+
+        with freeze_time("2022-01-01T12:01:01"):
+            fetch_json(ZAAKTYPE)
+
+        self.assertEqual(len(m.request_history), 2)
+        self.assertNotIn("If-None-Match", m.request_history[1].headers)
+
+    def test_negative_cache(self, m):
+        m.get(ZAAKTYPE, status_code=404)
+
+        for _i in range(2):
+            with self.subTest(attempt=_i), self.assertRaises(FetchError):
+                fetch_json(ZAAKTYPE)
+
+        self.assertEqual(len(m.request_history), 1)
+
+    @override_settings(REMOTE_OBJECTS_CACHE_TIMEOUT=0)
+    def test_cache_disabled(self, m):
+        m.get(ZAAKTYPE, json={"url": ZAAKTYPE})
+
+        fetch_json(ZAAKTYPE)
+        fetch_json(ZAAKTYPE)
+
+        self.assertEqual(len(m.request_history), 2)
+
+    def test_concurrent_fetches_collapsed(self, m):
+        started, release = threading.Event(), threading.Event()
+
+        def slow_request(url, cached, service):
+            started.set()
+            release.wait(5)
+            return {"url": url}
+
+        results = []
+        with patch("openzaak.loaders._request_json", side_effect=slow_request) as mock:
+            first = threading.Thread(
+                target=lambda: results.append(fetch_json(ZAAKTYPE))
+            )
+            first.start()
+            started.wait(5)
+            second = threading.Thread(
+                target=lambda: results.append(fetch_json(ZAAKTYPE))
+            )
+            second.start()
+            # give the second thread the opportunity to wait for the first fetch
+            second.join(0.1)
+            release.set()
+            first.join()
+            second.join()
+
+        self.assertEqual(mock.call_count, 1)
+        self.assertEqual(results, [{"url": ZAAKTYPE}, {"url": ZAAKTYPE}])
+
+    def test_service_lookup_error(self, m):
+        m.get(ZAAKTYPE, json={"url": ZAAKTYPE})
+
+        with patch.object(
+            Service, "get_service", side_effect=RuntimeError("database error")
+        ):
+            with self.assertRaises(RuntimeError):
+                fetch_json(ZAAKTYPE)
+
+        # the failed fetch doesn't block the next fetches of the URL
+        result = []
+        thread = threading.Thread(
+            target=lambda: result.append(fetch_json(ZAAKTYPE, self.service))
+        )
+        thread.start()
+        thread.join(5)
+
+        self.assertEqual(result, [{"url": ZAAKTYPE}])
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+@requests_mock.Mocker()
+class PrefetchRemoteObjectsTests(TestCase):
+    zaaktypen = [f"https://catalogi.example.com/api/v1/zaaktypen/{i}" for i in range(3)]
+
+    def test_fetch_distinct_urls_once(self, m):
+        for zaaktype in self.zaaktypen:
+            m.get(zaaktype, json=get_zaaktype_response(CATALOGUS, zaaktype))
+        zaken = [
+            ZaakFactory.build(zaaktype=zaaktype)
+            for zaaktype in self.zaaktypen + self.zaaktypen
+        ]
+
+        with prefetch_scope():
+            prefetch_remote_objects(zaken)
+
+            self.assertEqual(len(m.request_history), 3)
+
+            for zaak in zaken:
+                with self.subTest(zaak=zaak):
+                    self.assertEqual(
+                        zaak.zaaktype._loose_fk_data["url"], zaak._zaaktype_url
+                    )
+            # the virtual models are reused
+            self.assertIs(zaken[0].zaaktype, zaken[3].zaaktype)
+
+        self.assertEqual(len(m.request_history), 3)
+
+    def test_errors_raised_on_load(self, m):
+        m.get(ZAAKTYPE, status_code=404)
+        zaak = ZaakFactory.build(zaaktype=ZAAKTYPE)
+
+        with prefetch_scope():
+            prefetch_remote_objects([zaak])
+
+            with self.assertRaises(FetchError):
+                zaak.zaaktype
+
+        self.assertEqual(len(m.request_history), 1)
+
+    def test_no_prefetch_outside_scope(self, m):
+        zaak = ZaakFactory.build(zaaktype=ZAAKTYPE)
+
+        prefetch_remote_objects([zaak])
+
+        self.assertFalse(m.called)
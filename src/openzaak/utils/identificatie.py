@@ -0,0 +1,173 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+"""
+Allocate the human readable identificaties of new objects, e.g.
+``ZAAK-2022-0000000001``.
+
+:func:`vng_api_common.utils.generate_unique_identification` looks up the highest
+issued number for every new object. Concurrent creates see the same number and
+fail on the unique constraints. Instead, the numbers are drawn from a PostgreSQL
+sequence per model and year, which does not take any locks.
+
+The sequences are created and seeded from the existing identificaties by the
+``sync_identificatie_sequences`` management command, for the years of the existing
+objects and the current and next year. Allocating numbers never creates them. For a
+year without a sequence, the highest issued number is looked up as before.
+
+The numbering is the same as before - the numbers are unique per model and year,
+across organisations.
+"""
+import re
+from datetime import date
+from typing import Iterable, List, Optional, Type
+
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS, connection, connections, models
+
+NUMBER_LENGTH = 10
+
+SEQUENCE_PREFIX = "identificatie_"
+
+# the models with generated identificaties, and the date field providing the year
+IDENTIFICATIE_MODELS = {
+    "zaken.Zaak": "registratiedatum",
+    "besluiten.Besluit": "datum",
+    "documenten.EnkelvoudigInformatieObject": "creatiedatum",
+    "catalogi.ZaakType": "versiedatum",
+}
+
+
+def get_model_prefix(model: Type[models.Model]) -> str:
+    return getattr(model, "IDENTIFICATIE_PREFIX", model._meta.model_name.upper())
+
+
+def get_sequence_name(model: Type[models.Model], year: int) -> str:
+    return f"{SEQUENCE_PREFIX}{model._meta.app_label}_{model._meta.model_name}_{year}"
+
+
+def _get_max_issued(model: Type[models.Model], prefix: str, using: str) -> int:
+    pattern = rf"^{re.escape(prefix)}-\d{{{NUMBER_LENGTH}}}$"
+    max_identificatie = (
+        model._default_manager.using(using)
+        .filter(identificatie__regex=pattern)
+        .aggregate(models.Max("identificatie"))["identificatie__max"]
+    )
+    if max_identificatie is None:
+        return 0
+    return int(max_identificatie.rsplit("-", 1)[1])
+
+
+def _sequence_exists(cursor, name: str) -> bool:
+    cursor.execute("SELECT to_regclass(%s)", [name])
+    return cursor.fetchone()[0] is not None
+
+
+def reserve_identificaties(
+    model: Type[models.Model], year: int, count: int
+) -> List[str]:
+    """
+    Reserve a block of ``count`` identificaties, for example for bulk imports.
+
+    The numbers are increasing but not necessarily consecutive when other processes
+    allocate numbers at the same time.
+    """
+    prefix = f"{get_model_prefix(model)}-{year}"
+    name = get_sequence_name(model, year)
+    with connection.cursor() as cursor:
+        if _sequence_exists(cursor, name):
+            cursor.execute(
+                "SELECT nextval(%s) FROM generate_series(1, %s)", [name, count]
+            )
+            numbers = [row[0] for row in cursor.fetchall()]
+        else:
+            start = _get_max_issued(model, prefix, connection.alias) + 1
+            numbers = range(start, start + count)
+
+    return [f"{prefix}-{number:0{NUMBER_LENGTH}d}" for number in numbers]
+
+
+def generate_unique_identification(instance: models.Model, date_field_name: str):
+    """
+    Drop-in replacement of :func:`vng_api_common.utils.generate_unique_identification`.
+    """
+    year = getattr(instance, date_field_name).year
+    return reserve_identificaties(type(instance), year, 1)[0]
+
+
+def register_identificatie(instance: models.Model) -> None:
+    """
+    Prevent that an explicitly provided identificatie is allocated again.
+
+    Identificaties in the generated format advance the sequence of their year. If
+    the sequence doesn't exist, the identificatie is seen by the lookup of the highest
+    issued number instead.
+    """
+    model = type(instance)
+    match = re.fullmatch(
+        rf"{re.escape(get_model_prefix(model))}-(\d{{4}})-(\d{{{NUMBER_LENGTH}}})",
+        instance.identificatie,
+    )
+    if not match:
+        return
+
+    year, number = int(match.group(1)), int(match.group(2))
+    name = get_sequence_name(model, year)
+    with connection.cursor() as cursor:
+        if not _sequence_exists(cursor, name):
+            return
+
+        cursor.execute(
+            f"SELECT setval(%s, %s) FROM {connection.ops.quote_name(name)} "
+            "WHERE last_value < %s OR (last_value = %s AND NOT is_called)",
+            [name, number, number, number],
+        )
+
+
+def sync_sequences(
+    years: Optional[Iterable[int]] = None, using: str = DEFAULT_DB_ALIAS
+) -> List[str]:
+    """
+    Create the missing identificatie sequences and seed them from the data.
+
+    Without ``years``, the sequences are synced for the years of the existing
+    objects and the current and next year. Existing sequences are only advanced, past
+    the highest issued number. Returns the names of the synced sequences.
+    """
+    db_connection = connections[using]
+    if db_connection.vendor != "postgresql":
+        return []
+
+    current_year = date.today().year
+    names = []
+    for label, date_field_name in IDENTIFICATIE_MODELS.items():
+        model = apps.get_model(label)
+        if years is None:
+            model_years = {
+                day.year
+                for day in model._default_manager.using(using).dates(
+                    date_field_name, "year"
+                )
+            }
+            model_years |= {current_year, current_year + 1}
+        else:
+            model_years = set(years)
+
+        for year in sorted(model_years):
+            names.append(_sync_sequence(model, year, using))
+    return names
+
+
+def _sync_sequence(model: Type[models.Model], year: int, using: str) -> str:
+    db_connection = connections[using]
+    name = get_sequence_name(model, year)
+    quoted_name = db_connection.ops.quote_name(name)
+    with db_connection.cursor() as cursor:
+        cursor.execute(f"CREATE SEQUENCE IF NOT EXISTS {quoted_name}")
+        start = _get_max_issued(model, f"{get_model_prefix(model)}-{year}", using) + 1
+        # setval with is_called = false makes nextval return the value itself
+        cursor.execute(
+            f"SELECT setval(%s, %s, false) FROM {quoted_name} "
+            "WHERE last_value + is_called::int < %s",
+            [name, start, start],
+        )
+    return name
@@ -16,6 +16,7 @@ from vng_api_common.middleware import (
 from openzaak.config.models import InternalService
 
 from .constants import COMPONENT_MAPPING
+from .streaming import StreamingJSONResponse
 
 logger = logging.getLogger(__name__)
 
@@ -57,7 +58,7 @@ class APIVersionHeaderMiddleware(_APIVersionHeaderMiddleware):
         response = self.get_response(request)
 
         # not an API response, exit early
-        if not isinstance(response, Response):
+        if not isinstance(response, (Response, StreamingJSONResponse)):
             return response
 
         # set the header
@@ -1,10 +1,16 @@
 # SPDX-License-Identifier: EUPL-1.2
-# Copyright (C) 2019 - 2020 Dimpact
+# Copyright (C) 2019 - 2022 Dimpact
+from types import SimpleNamespace
+
+from django.db import models
+
 from dictdiffer import diff
 from drc_cmis import client_builder
 from drc_cmis.connections import use_cmis_connection_pool
 from vng_api_common.audittrails.models import AuditTrail
+from vng_api_common.viewsets import CheckQueryParamsMixin as _CheckQueryParamsMixin
 
+from openzaak.loaders import prefetch_remote_objects, prefetch_scope
 from openzaak.utils.decorators import convert_cmis_adapter_exceptions
 
 
@@ -73,5 +79,51 @@ class ConvertCMISAdapterExceptions:
 
 class CMISConnectionPoolMixin:
     def dispatch(self, request, *args, **kwargs):
-        with use_cmis_connection_pool():
+        from openzaak.components.documenten.query.cache import document_cache_scope
+
+        with use_cmis_connection_pool(), document_cache_scope():
             return super().dispatch(request, *args, **kwargs)
+
+
+class CheckQueryParamsMixin(_CheckQueryParamsMixin):
+    """
+    Also accept the query parameters of the paginators in :mod:`openzaak.utils.pagination`.
+    """
+
+    def _check_query_params(self, request) -> None:
+        extra_params = list(getattr(self.paginator, "extra_query_params", []))
+        optional_paginator = getattr(self, "optional_paginator", None)
+        if optional_paginator is not None:
+            extra_params += optional_paginator.query_params
+        if extra_params:
+            query_params = request.query_params.copy()
+            for param in extra_params:
+                query_params.pop(param, None)
+            request = SimpleNamespace(query_params=query_params)
+
+        super()._check_query_params(request)
+
+
+class PrefetchRemoteObjectsMixin:
+    """
+    Fetch the remote objects of a page concurrently before it's serialized.
+
+    The loose-fk fields otherwise fetch the remote objects one by one, while the
+    objects are serialized.
+    """
+
+    def list(self, request, *args, **kwargs):
+        with prefetch_scope():
+            return super().list(request, *args, **kwargs)
+
+    def get_search_output(self, queryset: models.QuerySet):
+        # search actions of viewsets with the vng_api_common SearchMixin
+        with prefetch_scope():
+            return super().get_search_output(queryset)
+
+    def get_serializer(self, *args, **kwargs):
+        if kwargs.get("many") and args:
+            instances = list(args[0])
+            prefetch_remote_objects(instances)
+            args = (instances,) + args[1:]
+        return super().get_serializer(*args, **kwargs)
@@ -0,0 +1,456 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+import base64
+import binascii
+import hashlib
+import json
+from collections import OrderedDict
+from typing import List, Optional
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.paginator import (
+    EmptyPage,
+    Page as DjangoPage,
+    PageNotAnInteger,
+    Paginator as DjangoPaginator,
+)
+from django.db import connections, models
+from django.db.models import Q
+from django.utils.functional import cached_property
+from django.utils.translation import ugettext_lazy as _
+
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .mixins import CMISClientMixin
+from .streaming import StreamingJSONResponse, can_stream
+
+
+def get_ordering_value(obj: models.Model, lookup: str):
+    """
+    Resolve the value of an ``order_by`` lookup for a model instance.
+    """
+    *relations, field_name = lookup.split("__")
+    for relation in relations:
+        obj = getattr(obj, relation)
+        if obj is None:
+            return None
+
+    if field_name == "pk":
+        return obj.pk
+    return getattr(obj, obj._meta.get_field(field_name).attname)
+
+
+def is_nullable(model, lookup: str) -> bool:
+    """
+    Determine if the value of an ``order_by`` lookup can be ``NULL``.
+    """
+    *relations, field_name = lookup.split("__")
+    for relation in relations:
+        field = model._meta.get_field(relation)
+        if field.null:
+            return True
+        model = field.related_model
+
+    if field_name == "pk":
+        return False
+    return model._meta.get_field(field_name).null
+
+
+def build_keyset_filter(model, ordering: List[str], values: list) -> Q:
+    """
+    Build the condition selecting the records after ``values`` in the ``ordering``.
+
+    This is the expanded form of the row value comparison
+    ``(a, b, c) > (value_a, value_b, value_c)``, which allows mixing ascending and
+    descending sort keys. ``NULL`` values are placed like PostgreSQL sorts them by
+    default: last in ascending and first in descending order.
+    """
+    condition = Q(pk__in=[])
+    for index, lookup in enumerate(ordering):
+        name = lookup.lstrip("-")
+        value = values[index]
+        if lookup.startswith("-"):
+            if value is None:
+                after = Q(**{f"{name}__isnull": False})
+            else:
+                after = Q(**{f"{name}__lt": value})
+        else:
+            # nothing comes after NULL, apart from the records with equal sort keys
+            if value is None:
+                continue
+            after = Q(**{f"{name}__gt": value})
+            if is_nullable(model, name):
+                after |= Q(**{f"{name}__isnull": True})
+
+        # an exact lookup on None is an IS NULL condition
+        clause = Q(
+            **{
+                previous.lstrip("-"): previous_value
+                for previous, previous_value in zip(ordering[:index], values[:index])
+            }
+        )
+        condition |= clause & after
+    return condition
+
+
+def estimate_count(queryset: models.QuerySet) -> Optional[int]:
+    """
+    Estimate the number of records from the query plan of the PostgreSQL planner.
+
+    The estimate is based on the table statistics (``reltuples``) and selectivity of
+    the conditions, it does not scan the records.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]["Plan Rows"]
+
+
+class Page(DjangoPage):
+    """
+    Page of a :class:`Paginator` with a delegated count, which can be approximate.
+
+    The adjacent pages are determined from the records instead of the count.
+    """
+
+    def __init__(self, object_list, number, paginator, has_next: bool):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    def next_page_number(self) -> int:
+        if not self._has_next:
+            raise EmptyPage(_("That page contains no results"))
+        return self.number + 1
+
+    def previous_page_number(self) -> int:
+        if self.number <= 1:
+            raise EmptyPage(_("That page number is less than 1"))
+        return self.number - 1
+
+
+class Paginator(DjangoPaginator):
+    """
+    Paginator delegating the count to ``count_function``, if it provides one.
+
+    A delegated count can be approximate, so it is only reported. The page is then
+    sliced from the records, with one extra record to determine if there is a next
+    page.
+    """
+
+    def __init__(self, object_list, per_page, count_function=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_function = count_function
+
+    @cached_property
+    def delegated_count(self) -> Optional[int]:
+        if self.count_function is None:
+            return None
+        return self.count_function(self.object_list)
+
+    @cached_property
+    def count(self) -> int:
+        count = self.delegated_count
+        return super().count if count is None else count
+
+    def page(self, number) -> DjangoPage:
+        if self.delegated_count is None:
+            return super().page(number)
+
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(_("That page number is not an integer"))
+        if number < 1:
+            raise EmptyPage(_("That page number is less than 1"))
+
+        bottom = (number - 1) * self.per_page
+        records = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not records and number > 1:
+            raise EmptyPage(_("That page contains no results"))
+        return Page(
+            records[: self.per_page],
+            number,
+            self,
+            has_next=len(records) > self.per_page,
+        )
+
+
+class OptimizedPagination(pagination.PageNumberPagination):
+    """
+    Page number pagination with an opt-in keyset (cursor) mode.
+
+    Clients opt in by passing the ``cursor`` query parameter, empty for the first
+    page. The next page is then selected on the sort key and primary key of the last
+    record of the current page instead of with an OFFSET, and the total count is not
+    calculated (``count`` is ``null``), so every page takes constant time to
+    retrieve. Only forward navigation with the ``next`` link is supported.
+
+    Querysets that are not backed by the database (CMIS) always use page numbers.
+
+    With page numbers, the count can be cached per client and query parameters
+    (``settings.PAGINATION_COUNT_CACHE_TIMEOUT``) and estimated from the query plan
+    for large results (``settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD``). Responses
+    with such a count have the ``X-Count-Approximate`` header.
+    """
+
+    cursor_query_param = "cursor"
+    count_approximate_header = "X-Count-Approximate"
+
+    keyset = False
+    count_approximate = False
+
+    @property
+    def extra_query_params(self) -> List[str]:
+        """
+        Query parameters supported on top of the page number parameters.
+        """
+        return [self.cursor_query_param]
+
+    def django_paginator_class(self, object_list, per_page) -> Paginator:
+        return Paginator(object_list, per_page, count_function=self.get_count)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.count_approximate = False
+        self.keyset = self.cursor_query_param in request.query_params
+        if self.keyset and isinstance(queryset, CMISClientMixin):
+            self.keyset = False
+
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view=view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.ordering = self.get_keyset_ordering(queryset)
+        # DISTINCT ON queries must keep their leading ordering, the distinct fields
+        # identify the records on their own.
+        if not queryset.query.distinct_fields:
+            queryset = queryset.order_by(*self.ordering)
+
+        values = self.decode_cursor(request.query_params[self.cursor_query_param])
+        if values is not None:
+            queryset = queryset.filter(
+                build_keyset_filter(queryset.model, self.ordering, values)
+            )
+
+        results = list(queryset[: page_size + 1])
+        self.has_next = len(results) > page_size
+        self.page = results[:page_size]
+        return self.page
+
+    def get_count_cache_key(self) -> str:
+        jwt_auth = getattr(self.request, "jwt_auth", None)
+        client_id = jwt_auth.client_id if jwt_auth else None
+
+        ignored_params = {
+            self.page_query_param,
+            self.page_size_query_param,
+            *self.extra_query_params,
+        }
+        params = sorted(
+            (param, value)
+            for param, values in self.request.query_params.lists()
+            if param not in ignored_params
+            for value in values
+        )
+        digest = hashlib.md5(urlencode(params).encode("utf-8")).hexdigest()
+        return f"pagination:count:{self.request.path}:{client_id}:{digest}"
+
+    def get_count(self, queryset) -> Optional[int]:
+        """
+        Retrieve the cached or estimated count, or ``None`` to count the records.
+        """
+        cache_timeout = settings.PAGINATION_COUNT_CACHE_TIMEOUT
+        threshold = settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD
+        if not (cache_timeout or threshold):
+            return None
+        if not isinstance(queryset, models.QuerySet) or isinstance(
+            queryset, CMISClientMixin
+        ):
+            return None
+
+        cache = caches[settings.PAGINATION_COUNT_CACHE]
+        cache_key = self.get_count_cache_key()
+        if cache_timeout:
+            count = cache.get(cache_key)
+            if count is not None:
+                self.count_approximate = True
+                return count
+
+        count = None
+        if threshold:
+            estimate = estimate_count(queryset)
+            if estimate is not None and estimate > threshold:
+                self.count_approximate = True
+                count = estimate
+
+        if count is None:
+            count = queryset.count()
+
+        if cache_timeout:
+            cache.set(cache_key, count, timeout=cache_timeout)
+        return count
+
+    def get_keyset_ordering(self, queryset: models.QuerySet) -> List[str]:
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        if not all(isinstance(lookup, str) for lookup in ordering):
+            raise NotFound(_("This ordering does not support cursor pagination."))
+
+        distinct_fields = queryset.query.distinct_fields
+        if distinct_fields:
+            return [
+                lookup for lookup in ordering if lookup.lstrip("-") in distinct_fields
+            ]
+
+        pk_names = {"pk", queryset.model._meta.pk.name}
+        if not any(lookup.lstrip("-") in pk_names for lookup in ordering):
+            ordering.append("pk")
+        return ordering
+
+    def encode_cursor(self, obj: models.Model) -> str:
+        values = [get_ordering_value(obj, lookup) for lookup in self.ordering]
+        # str() keeps the full precision of datetimes, unlike DjangoJSONEncoder
+        data = json.dumps(values, default=str).encode("utf-8")
+        return base64.urlsafe_b64encode(data).decode("ascii")
+
+    def decode_cursor(self, cursor: str) -> Optional[list]:
+        if not cursor:
+            return None
+
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        except (binascii.Error, UnicodeError, ValueError):
+            values = None
+
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(_("Invalid cursor."))
+        return values
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.keyset:
+            return super().get_next_link()
+
+        if not self.has_next:
+            return None
+        url = remove_query_param(
+            self.request.build_absolute_uri(), self.page_query_param
+        )
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.page[-1])
+        )
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            response = super().get_paginated_response(data)
+            if self.count_approximate:
+                response[self.count_approximate_header] = "true"
+            return response
+
+        return Response(
+            OrderedDict(
+                [
+                    ("count", None),
+                    ("next", self.get_next_link()),
+                    ("previous", None),
+                    ("results", data),
+                ]
+            )
+        )
+
+
+class OptionalPagination(OptimizedPagination):
+    """
+    Paginate the results only if the client requests a page or a cursor.
+
+    Used for the collections that are not paginated in the API standards, so that
+    clients retrieving the complete collection are not affected.
+    """
+
+    @property
+    def query_params(self) -> List[str]:
+        """
+        All the query parameters of the paginator.
+        """
+        params = [self.page_query_param, *self.extra_query_params]
+        if self.page_size_query_param:
+            params.append(self.page_size_query_param)
+        return params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not any(param in request.query_params for param in self.query_params):
+            return None
+        return super().paginate_queryset(queryset, request, view=view)
+
+
+class StreamingListMixin:
+    """
+    Stream the list responses if ``settings.STREAMING_RESPONSES`` is enabled.
+
+    The records are serialized and rendered in chunks of ``stream_chunk_size``
+    records, see :class:`openzaak.utils.streaming.StreamingJSONResponse`.
+    """
+
+    stream_chunk_size = 500
+
+    def list(self, request, *args, **kwargs):
+        if not settings.STREAMING_RESPONSES:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        if not can_stream(self, queryset):
+            return super().list(request, *args, **kwargs)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return StreamingJSONResponse.from_view(
+                self,
+                page,
+                paginated_response=self.get_paginated_response([]),
+                chunk_size=self.stream_chunk_size,
+            )
+        return StreamingJSONResponse.from_view(
+            self, queryset, chunk_size=self.stream_chunk_size
+        )
+
+
+class LargeCollectionMixin(StreamingListMixin):
+    """
+    Opt-in pagination and streaming for unpaginated list endpoints.
+
+    Clients can request a page of the collection with the ``page`` or ``cursor``
+    query parameter (see :class:`OptionalPagination`). Otherwise, the complete
+    collection is returned and with ``settings.STREAMING_RESPONSES`` enabled, it is
+    streamed in chunks of records.
+    """
+
+    optional_pagination_class = OptionalPagination
+
+    @cached_property
+    def optional_paginator(self) -> OptionalPagination:
+        return self.optional_pagination_class()
+
+    def paginate_queryset(self, queryset):
+        return self.optional_paginator.paginate_queryset(
+            queryset, self.request, view=self
+        )
+
+    def get_paginated_response(self, data):
+        return self.optional_paginator.get_paginated_response(data)
@@ -2,7 +2,7 @@
 # Copyright (C) 2019 - 2020 Dimpact
 import logging
 import time
-from typing import Any, Dict
+from typing import Any, Dict, Iterable
 from urllib.parse import urlparse
 
 from django.conf import settings
@@ -10,10 +10,12 @@ from django.core.exceptions import (
     ImproperlyConfigured,
     ValidationError as DjangoValidationError,
 )
+from django.db import models
 from django.db.models import ObjectDoesNotExist
 from django.utils.module_loading import import_string
 from django.utils.translation import ugettext_lazy as _
 
+from django_loose_fk.fields import FkOrURLField
 from rest_framework import permissions
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.request import Request
@@ -26,6 +28,43 @@ from openzaak.utils.decorators import convert_cmis_adapter_exceptions
 logger = logging.getLogger(__name__)
 
 
+def get_loose_fk_url(obj: models.Model, field: FkOrURLField, request: Request) -> str:
+    """
+    Build the URL of a loose-fk relation as the API would serialize it.
+
+    Local relations are reversed, remote relations use the stored URL as-is, so the
+    remote object is never fetched.
+    """
+    fk_attname = obj._meta.get_field(field.fk_field).attname
+    if getattr(obj, fk_attname) is not None:
+        related_object = getattr(obj, field.fk_field)
+        return related_object.get_absolute_api_url(request=request)
+
+    url = getattr(obj, field.url_field)
+    if url and field.loader.is_local_url(url):
+        return request.build_absolute_uri(urlparse(url).path)
+    return url
+
+
+def get_permission_data(
+    obj: models.Model, field_names: Iterable[str], request: Request
+) -> Dict[str, Any]:
+    """
+    Project the fields relevant for permission checks from a model instance.
+
+    This is a cheap alternative to serializing the complete main resource - the
+    output for the requested fields is identical to the serializer output.
+    """
+    data = {}
+    for field_name in field_names:
+        field = obj._meta.get_field(field_name)
+        if isinstance(field, FkOrURLField):
+            data[field_name] = get_loose_fk_url(obj, field, request)
+        else:
+            data[field_name] = getattr(obj, field_name)
+    return data
+
+
 class AuthRequired(permissions.BasePermission):
     """
     Look at the scopes required for the current action
@@ -42,10 +81,7 @@ class AuthRequired(permissions.BasePermission):
         return {field: data.get(field) for field in self.permission_fields}
 
     def format_data(self, obj, request) -> dict:
-        main_resource = self.get_main_resource()
-        serializer_class = main_resource.serializer_class
-        serializer = serializer_class(obj, context={"request": request})
-        return serializer.data
+        return get_permission_data(obj, self.permission_fields, request)
 
     def get_main_resource(self):
         if not self.main_resource:
@@ -1,10 +1,12 @@
 # SPDX-License-Identifier: EUPL-1.2
 # Copyright (C) 2019 - 2020 Dimpact
+from collections import defaultdict
+from typing import List
 from urllib.parse import urlparse
 
 from django.conf import settings
 from django.db import models
-from django.db.models import Case, IntegerField, Value, When
+from django.db.models import Case, IntegerField, Q, Value, When
 from django.http.request import validate_host
 
 from vng_api_common.constants import VertrouwelijkheidsAanduiding
@@ -12,6 +14,17 @@ from vng_api_common.scopes import Scope
 from vng_api_common.utils import get_resources_for_paths
 
 
+def get_allowed_va(max_order: int) -> List[str]:
+    """
+    List the vertrouwelijkheidaanduidingen up to and including the given order.
+    """
+    return [
+        value
+        for value in VertrouwelijkheidsAanduiding.values
+        if VertrouwelijkheidsAanduiding.get_choice(value).order <= max_order
+    ]
+
+
 class QueryBlocked(Exception):
     pass
 
@@ -39,6 +52,14 @@ class BlockChangeMixin:
     delete.queryset_only = True
 
 
+class AuthorizationsFilterEngines:
+    # one CASE/WHEN per authorization and a union of the allowed primary keys
+    case = "case"
+    # authorizations grouped per maximum vertrouwelijkheidaanduiding into a single
+    # WHERE clause with IN-lists
+    compiled = "compiled"
+
+
 class LooseFkAuthorizationsFilterMixin:
     auth_fields = []
     loose_fk_field = None
@@ -133,6 +154,77 @@ class LooseFkAuthorizationsFilterMixin:
         queryset = self.build_queryset(filters)
         return queryset.values_list("pk", flat=True)
 
+    def get_compiled_filter(
+        self, authorizations_local: list, authorizations_external: list
+    ) -> Q:
+        """
+        Compile the authorizations into a single condition.
+
+        Authorizations are grouped by their maximum vertrouwelijkheidaanduiding,
+        giving at most one ``(type IN (...) AND vertrouwelijkheidaanduiding IN (...))``
+        clause per confidentiality level, regardless of the number of authorizations.
+        When a type occurs in multiple authorizations, the least restrictive one is
+        used.
+        """
+        prefix = self.prefix
+        fk_field = f"{prefix}_{self.loose_fk_field}"
+        url_field = f"{prefix}_{self.loose_fk_field}_url"
+        va_field = f"{prefix}vertrouwelijkheidaanduiding"
+
+        local_urls = [
+            getattr(authorization, self.loose_fk_field)
+            for authorization in authorizations_local
+        ]
+        loose_fk_objects = get_resources_for_paths(
+            [urlparse(url).path for url in local_urls]
+        )
+        pk_by_path = {
+            obj.get_absolute_api_url(): obj.pk for obj in (loose_fk_objects or [])
+        }
+
+        # map every loose-fk value to the highest allowed order
+        keyed_authorizations = [
+            ((fk_field, pk_by_path[urlparse(url).path]), authorization)
+            for url, authorization in zip(local_urls, authorizations_local)
+        ] + [
+            ((url_field, getattr(authorization, self.loose_fk_field)), authorization)
+            for authorization in authorizations_external
+        ]
+        max_orders = {}
+        for key, authorization in keyed_authorizations:
+            if not self.vertrouwelijkheidaanduiding_use:
+                max_orders[key] = 0
+                continue
+
+            order = VertrouwelijkheidsAanduiding.get_choice(
+                authorization.max_vertrouwelijkheidaanduiding
+            ).order
+            max_orders[key] = max(order, max_orders.get(key, order))
+
+        # group the loose-fk values per order
+        buckets = defaultdict(lambda: defaultdict(list))
+        for (field, value), order in max_orders.items():
+            buckets[order][field].append(value)
+
+        condition = Q(pk__in=[])
+        for order, values in sorted(buckets.items()):
+            bucket_condition = Q()
+            for field, field_values in values.items():
+                bucket_condition |= Q(**{f"{field}__in": field_values})
+
+            if self.vertrouwelijkheidaanduiding_use:
+                allowed_va = get_allowed_va(order)
+                bucket_condition &= Q(**{f"{va_field}__in": allowed_va})
+            condition |= bucket_condition
+
+        return condition
+
+    def apply_compiled_filter(self, condition: Q) -> models.QuerySet:
+        return self.filter(condition)
+
+    def get_filter_engine(self) -> str:
+        return settings.AUTORISATIES_FILTER_ENGINE
+
     def filter_for_authorizations(
         self, scope: Scope, authorizations: models.QuerySet
     ) -> models.QuerySet:
@@ -154,6 +246,12 @@ class LooseFkAuthorizationsFilterMixin:
             else:
                 authorizarions_external.append(auth)
 
+        if self.get_filter_engine() == AuthorizationsFilterEngines.compiled:
+            condition = self.get_compiled_filter(
+                authorizations_local, authorizarions_external
+            )
+            return self.apply_compiled_filter(condition)
+
         ids_local = self.ids_by_auth(scope, authorizations_local, local=True)
         ids_external = self.ids_by_auth(scope, authorizarions_external, local=False)
         queryset = self.filter(pk__in=ids_local.union(ids_external))
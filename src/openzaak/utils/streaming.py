@@ -0,0 +1,174 @@
+# SPDX-License-Identifier: EUPL-1.2
+# Copyright (C) 2022 Dimpact
+"""
+Stream list responses, serialized and encoded per chunk of records.
+
+The records of a queryset are read with a server-side cursor
+(:meth:`QuerySet.iterator`) and the ``prefetch_related`` lookups of the queryset are
+applied per chunk, so the memory use does not grow with the number of records. The
+records of a page are serialized per chunk as well, so the serialized page is never
+held in memory next to the encoded page.
+
+The first chunk of records is rendered before the response is returned, so errors in
+the queries or the serializers still result in a regular error response. Once the
+status and the start of the body are sent, errors can only end the body early: they
+are logged and the closing brackets are left out, so clients cannot parse the
+truncated body as valid JSON.
+"""
+import logging
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Union
+
+from django.db import models
+from django.db.models import prefetch_related_objects
+from django.http import StreamingHttpResponse
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.response import Response
+
+from openzaak.components.documenten.query.cache import document_cache_scope
+from openzaak.loaders import prefetch_scope
+
+from .mixins import CMISClientMixin
+
+logger = logging.getLogger(__name__)
+
+Records = Union[models.QuerySet, List[models.Model]]
+
+
+def iterate_in_chunks(
+    records: Records, chunk_size: int
+) -> Iterator[List[models.Model]]:
+    """
+    Iterate over the records in chunks, with the prefetches of a queryset applied.
+    """
+    lookups = ()
+    if isinstance(records, models.QuerySet):
+        lookups = records._prefetch_related_lookups
+        records = records.iterator(chunk_size=chunk_size)
+    else:
+        records = iter(records)
+
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        if lookups:
+            prefetch_related_objects(chunk, *lookups)
+        yield chunk
+
+
+def can_stream(view, records: Iterable) -> bool:
+    """
+    Check if the list response of the view can be streamed.
+
+    Only JSON responses of records in the database are streamed, the records from
+    CMIS need the CMIS connection of the request.
+    """
+    if not isinstance(view.request.accepted_renderer, JSONRenderer):
+        return False
+    if isinstance(records, CMISClientMixin):
+        return False
+    return isinstance(records, (models.QuerySet, list))
+
+
+class StreamingJSONResponse(StreamingHttpResponse):
+    """
+    Stream the serialized records as a JSON array, optionally in an envelope.
+
+    The array is the ``results`` member of the ``envelope``, which must be the last
+    member, as in the paginated responses. The output is the same as the output of
+    the regular response, rendered by ``renderer``.
+    """
+
+    def __init__(
+        self,
+        records: Records,
+        get_serializer: Callable,
+        renderer: BaseRenderer,
+        media_type: str,
+        renderer_context: Optional[dict] = None,
+        envelope: Optional[dict] = None,
+        chunk_size: int = 500,
+    ):
+        self.records = records
+        self.get_serializer = get_serializer
+        self.renderer = renderer
+        self.media_type = media_type
+        self.renderer_context = renderer_context
+        self.envelope = envelope
+        self.chunk_size = chunk_size
+
+        chunks = iterate_in_chunks(records, chunk_size)
+        with prefetch_scope(), document_cache_scope():
+            first_chunk = next(chunks, None)
+            rendered = self.render_records(first_chunk) if first_chunk else None
+        super().__init__(self.render_chunks(rendered, chunks), content_type=media_type)
+
+    @classmethod
+    def from_view(
+        cls,
+        view,
+        records: Records,
+        paginated_response: Optional[Response] = None,
+        chunk_size: int = 500,
+    ) -> "StreamingJSONResponse":
+        """
+        Stream the records with the serializer and renderer of the view.
+
+        The envelope and the headers are taken from the ``paginated_response``, if
+        the records are a page.
+        """
+        request = view.request
+        response = cls(
+            records,
+            view.get_serializer,
+            request.accepted_renderer,
+            request.accepted_media_type,
+            renderer_context=view.get_renderer_context(),
+            envelope=paginated_response.data if paginated_response else None,
+            chunk_size=chunk_size,
+        )
+        if paginated_response is not None:
+            for header, value in paginated_response.items():
+                if header.lower() != "content-type":
+                    response[header] = value
+        return response
+
+    def render_data(self, data) -> bytes:
+        return self.renderer.render(
+            data, self.media_type, self.renderer_context
+        ).strip()
+
+    def render_envelope(self) -> bytes:
+        data = {key: value for key, value in self.envelope.items() if key != "results"}
+        # strip the closing brace to append the results
+        rendered = self.render_data(data)[:-1].rstrip()
+        separator = b"," if data else b""
+        return rendered + separator + b'"results":['
+
+    def render_records(self, records: List[models.Model]) -> bytes:
+        serializer = self.get_serializer(records, many=True)
+        # strip the brackets of the rendered array
+        return self.render_data(serializer.data)[1:-1].strip()
+
+    def render_chunks(
+        self, rendered: Optional[bytes], chunks: Iterator[List[models.Model]]
+    ) -> Iterator[bytes]:
+        """
+        Yield the envelope, the ``rendered`` first chunk and the remaining chunks.
+        """
+        yield self.render_envelope() if self.envelope is not None else b"["
+        if rendered is not None:
+            yield rendered
+            try:
+                # the remaining chunks are rendered after the view returned
+                with prefetch_scope(), document_cache_scope():
+                    for chunk in chunks:
+                        yield b"," + self.render_records(chunk)
+            except Exception:
+                logger.exception(
+                    "Streaming the list response failed, the response is truncated"
+                )
+                return
+        yield b"]}" if self.envelope is not None else b"]"